@@ -0,0 +1,283 @@
+"""Micro-benchmarks of the CPU-bound pipeline steps on synthetic Japanese transcripts.
+
+    mpipe bench --durations 15m,2h,10h --trials 5 --output bench.json
+    mpipe bench --baseline bench_baseline.json        # exit 1 on regression
+    mpipe bench --save-baseline bench_baseline.json
+
+Transcripts are generated from a seeded vocabulary (segment length, vocabulary size and
+term-dictionary size are configurable), so runs are comparable across machines and
+commits. Each case reports min/median/max over the trials; a case regresses when its
+median is slower than the baseline median by more than the threshold (and a noise floor).
+"""
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from . import pipeline as pl
+from .config import load_config
+from .summarize.models import validate_minutes_json
+from .summarize.render import render_minutes_md
+
+CASES = ("preprocess", "chunk_slices", "run_chunk", "format_prompt", "merge", "validate", "render")
+
+_KANA = "あいうえおかきくけこさしすせそたちつてとなにぬねのはひふへほまみむめもやゆよらりるれろわん"
+_KANJI = "会議予算資料確認提出検討決定担当期限報告計画開発営業顧客契約品質工程変更承認共有調整作業課題対応"
+_FILLERS = ["えー", "あの", "まあ", "えーと", "そうですね"]
+_ENDINGS = ["です。", "ます。", "と思います。", "ですね。", "でしょうか。", "しました。", "お願いします。"]
+_NOISE_FLOOR_SEC = 0.005
+
+
+@dataclass
+class BenchSpec:
+    durations_min: Sequence[float] = (15.0, 120.0)
+    trials: int = 3
+    segment_chars: Tuple[int, int] = (10, 60)
+    vocab_size: int = 800
+    dict_size: int = 200
+    seed: int = 0
+    cases: Sequence[str] = CASES
+
+
+@dataclass
+class CaseResult:
+    case: str
+    duration_min: float
+    segments: int
+    chars: int
+    times: List[float] = field(default_factory=list)
+
+    @property
+    def key(self) -> str:
+        return f"{self.case}@{self.duration_min:g}m"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "case": self.case,
+            "duration_min": self.duration_min,
+            "segments": self.segments,
+            "chars": self.chars,
+            "min_sec": round(min(self.times), 6),
+            "median_sec": round(statistics.median(self.times), 6),
+            "max_sec": round(max(self.times), 6),
+            "trials": len(self.times),
+        }
+
+
+def parse_duration(text: str) -> float:
+    """'15m' / '2h' / '1h30m' / '90' (minutes) -> minutes."""
+    t = text.strip().lower()
+    if t.isdigit() or t.replace(".", "", 1).isdigit():
+        return float(t)
+    total, num = 0.0, ""
+    for ch in t:
+        if ch.isdigit() or ch == ".":
+            num += ch
+        elif ch in "hm" and num:
+            total += float(num) * (60 if ch == "h" else 1)
+            num = ""
+        else:
+            raise ValueError(f"Bad duration: {text!r} (use e.g. 15m, 2h, 1h30m)")
+    if num:
+        raise ValueError(f"Bad duration: {text!r} (missing unit)")
+    return total
+
+
+def _vocabulary(rng: random.Random, size: int) -> List[str]:
+    words = set()
+    while len(words) < size:
+        kanji = "".join(rng.choice(_KANJI) for _ in range(rng.randint(1, 3)))
+        kana = "".join(rng.choice(_KANA) for _ in range(rng.randint(0, 2)))
+        words.add(kanji + kana)
+    return sorted(words)
+
+
+def synth_transcript(duration_min: float, spec: BenchSpec) -> Dict[str, Any]:
+    """Transcript with ~duration_min of speech: 2–8 s segments, 4 speakers, fillers."""
+    rng = random.Random(f"{spec.seed}:{duration_min}")
+    vocab = _vocabulary(rng, spec.vocab_size)
+    lo, hi = spec.segment_chars
+    segs: List[Dict[str, Any]] = []
+    t = 0.0
+    end = duration_min * 60.0
+    while t < end:
+        target = rng.randint(lo, hi)
+        parts: List[str] = []
+        if rng.random() < 0.3:
+            parts.append(rng.choice(_FILLERS) + "、")
+        while sum(len(p) for p in parts) < target:
+            parts.append(rng.choice(vocab) + rng.choice("をがにはでと"))
+        text = "".join(parts) + rng.choice(_ENDINGS)
+        dur = rng.uniform(2.0, 8.0)
+        segs.append({"start": round(t, 2), "end": round(t + dur, 2), "speaker": f"S{rng.randint(1, 4)}", "text": text})
+        t += dur + rng.uniform(0.0, 1.5)
+    return {"language": "ja", "segments": segs}
+
+
+def synth_partials(count: int, spec: BenchSpec) -> List[Dict[str, Any]]:
+    """Partial minutes JSONs with overlapping (near-duplicate) decisions and ToDos."""
+    rng = random.Random(f"{spec.seed}:partials:{count}")
+    vocab = _vocabulary(rng, spec.vocab_size)
+    owners = ["田中", "佐藤さん", "鈴木", "高橋", "伊藤様"]
+    pool = ["".join(rng.choice(vocab) for _ in range(3)) for _ in range(40)]
+    out = []
+    for i in range(count):
+        picks = rng.sample(pool, 12)
+        out.append({
+            "summary": [f"{p}について議論した。" for p in picks[:3]],
+            "decisions": [{"text": f"{p}を承認する" + ("。" if rng.random() < 0.5 else "")} for p in picks[:5]],
+            "todos": [
+                {"owner": rng.choice(owners), "task": f"{p}を確認して報告する", "due": rng.choice(["", "来週", "4/10"])}
+                for p in picks[5:10]
+            ],
+            "open_questions": [f"{p}の扱い" for p in picks[10:]],
+            "topics": [f"{p}（{i:02d}:00頃）" for p in picks[:2]],
+        })
+    return out
+
+
+def _write_project(root: Path, spec: BenchSpec) -> Path:
+    rng = random.Random(f"{spec.seed}:dict")
+    vocab = _vocabulary(rng, max(spec.vocab_size, spec.dict_size))
+    (root / "dictionaries").mkdir(parents=True, exist_ok=True)
+    terms = [f"{w},{w}（正）" for w in rng.sample(vocab, spec.dict_size)] if spec.dict_size else []
+    (root / "dictionaries" / "terms.csv").write_text("\n".join(terms) + "\n", encoding="utf-8")
+    (root / "dictionaries" / "stop_phrases.txt").write_text("\n".join(_FILLERS) + "\n", encoding="utf-8")
+    (root / "minutes.yml").write_text(
+        "preprocess:\n  dictionaries:\n    terms_csv: dictionaries/terms.csv\n    stop_phrases: dictionaries/stop_phrases.txt\n"
+        "summarize:\n  engine: mock\n",
+        encoding="utf-8",
+    )
+    return root / "minutes.yml"
+
+
+def _time(fn: Callable[[], Any], trials: int) -> List[float]:
+    times = []
+    for _ in range(trials):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+def run_bench(spec: BenchSpec, progress: bool = True) -> Dict[str, Any]:
+    """Run every case for every duration; returns the results document."""
+    unknown = set(spec.cases) - set(CASES)
+    if unknown:
+        raise ValueError(f"Unknown bench case(s): {', '.join(sorted(unknown))} (choose from {', '.join(CASES)})")
+    results: List[CaseResult] = []
+    with tempfile.TemporaryDirectory(prefix="mpipe_bench_") as tmp:
+        root = Path(tmp)
+        cfg_path = _write_project(root, spec)
+        cfg = load_config(cfg_path)
+        quiet = contextlib.redirect_stdout(io.StringIO())
+        for minutes in spec.durations_min:
+            raw = synth_transcript(minutes, spec)
+            clean = pl._step_preprocess(raw, cfg)
+            run_dir = root / f"run_{minutes:g}"
+            run_dir.mkdir()
+            clean_path = run_dir / "transcript_clean.json"
+            clean_path.write_text(json.dumps(clean, ensure_ascii=False), encoding="utf-8")
+            n_partials = max(1, len(pl._build_chunk_slices(clean)))
+            partial_paths = []
+            for i, obj in enumerate(synth_partials(n_partials, spec), 1):
+                p = run_dir / f"partial_{i:02d}.json"
+                p.write_text(json.dumps(obj, ensure_ascii=False), encoding="utf-8")
+                partial_paths.append(p)
+            merged = pl._merge_partial_objects(synth_partials(n_partials, spec))
+
+            fns: Dict[str, Callable[[], Any]] = {
+                "preprocess": lambda: pl._step_preprocess(raw, cfg),
+                "chunk_slices": lambda: pl._build_chunk_slices(clean),
+                "run_chunk": lambda: pl.run_chunk(clean_path, cfg_path),
+                "format_prompt": lambda: pl._format_transcript_for_prompt(clean, max_chars=10**9),
+                "merge": lambda: pl.run_merge(partial_paths, cfg_path),
+                "validate": lambda: validate_minutes_json(merged),
+                "render": lambda: render_minutes_md(merged),
+            }
+            chars = sum(len(s["text"]) for s in raw["segments"])
+            for case in spec.cases:
+                with quiet:
+                    fns[case]()  # warm-up (imports, caches)
+                    times = _time(fns[case], spec.trials)
+                r = CaseResult(case, minutes, len(raw["segments"]), chars, times)
+                results.append(r)
+                if progress:
+                    d = r.to_dict()
+                    print(f"[Bench] {r.key:<22} median {d['median_sec'] * 1000:9.2f} ms  (min {d['min_sec'] * 1000:.2f}, {r.segments} segs)")
+    return {
+        "version": 1,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "spec": {
+            "durations_min": list(spec.durations_min),
+            "trials": spec.trials,
+            "segment_chars": list(spec.segment_chars),
+            "vocab_size": spec.vocab_size,
+            "dict_size": spec.dict_size,
+            "seed": spec.seed,
+        },
+        "results": {r.key: r.to_dict() for r in results},
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.2) -> List[Dict[str, Any]]:
+    """Per-case comparison rows; status is regression / improved / ok / new."""
+    rows = []
+    base = baseline.get("results", {})
+    for key, cur in current.get("results", {}).items():
+        prev = base.get(key)
+        if prev is None:
+            rows.append({"case": key, "status": "new", "median_sec": cur["median_sec"]})
+            continue
+        ratio = cur["median_sec"] / prev["median_sec"] if prev["median_sec"] else float("inf")
+        diff = cur["median_sec"] - prev["median_sec"]
+        status = "ok"
+        if ratio > 1 + threshold and diff > _NOISE_FLOOR_SEC:
+            status = "regression"
+        elif ratio < 1 / (1 + threshold) and -diff > _NOISE_FLOOR_SEC:
+            status = "improved"
+        rows.append({
+            "case": key,
+            "status": status,
+            "median_sec": cur["median_sec"],
+            "baseline_sec": prev["median_sec"],
+            "ratio": round(ratio, 3),
+        })
+    return rows
+
+
+def bench_main(
+    spec: BenchSpec,
+    output: Optional[Path] = None,
+    baseline: Optional[Path] = None,
+    save_baseline: Optional[Path] = None,
+    threshold: float = 0.2,
+) -> int:
+    """CLI entry: run, write results, compare with a baseline. Returns the exit code."""
+    doc = run_bench(spec)
+    if output is not None:
+        output.write_text(json.dumps(doc, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"[OK] Bench results: {output}")
+    if save_baseline is not None:
+        save_baseline.write_text(json.dumps(doc, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"[OK] Baseline saved: {save_baseline}")
+    if baseline is None:
+        return 0
+    rows = compare(doc, json.loads(baseline.read_text(encoding="utf-8")), threshold=threshold)
+    regressions = [r for r in rows if r["status"] == "regression"]
+    for r in rows:
+        if r["status"] in ("regression", "improved"):
+            print(f"[Bench] {r['status'].upper():<10} {r['case']}: {r['baseline_sec'] * 1000:.2f} -> {r['median_sec'] * 1000:.2f} ms (x{r['ratio']})")
+    print(f"[Bench] vs baseline: {len(regressions)} regression(s), {sum(r['status'] == 'improved' for r in rows)} improved, {len(rows)} cases")
+    return 1 if regressions else 0
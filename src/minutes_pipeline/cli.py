@@ -4,15 +4,20 @@ import argparse
 from pathlib import Path
 
 from .config import resolve_config
+from .summarize.llm_adapter import close_summarizers
 from .pipeline import (
+    PIPELINE_STAGES,
     run_pipeline,
     summarize_only,
-    eval_pipeline,
     request_pack,
     apply_llm_output,
     run_chunk,
     run_merge,
     run_check,
+    batch_submit,
+    batch_status,
+    batch_collect,
+    watch_merge,
 )
 
 
@@ -23,10 +28,28 @@ def main() -> None:
     p_run = sub.add_parser("run", help="Run full pipeline from media input (mp4/wav).")
     p_run.add_argument("input", type=str, help="Input media file path (mp4/wav).")
     p_run.add_argument("--config", type=str, default=None, help="Path to minutes.yml (optional).")
+    p_run.add_argument("--no-cache", action="store_true", help="Bypass LLM response cache lookups (fresh responses are still stored).")
+    p_run.add_argument("--record", action="store_true", help="Record every LLM request/response (with timings) to llm_cassette.json in the run folder.")
+    p_run.add_argument("--replay", type=str, default=None, help="Serve LLM responses from a recorded cassette instead of a live engine.")
+    p_run.add_argument("--stream", action="store_true", help="Summarize each chunk as soon as ASR has produced it (overlaps ASR and LLM calls).")
+    p_run.add_argument("--profile", action="store_true", help="Record per-stage wall/CPU time, memory peaks, ASR RTF and LLM latency in run_metadata.json.")
+    p_run.add_argument("--pstats", action="store_true", help="With --profile: also write cProfile dumps (logs/profile_<stage>.pstats).")
+    p_run.add_argument("--trace", action="store_true", help="Write span tracing (model load, ASR windows, chunk calls, merge, render) to logs/trace.json.")
+    p_run.add_argument(
+        "--force",
+        action="append",
+        default=None,
+        choices=[*PIPELINE_STAGES, "all"],
+        metavar="STAGE",
+        help=f"Re-run STAGE even when its inputs are unchanged (repeatable; {', '.join(PIPELINE_STAGES)} or all).",
+    )
 
     p_sum = sub.add_parser("summarize", help="Summarize from cleaned transcript json (engine in minutes.yml).")
     p_sum.add_argument("input", type=str, help="Input transcript_clean.json path.")
     p_sum.add_argument("--config", type=str, default=None)
+    p_sum.add_argument("--no-cache", action="store_true", help="Bypass LLM response cache lookups (fresh responses are still stored).")
+    p_sum.add_argument("--record", action="store_true", help="Record every LLM request/response (with timings) to llm_cassette.json in the run folder.")
+    p_sum.add_argument("--replay", type=str, default=None, help="Serve LLM responses from a recorded cassette instead of a live engine.")
 
     p_req = sub.add_parser(
         "request",
@@ -42,9 +65,14 @@ def main() -> None:
     p_chunk.add_argument("--config", type=str, default=None)
 
     p_merge = sub.add_parser("merge", help="Merge partial JSONs (from chunked summarization) into final schema JSON.")
-    p_merge.add_argument("partials", type=str, nargs="+", help="Paths to partial_01.json, partial_02.json, ... (or glob).")
+    p_merge.add_argument("partials", type=str, nargs="*", help="Paths to partial_01.json, partial_02.json, ... (or glob).")
     p_merge.add_argument("--output", "-o", type=str, default=None, help="Output JSON path (default: same dir as first partial).")
     p_merge.add_argument("--config", type=str, default=None)
+    p_merge.add_argument("--tree-k", type=int, default=None, help="Tree-reduce: merge partials in groups of K per level (resumable).")
+    p_merge.add_argument("--merge-engine", type=str, default=None, choices=["deterministic", "llm"], help="Merge engine for tree-reduce levels (default: merge.engine).")
+    p_merge.add_argument("--watch", type=str, default=None, metavar="DIR", help="Watch DIR for partial_*.json and re-render minutes_draft.md as they arrive.")
+    p_merge.add_argument("--interval", type=float, default=1.0, help="Watch poll interval in seconds (default: 1.0).")
+    p_merge.add_argument("--idle-exit", type=float, default=None, help="Stop watching after N seconds without new partials.")
 
     p_apply = sub.add_parser("apply", help="Apply LLM JSON output to render minutes markdown.")
     p_apply.add_argument("llm_json", type=str, help="Path to llm_output.json")
@@ -55,10 +83,122 @@ def main() -> None:
     p_check.add_argument("input", type=str, help="Path to llm_output.json or minutes JSON.")
     p_check.add_argument("--config", type=str, default=None)
 
-    p_eval = sub.add_parser("eval", help="Run evaluation/regression (stub for now).")
+    p_batch = sub.add_parser("batch", help="Offline provider batch jobs (OpenAI Batch / Anthropic Message Batches).")
+    batch_sub = p_batch.add_subparsers(dest="batch_cmd", required=True)
+    p_bsub = batch_sub.add_parser("submit", help="Submit chunk requests for one or more transcript_clean.json files.")
+    p_bsub.add_argument("inputs", type=str, nargs="+", help="transcript_clean.json paths (one per meeting).")
+    p_bsub.add_argument("--job", type=str, default=None, help="Job file path (default: summarize.batch.job_file in project root).")
+    p_bsub.add_argument("--config", type=str, default=None)
+    p_bst = batch_sub.add_parser("status", help="Show batch job progress.")
+    p_bst.add_argument("job", type=str, help="Path to batch_job.json.")
+    p_bcol = batch_sub.add_parser("collect", help="Collect results into partials, merge and render minutes.")
+    p_bcol.add_argument("job", type=str, help="Path to batch_job.json.")
+    p_bcol.add_argument("--wait", action="store_true", help="Poll until the job finishes (summarize.batch.poll_interval_sec).")
+
+    p_fake = sub.add_parser("fake-llm", help="Run a local stand-in LLM server (OpenAI/Ollama protocols) for load testing.")
+    p_fake.add_argument("--host", type=str, default="127.0.0.1")
+    p_fake.add_argument("--port", type=int, default=8089)
+    p_fake.add_argument("--latency", type=str, default="fixed:0.5", help="fixed:S | uniform:LO,HI | normal:MEAN,STD | lognormal:MEDIAN,SIGMA (seconds).")
+    p_fake.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 500.")
+    p_fake.add_argument("--rate-429", type=float, default=0.0, help="Fraction of requests answered with HTTP 429.")
+    p_fake.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429.")
+    p_fake.add_argument("--stream-chunk-chars", type=int, default=16, help="Characters per streamed chunk.")
+    p_fake.add_argument("--token-delay", type=float, default=0.0, help="Delay between streamed chunks (seconds).")
+    p_fake.add_argument("--items", type=int, default=5, help="Max items per list in the generated minutes JSON.")
+    p_fake.add_argument("--pad-chars", type=int, default=0, help="Pad notes with N chars to grow responses.")
+    p_fake.add_argument("--seed", type=int, default=None)
+    p_fake.add_argument("--batch-delay", type=float, default=0.0, help="Seconds before a submitted batch job completes.")
+
+    p_bench = sub.add_parser("bench", help="Benchmark preprocess/chunk/merge/validate/render on synthetic transcripts.")
+    p_bench.add_argument("--durations", type=str, default="15m,2h", help="Comma-separated transcript lengths (e.g. 15m,2h,10h).")
+    p_bench.add_argument("--trials", type=int, default=3)
+    p_bench.add_argument("--segment-chars", type=str, default="10-60", help="Segment text length range MIN-MAX.")
+    p_bench.add_argument("--vocab", type=int, default=800, help="Vocabulary size of the synthetic speech.")
+    p_bench.add_argument("--dict-size", type=int, default=200, help="Entries in the synthetic terms dictionary.")
+    p_bench.add_argument("--cases", type=str, default=None, help="Comma-separated subset of cases (default: all).")
+    p_bench.add_argument("--seed", type=int, default=0)
+    p_bench.add_argument("--output", "-o", type=str, default=None, help="Write results JSON here.")
+    p_bench.add_argument("--baseline", type=str, default=None, help="Compare with a stored results JSON (exit 1 on regression).")
+    p_bench.add_argument("--save-baseline", type=str, default=None, help="Store these results as the new baseline.")
+    p_bench.add_argument("--threshold", type=float, default=0.2, help="Regression threshold on median time (0.2 = 20%% slower).")
+
+    p_score = sub.add_parser("score", help="Character/word error rate of a transcript against a reference (JSON segments or .txt).")
+    p_score.add_argument("hyp", type=str, help="Transcript to score (transcript_raw.json / transcript_clean.json / .txt).")
+    p_score.add_argument("ref", type=str, help="Reference transcript (JSON segments or .txt).")
+    p_score.add_argument("--window", type=float, default=60.0, help="Time-aligned scoring window in seconds (0 = whole text at once).")
+    p_score.add_argument("--keep-punct", action="store_true", help="Count punctuation and symbols as characters.")
+    p_score.add_argument("--output", "-o", type=str, default=None, help="Write the full result (with per-window CER) as JSON.")
+
+    p_eval = sub.add_parser("eval", help="Run the golden manifest through the pipeline and compare with the previous eval report.")
+    p_eval.add_argument("manifest", nargs="?", default=None, help="Golden manifest YAML/JSON (default: eval.manifest in minutes.yml).")
     p_eval.add_argument("--config", type=str, default=None)
+    p_eval.add_argument("--workers", type=int, default=None, help="Items run in parallel (default: eval.max_workers).")
+    p_eval.add_argument("--items", type=str, default=None, help="Comma-separated subset of item ids.")
+    p_eval.add_argument("--compare", type=str, default=None, help="Report JSON to compare with (default: the latest in eval_runs/reports).")
 
     args = parser.parse_args()
+    if args.cmd == "merge" and not args.partials and not args.watch:
+        parser.error("merge: give partial JSON paths or --watch DIR")
+
+    if args.cmd == "fake-llm":
+        from .fakellm import FakeLLMConfig, LatencyModel, serve
+
+        serve(
+            FakeLLMConfig(
+                latency=LatencyModel.parse(args.latency),
+                error_rate=args.error_rate,
+                rate_429=args.rate_429,
+                retry_after=args.retry_after,
+                stream_chunk_chars=args.stream_chunk_chars,
+                token_delay=args.token_delay,
+                items=args.items,
+                pad_chars=args.pad_chars,
+                seed=args.seed,
+                batch_delay=args.batch_delay,
+            ),
+            host=args.host,
+            port=args.port,
+        )
+        return
+    if args.cmd == "bench":
+        from .bench import CASES, BenchSpec, bench_main, parse_duration
+
+        lo, _, hi = args.segment_chars.partition("-")
+        spec = BenchSpec(
+            durations_min=[parse_duration(d) for d in args.durations.split(",") if d.strip()],
+            trials=max(1, args.trials),
+            segment_chars=(int(lo), int(hi or lo)),
+            vocab_size=args.vocab,
+            dict_size=args.dict_size,
+            seed=args.seed,
+            cases=[c.strip() for c in args.cases.split(",")] if args.cases else CASES,
+        )
+        raise SystemExit(
+            bench_main(
+                spec,
+                output=Path(args.output) if args.output else None,
+                baseline=Path(args.baseline) if args.baseline else None,
+                save_baseline=Path(args.save_baseline) if args.save_baseline else None,
+                threshold=args.threshold,
+            )
+        )
+    if args.cmd == "score":
+        from .io import write_json
+        from .scoring import print_score, score_transcripts
+
+        result = score_transcripts(Path(args.hyp), Path(args.ref), window_sec=args.window or None, keep_punct=args.keep_punct)
+        print_score(result)
+        if args.output:
+            write_json(Path(args.output), result)
+            print(f"[OK] Score: {args.output}")
+        return
+    if args.cmd == "batch" and args.batch_cmd != "submit":
+        # status/collect use the config recorded in the job file
+        if args.batch_cmd == "status":
+            batch_status(Path(args.job))
+        else:
+            batch_collect(Path(args.job), wait=args.wait)
+        return
 
     # When --config is not given, use run_metadata.json in the input dir (written by pipeline run)
     metadata_dir: Path | None = None
@@ -66,7 +206,9 @@ def main() -> None:
         if args.cmd in ("summarize", "request", "chunk", "check"):
             metadata_dir = Path(args.input).resolve().parent
         elif args.cmd == "merge":
-            metadata_dir = Path(args.partials[0]).resolve().parent
+            metadata_dir = Path(args.watch).resolve() if args.watch else Path(args.partials[0]).resolve().parent
+        elif args.cmd == "batch":
+            metadata_dir = Path(args.inputs[0]).resolve().parent
         elif args.cmd == "apply":
             metadata_dir = Path(args.transcript).resolve().parent
 
@@ -74,21 +216,59 @@ def main() -> None:
         Path(args.config) if args.config else None,
         metadata_dir=metadata_dir,
     )
+    try:
+        _dispatch(args, cfg_path)
+    finally:
+        close_summarizers()
+
+
+def _dispatch(args: argparse.Namespace, cfg_path: Path) -> None:
     if args.cmd == "run":
-        run_pipeline(Path(args.input), cfg_path)
+        run_pipeline(
+            Path(args.input),
+            cfg_path,
+            no_cache=args.no_cache,
+            record=args.record,
+            replay=Path(args.replay) if args.replay else None,
+            force=args.force,
+            stream=args.stream,
+            profile=args.profile,
+            pstats=args.pstats,
+            trace=args.trace,
+        )
     elif args.cmd == "summarize":
-        summarize_only(Path(args.input), cfg_path)
+        summarize_only(
+            Path(args.input),
+            cfg_path,
+            no_cache=args.no_cache,
+            record=args.record,
+            replay=Path(args.replay) if args.replay else None,
+        )
     elif args.cmd == "request":
         request_pack(Path(args.input), cfg_path, mode=args.mode)
     elif args.cmd == "chunk":
         run_chunk(Path(args.input), cfg_path)
+    elif args.cmd == "merge" and args.watch:
+        watch_merge(Path(args.watch), cfg_path, interval=args.interval, idle_exit=args.idle_exit)
     elif args.cmd == "merge":
         partial_paths = [Path(p) for p in args.partials]
         out_path = Path(args.output) if args.output else None
-        run_merge(partial_paths, cfg_path, out_path=out_path)
+        run_merge(partial_paths, cfg_path, out_path=out_path, tree_k=args.tree_k, merge_engine=args.merge_engine)
     elif args.cmd == "apply":
         apply_llm_output(Path(args.llm_json), Path(args.transcript), cfg_path)
     elif args.cmd == "check":
         run_check(Path(args.input), cfg_path)
+    elif args.cmd == "batch":
+        batch_submit([Path(p) for p in args.inputs], cfg_path, job_path=Path(args.job) if args.job else None)
     elif args.cmd == "eval":
-        eval_pipeline(cfg_path)
+        from .evaluate import eval_pipeline
+
+        raise SystemExit(
+            eval_pipeline(
+                cfg_path,
+                manifest=Path(args.manifest) if args.manifest else None,
+                workers=args.workers,
+                only=[s.strip() for s in args.items.split(",") if s.strip()] if args.items else None,
+                compare_to=Path(args.compare) if args.compare else None,
+            )
+        )
@@ -67,13 +67,44 @@ def load_config(config_path: Path) -> Dict[str, Any]:
     cfg.setdefault("pipeline", {})
     cfg["pipeline"].setdefault("steps", ["asr", "preprocess", "summarize"])
     cfg["pipeline"].setdefault("save_intermediates", True)
+    # overlap ASR with preprocess/chunk/summarize (same as mpipe run --stream)
+    cfg["pipeline"].setdefault("streaming", False)
+
+    # per-stage profiling (mpipe run --profile / --pstats): run_metadata.json "profile", logs/*.pstats
+    cfg.setdefault("profile", {})
+    cfg["profile"].setdefault("enabled", False)
+    cfg["profile"].setdefault("cprofile", False)
+    cfg["profile"].setdefault("tracemalloc", True)
+    # span tracing to logs/trace.json (Chrome trace-event format; mpipe run --trace)
+    cfg["profile"].setdefault("trace", False)
 
     cfg.setdefault("asr", {})
     cfg["asr"].setdefault("engine", "whisper")
     cfg["asr"].setdefault("model", "large-v3")
+    # two-pass: fast_model everywhere, asr.model only on low-confidence spans (Whisper's
+    # fallback thresholds on avg_logprob / compression_ratio; no_speech_prob only together
+    # with a low avg_logprob, as Whisper's silence test)
+    cfg["asr"].setdefault("two_pass", {})
+    cfg["asr"]["two_pass"].setdefault("enabled", False)
+    cfg["asr"]["two_pass"].setdefault("fast_model", "small")
+    cfg["asr"]["two_pass"].setdefault("avg_logprob_below", -1.0)
+    cfg["asr"]["two_pass"].setdefault("compression_ratio_above", 2.4)
+    cfg["asr"]["two_pass"].setdefault("no_speech_prob_above", 0.6)
+    cfg["asr"]["two_pass"].setdefault("merge_gap_sec", 2.0)
+    cfg["asr"]["two_pass"].setdefault("pad_sec", 0.5)
 
     cfg.setdefault("preprocess", {})
     cfg["preprocess"].setdefault("dictionaries", {})
+    # collapse Whisper repetition loops (in-segment repeats, runs of near-identical segments)
+    cfg["preprocess"].setdefault("repetition", {})
+    cfg["preprocess"]["repetition"].setdefault("enabled", True)
+    cfg["preprocess"]["repetition"].setdefault("max_unit_chars", 20)
+    cfg["preprocess"]["repetition"].setdefault("min_repeats", 3)
+    cfg["preprocess"]["repetition"].setdefault("min_loop_chars", 12)
+    cfg["preprocess"]["repetition"].setdefault("max_period", 3)
+    cfg["preprocess"]["repetition"].setdefault("min_segment_chars", 6)
+    # char-bigram Jaccard at which two segments count as the same line (1.0 = exact only)
+    cfg["preprocess"]["repetition"].setdefault("similarity", 0.75)
 
     cfg.setdefault("summarize", {})
     # engines:
@@ -88,6 +119,73 @@ def load_config(config_path: Path) -> Dict[str, Any]:
     cfg["summarize"].setdefault("max_transcript_chars", 40000)
     cfg["summarize"].setdefault("ollama_base_url", "http://localhost:11434")
 
+    # compact transcript format for prompts/chunks/request packs
+    cfg["summarize"].setdefault("compact", {})
+    cfg["summarize"]["compact"].setdefault("enabled", False)
+    cfg["summarize"]["compact"].setdefault("timestamp_interval_sec", 60)
+    cfg["summarize"]["compact"].setdefault("max_line_chars", 400)
+    cfg["summarize"]["compact"].setdefault("filler_phrases", [])
+    cfg["summarize"].setdefault("stream", False)
+    cfg["summarize"].setdefault("stream_retries", 1)
+    cfg["summarize"].setdefault("stream_progress", True)
+    # abort a stream early when a top-level value starts as the wrong schema type
+    cfg["summarize"].setdefault("stream_strict_types", False)
+    # record/replay cassettes (engine: replay serves summarize.replay_cassette)
+    cfg["summarize"].setdefault("record", False)
+    cfg["summarize"].setdefault("cassette_name", "llm_cassette.json")
+    cfg["summarize"].setdefault("replay_cassette", None)
+    cfg["summarize"].setdefault("replay_latency", False)
+    cfg["summarize"].setdefault("replay_latency_scale", 1.0)
+    cfg["summarize"].setdefault("openai_base_url", None)
+    cfg["summarize"].setdefault("anthropic_base_url", None)
+
+    # per-engine request scheduler (token buckets, backoff, AIMD concurrency)
+    cfg["summarize"].setdefault("rate_limit", {})
+    cfg["summarize"]["rate_limit"].setdefault("requests_per_min", None)
+    cfg["summarize"]["rate_limit"].setdefault("tokens_per_min", None)
+    cfg["summarize"]["rate_limit"].setdefault("max_retries", 5)
+    cfg["summarize"]["rate_limit"].setdefault("base_delay", 1.0)
+    cfg["summarize"]["rate_limit"].setdefault("max_delay", 60.0)
+    cfg["summarize"]["rate_limit"].setdefault("max_concurrency", 4)
+    cfg["summarize"]["rate_limit"].setdefault("min_concurrency", 1)
+    cfg["summarize"]["rate_limit"].setdefault("latency_target_sec", None)
+
+    # hedged requests: duplicate a slow call (after the observed p90) to same/fallback engine
+    cfg["summarize"].setdefault("hedge", {})
+    cfg["summarize"]["hedge"].setdefault("enabled", False)
+    cfg["summarize"]["hedge"].setdefault("quantile", 0.9)
+    cfg["summarize"]["hedge"].setdefault("min_samples", 5)
+    cfg["summarize"]["hedge"].setdefault("initial_delay_sec", 60.0)
+    cfg["summarize"]["hedge"].setdefault("fallback_engine", None)
+    cfg["summarize"]["hedge"].setdefault("fallback_model", None)
+
+    # provider-side prompt caching of the static prefix (system + template + schema + rules)
+    cfg["summarize"].setdefault("prompt_cache", {})
+    cfg["summarize"]["prompt_cache"].setdefault("enabled", True)
+    cfg["summarize"]["prompt_cache"].setdefault("ollama_keep_alive", None)  # e.g. "30m"; None keeps Ollama's default
+
+    # pooled HTTP client shared across LLM calls (openai/anthropic/ollama)
+    cfg["summarize"].setdefault("http", {})
+    cfg["summarize"]["http"].setdefault("timeout", 180.0)
+    cfg["summarize"]["http"].setdefault("max_connections", 10)
+    cfg["summarize"]["http"].setdefault("max_keepalive_connections", 5)
+
+    # on-disk LLM response cache (ignored for mock/manual)
+    cfg["summarize"].setdefault("cache", {})
+    cfg["summarize"]["cache"].setdefault("enabled", True)
+    cfg["summarize"]["cache"].setdefault("dir", ".mpipe_cache/llm")
+    cfg["summarize"]["cache"].setdefault("max_mb", 200)
+    cfg["summarize"]["cache"].setdefault("max_age_days", 30)
+    cfg["summarize"]["cache"].setdefault("bypass", False)
+
+    # provider batch jobs (mpipe batch submit/status/collect; engine openai | anthropic)
+    cfg["summarize"].setdefault("batch", {})
+    cfg["summarize"]["batch"].setdefault("job_file", "batch_job.json")
+    cfg["summarize"]["batch"].setdefault("completion_window", "24h")
+    cfg["summarize"]["batch"].setdefault("poll_interval_sec", 60)
+    cfg["summarize"]["batch"].setdefault("max_tokens", 4096)
+    cfg["summarize"]["batch"].setdefault("max_resubmits", 1)
+
     # manual request pack filenames
     cfg["summarize"].setdefault("manual_instructions_md", "llm_instructions.md")
     cfg["summarize"].setdefault("manual_transcript_txt", "llm_transcript.txt")
@@ -96,4 +194,27 @@ def load_config(config_path: Path) -> Dict[str, Any]:
     cfg["chunk"].setdefault("target_chars", 30000)
     cfg["chunk"].setdefault("min_chars", 10000)
 
+    # merge: tree_k (null = flat merge), engine: deterministic | llm
+    cfg.setdefault("merge", {})
+    cfg["merge"].setdefault("tree_k", None)
+    cfg["merge"].setdefault("engine", "deterministic")
+    cfg["merge"].setdefault("max_workers", 4)
+    # near-duplicate ToDo/decision merging (character n-gram MinHash/LSH, Jaccard threshold)
+    cfg["merge"].setdefault("similarity", {})
+    cfg["merge"]["similarity"].setdefault("enabled", False)  # opt-in: folds near-duplicates
+    cfg["merge"]["similarity"].setdefault("threshold", 0.8)
+    cfg["merge"]["similarity"].setdefault("ngram", 2)
+    cfg["merge"]["similarity"].setdefault("num_perm", 64)
+
+    # regression evaluation (mpipe eval): golden manifest, stable per-item run folders, reports
+    cfg.setdefault("eval", {})
+    cfg["eval"].setdefault("manifest", "eval/golden.yml")
+    cfg["eval"].setdefault("output_dir", "eval_runs")
+    cfg["eval"].setdefault("max_workers", 2)
+    cfg["eval"].setdefault("rtf_threshold", 0.2)
+    cfg["eval"].setdefault("blank_rate_tolerance", 0.2)
+    # items with a reference transcript are scored (CER/WER, see mpipe score)
+    cfg["eval"].setdefault("score_window_sec", 60.0)
+    cfg["eval"].setdefault("cer_tolerance", 0.01)
+
     return cfg
@@ -0,0 +1,205 @@
+"""Pipeline stages as a DAG with content hashes: re-run only what changed, like make.
+
+Each stage declares its dependencies, the files it reads, the config it depends on and the
+files it writes. After a stage runs, the sha256 of its inputs and of its config are recorded
+(in run_metadata.json); the next run skips a stage whose inputs and config hash the same and
+whose outputs still exist. Downstream inputs are upstream outputs, so re-running a stage that
+produces identical files leaves the stages after it skipped.
+"""
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+import json
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Dict, Iterable, List, Optional, Sequence
+
+_BLOCK = 1 << 20
+
+
+@dataclass
+class Stage:
+    name: str
+    run: Callable[[], Optional[bool]]  # False: stopped on purpose, downstream stages are blocked
+    deps: Sequence[str] = ()
+    inputs: Callable[[], List[Path]] = field(default=lambda: [])
+    outputs: Callable[[], List[Path]] = field(default=lambda: [])
+    config: Any = None
+    enabled: bool = True
+
+
+@dataclass
+class StageResult:
+    name: str
+    status: str  # ran | skipped | disabled | blocked | stopped
+    reason: str = ""
+    seconds: float = 0.0
+
+
+def file_digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(_BLOCK), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def config_digest(obj: Any) -> str:
+    return hashlib.sha256(json.dumps(obj, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def topo_order(stages: Sequence[Stage]) -> List[Stage]:
+    """Stages in dependency order (declaration order among independent stages)."""
+    by_name = {s.name: s for s in stages}
+    order: List[Stage] = []
+    state: Dict[str, int] = {}  # 1 = visiting, 2 = done
+
+    def _visit(s: Stage) -> None:
+        if state.get(s.name) == 2:
+            return
+        if state.get(s.name) == 1:
+            raise ValueError(f"Stage dependency cycle at '{s.name}'")
+        state[s.name] = 1
+        for d in s.deps:
+            if d not in by_name:
+                raise ValueError(f"Stage '{s.name}' depends on unknown stage '{d}'")
+            _visit(by_name[d])
+        state[s.name] = 2
+        order.append(s)
+
+    for s in stages:
+        _visit(s)
+    return order
+
+
+def _fingerprint(paths: List[Path], base: Path | None, previous: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """{name: {sha256, size, mtime_ns}}; a file whose size and mtime match the previous record
+    reuses its digest (large media is not re-hashed on every run)."""
+    out: Dict[str, Dict[str, Any]] = {}
+    for p in paths:
+        st = p.stat()
+        name = _display(p, base)
+        prev = previous.get(name) or {}
+        if prev.get("size") == st.st_size and prev.get("mtime_ns") == st.st_mtime_ns and prev.get("sha256"):
+            digest = prev["sha256"]
+        else:
+            digest = file_digest(p)
+        out[name] = {"sha256": digest, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    return out
+
+
+def _display(p: Path, base: Path | None) -> str:
+    if base is not None:
+        try:
+            return p.resolve().relative_to(base.resolve()).as_posix()
+        except ValueError:
+            pass
+    return str(p.resolve())
+
+
+def _stale_reason(stage: Stage, prev: Dict[str, Any] | None, inputs: Dict[str, Dict[str, Any]], cfg_hash: str) -> str:
+    if not prev:
+        return "no previous run"
+    if prev.get("config") != cfg_hash:
+        return "config changed"
+    before = {k: v.get("sha256") for k, v in (prev.get("inputs") or {}).items()}
+    now = {k: v["sha256"] for k, v in inputs.items()}
+    if before != now:
+        changed = sorted(k for k in set(before) | set(now) if before.get(k) != now.get(k))
+        return "input changed: " + ", ".join(changed)
+    missing = [p.name for p in stage.outputs() if not p.exists()]
+    if missing:
+        return "output missing: " + ", ".join(missing)
+    return ""
+
+
+def _record(stage: Stage, inputs: Dict[str, Dict[str, Any]], cfg_hash: str, base: Path | None, seconds: float) -> Dict[str, Any]:
+    return {
+        "config": cfg_hash,
+        "inputs": inputs,
+        "outputs": [_display(p, base) for p in stage.outputs()],
+        "ran_at": dt.datetime.now().isoformat(timespec="seconds"),
+        "seconds": round(seconds, 3),
+    }
+
+
+def stale_reason(stage: Stage, records: Dict[str, Any], base: Path | None = None) -> str:
+    """Why the stage would run now ("" when it is up to date)."""
+    in_paths = stage.inputs()
+    missing = [p for p in in_paths if not p.exists()]
+    if missing:
+        return "input missing: " + ", ".join(p.name for p in missing)
+    prev = records.get(stage.name)
+    inputs = _fingerprint(in_paths, base, (prev or {}).get("inputs") or {})
+    return _stale_reason(stage, prev, inputs, config_digest(stage.config))
+
+
+def record_stage(stage: Stage, records: Dict[str, Any], base: Path | None = None, seconds: float = 0.0) -> None:
+    """Record a stage whose outputs were produced outside run_stages (e.g. by the streaming pipeline)."""
+    prev = records.get(stage.name)
+    inputs = _fingerprint(stage.inputs(), base, (prev or {}).get("inputs") or {})
+    records[stage.name] = _record(stage, inputs, config_digest(stage.config), base, seconds)
+
+
+def run_stages(
+    stages: Sequence[Stage],
+    records: Dict[str, Any],
+    force: Iterable[str] = (),
+    base: Path | None = None,
+    on_record: Callable[[], None] | None = None,
+    around: Callable[[str], ContextManager[Any]] | None = None,
+) -> List[StageResult]:
+    """Run stale stages in dependency order, updating records[name] after each one.
+
+    force names stages to run regardless of hashes ("all" forces every stage). on_record is
+    called after each record update so progress survives an interrupted run. around(name)
+    wraps each stage that runs (e.g. a profiler).
+    """
+    ordered = topo_order(stages)
+    forced = set(force)
+    unknown = forced - {s.name for s in stages} - {"all"}
+    if unknown:
+        raise ValueError(f"Unknown stage(s) for --force: {', '.join(sorted(unknown))}")
+
+    results: Dict[str, StageResult] = {}
+    for stage in ordered:
+        if not stage.enabled:
+            results[stage.name] = StageResult(stage.name, "disabled")
+            continue
+        blocked_by = [d for d in stage.deps if results[d].status in ("blocked", "stopped")]
+        if blocked_by:
+            results[stage.name] = StageResult(stage.name, "blocked", f"after {blocked_by[0]}")
+            print(f"[Stage] {stage.name}: blocked ({blocked_by[0]} did not complete)")
+            continue
+
+        in_paths = stage.inputs()
+        missing = [p for p in in_paths if not p.exists()]
+        if missing:
+            raise FileNotFoundError(f"Stage '{stage.name}': input not found: {missing[0]}")
+        prev = records.get(stage.name)
+        inputs = _fingerprint(in_paths, base, (prev or {}).get("inputs") or {})
+        cfg_hash = config_digest(stage.config)
+        reason = "forced" if ("all" in forced or stage.name in forced) else _stale_reason(stage, prev, inputs, cfg_hash)
+        if not reason:
+            results[stage.name] = StageResult(stage.name, "skipped", "up to date")
+            print(f"[Stage] {stage.name}: up to date (skipped)")
+            continue
+
+        print(f"[Stage] {stage.name}: running ({reason})")
+        t0 = time.perf_counter()
+        with around(stage.name) if around is not None else nullcontext():
+            completed = stage.run()
+        seconds = time.perf_counter() - t0
+        if completed is False:
+            # not recorded: the stage runs again next time
+            records.pop(stage.name, None)
+            results[stage.name] = StageResult(stage.name, "stopped", reason, seconds)
+        else:
+            records[stage.name] = _record(stage, inputs, cfg_hash, base, seconds)
+            results[stage.name] = StageResult(stage.name, "ran", reason, seconds)
+        if on_record is not None:
+            on_record()
+    return [results[s.name] for s in ordered]
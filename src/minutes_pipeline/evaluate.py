@@ -0,0 +1,387 @@
+"""Regression evaluation over a golden set of recordings (mpipe eval).
+
+    mpipe eval                                   # manifest from eval.manifest in minutes.yml
+    mpipe eval eval/golden.yml --workers 3
+    mpipe eval --items short,long --compare eval_runs/reports/eval_20260101_120000.json
+
+Manifest (YAML or JSON; paths are relative to the manifest file):
+
+    items:
+      - id: short
+        tier: short                     # short / medium / long (10-15 min, 30-45 min, 2 h)
+        media: input/short_15min.mp4
+      - id: long
+        tier: long
+        media: input/meeting_2h.mp4
+        config: minutes_large.yml       # optional per-item config (default: the eval config)
+        transcript: golden/long_raw.json  # optional: fixed ASR output, the asr step is skipped
+        reference: golden/long_ref.json   # optional: reference transcript, ASR is scored (CER/WER)
+
+Every item runs through run_pipeline in a stable folder (eval.output_dir/items/<id>), so
+the stage DAG skips unchanged ASR/preprocess/chunk work and the LLM response cache serves
+repeated summarize calls. Items run in parallel (eval.max_workers). The report holds timing
+(ASR RTF, per-stage seconds) and quality (decision / ToDo counts, ToDo blank rates, schema
+and check_minutes_quality warnings, CER/WER against the reference) per item, and is
+compared with the previous report.
+"""
+from __future__ import annotations
+
+import datetime as dt
+import json
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+import yaml  # PyYAML
+
+from .config import load_config
+from .dag import file_digest
+from .io import read_json, write_json, write_text
+from .pipeline import run_pipeline
+from .scoring import score_transcripts
+from .summarize.prompt import load_schema, try_validate_schema
+from .summarize.render import check_minutes_quality, todo_blank_counts
+
+TIERS = ("short", "medium", "long")
+
+
+@dataclass
+class EvalItem:
+    id: str
+    tier: str
+    media: Optional[Path] = None
+    config: Optional[Path] = None
+    transcript: Optional[Path] = None
+    reference: Optional[Path] = None
+
+
+def load_manifest(path: Path) -> List[EvalItem]:
+    text = path.read_text(encoding="utf-8")
+    doc = json.loads(text) if path.suffix.lower() == ".json" else yaml.safe_load(text)
+    raw = doc.get("items") if isinstance(doc, dict) else doc
+    if not isinstance(raw, list) or not raw:
+        raise ValueError(f"Eval manifest has no items: {path}")
+    base = path.parent.resolve()
+    items: List[EvalItem] = []
+    seen = set()
+    for i, entry in enumerate(raw, 1):
+        if not isinstance(entry, dict) or not entry.get("id"):
+            raise ValueError(f"Eval manifest item {i}: 'id' is required")
+        item_id = str(entry["id"])
+        if item_id in seen:
+            raise ValueError(f"Eval manifest: duplicate id {item_id!r}")
+        seen.add(item_id)
+        tier = str(entry.get("tier") or "short")
+        if tier not in TIERS:
+            raise ValueError(f"Eval manifest item {item_id!r}: tier must be one of {', '.join(TIERS)}")
+        paths = {k: (base / entry[k]) if entry.get(k) else None for k in ("media", "config", "transcript", "reference")}
+        if paths["media"] is None and paths["transcript"] is None:
+            raise ValueError(f"Eval manifest item {item_id!r}: give media or transcript")
+        items.append(EvalItem(item_id, tier, **paths))
+    return items
+
+
+def _place_transcript(src: Path, run_dir: Path) -> None:
+    """Copy a fixed ASR transcript into the run folder (untouched when identical, so
+    preprocess and later stages stay up to date)."""
+    dst = run_dir / "transcript_raw.json"
+    if dst.exists() and file_digest(dst) == file_digest(src):
+        return
+    run_dir.mkdir(parents=True, exist_ok=True)
+    shutil.copy2(src, dst)
+
+
+def _audio_sec(run_dir: Path) -> Optional[float]:
+    raw_path = run_dir / "transcript_raw.json"
+    if not raw_path.exists():
+        return None
+    raw = read_json(raw_path)
+    segs = raw.get("segments") or []
+    return raw.get("duration") or (float(segs[-1].get("end", 0.0)) if segs else None)
+
+
+def _rate(n: int, total: int) -> Optional[float]:
+    return round(n / total, 3) if total else None
+
+
+def asr_scores(run_dir: Path, reference: Path, window_sec: float | None = 60.0) -> Dict[str, Any]:
+    """CER/WER of the raw (ASR) and cleaned (after dictionaries) transcripts."""
+    out: Dict[str, Any] = {}
+    for key, name in (("", "transcript_raw.json"), ("_clean", "transcript_clean.json")):
+        path = run_dir / name
+        if path.exists():
+            s = score_transcripts(path, reference, window_sec=window_sec)
+            out[f"cer{key}"], out[f"wer{key}"] = s["cer"], s["wer"]
+    return out
+
+
+def item_metrics(run_dir: Path, meta: Dict[str, Any], cfg: Dict[str, Any]) -> Dict[str, Any]:
+    """Timing and quality metrics of one finished run folder."""
+    stages = meta.get("stages") or {}
+    last_run = meta.get("last_run") or {}
+    reused = [name for name, status in last_run.items() if status == "skipped"]
+    out: Dict[str, Any] = {
+        # a reused stage's record holds the seconds of the run that built it, not this one
+        "stage_sec": {name: None if name in reused else rec.get("seconds") for name, rec in stages.items()},
+        "reused": reused,
+    }
+    audio_sec = _audio_sec(run_dir)
+    out["audio_sec"] = round(audio_sec, 1) if audio_sec else None
+    asr_sec = out["stage_sec"].get("asr")
+    out["asr_rtf"] = round(asr_sec / audio_sec, 4) if asr_sec and audio_sec else None
+
+    llm_output = run_dir / "llm_output.json"
+    if not llm_output.exists():
+        raise FileNotFoundError(f"No llm_output.json in {run_dir} (manual engine or summarize disabled?)")
+    minutes = read_json(llm_output)
+    todos = [t for t in (minutes.get("todos") or []) if isinstance(t, dict)]
+    blanks = todo_blank_counts(todos)
+    schema = load_schema(cfg["__project_root__"], cfg["summarize"]["schema_path"])
+    out.update({
+        "decisions": len(minutes.get("decisions") or []),
+        "todos": len(todos),
+        "open_questions": len(minutes.get("open_questions") or []),
+        "todo_blank_rate": {k: _rate(v, len(todos)) for k, v in blanks.items()},
+        "schema_ok": try_validate_schema(minutes, schema) is None,
+        "warnings": check_minutes_quality(minutes),
+    })
+    return out
+
+
+def _run_item(item: EvalItem, default_config: Path, items_dir: Path, instrument: bool = True) -> Dict[str, Any]:
+    config_path = item.config or default_config
+    run_dir = items_dir / item.id
+    result: Dict[str, Any] = {"id": item.id, "tier": item.tier, "config": str(config_path)}
+    t0 = time.perf_counter()
+    try:
+        cfg = load_config(config_path)
+        if not instrument and (cfg["profile"].get("enabled") or cfg["profile"].get("trace")):
+            print(f"[Eval] {item.id}: profiling / tracing off while items run in parallel (use --workers 1)")
+        steps = None
+        if item.transcript is not None:
+            _place_transcript(item.transcript, run_dir)
+            steps = [s for s in cfg["pipeline"]["steps"] if s != "asr"]
+        meta = run_pipeline(
+            item.media or item.transcript, config_path, run_dir=run_dir, steps=steps, instrument=instrument
+        )
+        result.update(item_metrics(run_dir, meta, cfg))
+        if item.reference is not None:
+            result.update(asr_scores(run_dir, item.reference, window_sec=cfg["eval"]["score_window_sec"] or None))
+        result["status"] = "ok"
+    except Exception as e:  # one broken item must not stop the others
+        result.update({"status": "error", "error": f"{type(e).__name__}: {e}"})
+    result["wall_sec"] = round(time.perf_counter() - t0, 3)
+    return result
+
+
+def run_eval(
+    items: Sequence[EvalItem], config_path: Path, output_dir: Path, max_workers: int = 2
+) -> Dict[str, Any]:
+    """Run every item (in parallel) and return the report document.
+
+    Profiling and tracing are process-global, so they only run when items run one at a time."""
+    items_dir = output_dir / "items"
+    items_dir.mkdir(parents=True, exist_ok=True)
+    workers = max(1, min(max_workers, len(items)))
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mpipe-eval") as ex:
+        results = list(ex.map(lambda it: _run_item(it, config_path, items_dir, instrument=workers == 1), items))
+    return {
+        "version": 1,
+        "run_at": dt.datetime.now().isoformat(timespec="seconds"),
+        "config_path": str(config_path),
+        "wall_sec": round(time.perf_counter() - t0, 3),
+        "items": {r["id"]: r for r in results},
+    }
+
+
+def _stage_total(r: Dict[str, Any], only: Optional[Set[str]] = None) -> float:
+    """Seconds of the stages that ran (reused stages are None), optionally limited to only."""
+    return sum(v or 0.0 for k, v in (r.get("stage_sec") or {}).items() if only is None or k in only)
+
+
+def _timed(r: Dict[str, Any]) -> Set[str]:
+    return {k for k, v in (r.get("stage_sec") or {}).items() if v is not None}
+
+
+def compare(
+    current: Dict[str, Any],
+    previous: Dict[str, Any],
+    rtf_threshold: float = 0.2,
+    blank_tolerance: float = 0.2,
+    cer_tolerance: float = 0.01,
+) -> List[Dict[str, Any]]:
+    """Per-item comparison rows; status is regression / improved / ok / new / error.
+
+    Regressions are the breakages Phase 5 guards against: an item that now fails, output
+    that no longer matches the schema, decisions or ToDos dropping to zero, ToDo blank rates
+    rising by more than blank_tolerance, ASR RTF growing by more than rtf_threshold, or CER
+    rising by more than cer_tolerance (absolute)."""
+    rows = []
+    prev_items = previous.get("items", {})
+    for item_id, cur in current.get("items", {}).items():
+        prev = prev_items.get(item_id)
+        if prev is None:
+            rows.append({"id": item_id, "status": "new", "reasons": []})
+            continue
+        reasons: List[str] = []
+        gains: List[str] = []
+        if cur["status"] != "ok":
+            failed_now = prev["status"] == "ok"
+            rows.append({"id": item_id, "status": "regression" if failed_now else "error",
+                         "reasons": ["failed" if failed_now else "still failing"]})
+            continue
+        if prev["status"] != "ok":
+            rows.append({"id": item_id, "status": "improved", "reasons": ["fixed"]})
+            continue
+        if prev.get("schema_ok") and not cur.get("schema_ok"):
+            reasons.append("schema invalid")
+        for key in ("decisions", "todos"):
+            if prev.get(key) and not cur.get(key):
+                reasons.append(f"{key} 0 (was {prev[key]})")
+        for key, rate in (cur.get("todo_blank_rate") or {}).items():
+            before = (prev.get("todo_blank_rate") or {}).get(key)
+            if rate is None or before is None:
+                continue
+            if rate - before > blank_tolerance:
+                reasons.append(f"{key} blank {before:.0%} -> {rate:.0%}")
+            elif before - rate > blank_tolerance:
+                gains.append(f"{key} blank {before:.0%} -> {rate:.0%}")
+        cur_rtf, prev_rtf = cur.get("asr_rtf"), prev.get("asr_rtf")
+        asr_reused = "asr" in (cur.get("reused") or []) or "asr" in (prev.get("reused") or [])
+        if cur_rtf and prev_rtf and not asr_reused:
+            if cur_rtf > prev_rtf * (1 + rtf_threshold):
+                reasons.append(f"RTF {prev_rtf:.3f} -> {cur_rtf:.3f}")
+            elif cur_rtf < prev_rtf / (1 + rtf_threshold):
+                gains.append(f"RTF {prev_rtf:.3f} -> {cur_rtf:.3f}")
+        for key in ("cer", "cer_clean"):
+            cur_cer, prev_cer = cur.get(key), prev.get(key)
+            if cur_cer is None or prev_cer is None:
+                continue
+            if cur_cer - prev_cer > cer_tolerance:
+                reasons.append(f"{key.upper()} {prev_cer:.2%} -> {cur_cer:.2%}")
+            elif prev_cer - cur_cer > cer_tolerance:
+                gains.append(f"{key.upper()} {prev_cer:.2%} -> {cur_cer:.2%}")
+        status = "regression" if reasons else ("improved" if gains else "ok")
+        both = _timed(cur) & _timed(prev)  # only stages that ran in both reports are comparable
+        rows.append({
+            "id": item_id,
+            "status": status,
+            "reasons": reasons or gains,
+            "decisions_delta": cur.get("decisions", 0) - prev.get("decisions", 0),
+            "todos_delta": cur.get("todos", 0) - prev.get("todos", 0),
+            "stage_sec_delta": round(_stage_total(cur, both) - _stage_total(prev, both), 3),
+        })
+    return rows
+
+
+def _fmt(value: Any, spec: str = "") -> str:
+    return "-" if value is None else format(value, spec)
+
+
+def render_report_md(report: Dict[str, Any], rows: List[Dict[str, Any]] | None) -> str:
+    md = [f"# mpipe eval ({report['run_at']})", ""]
+    if report.get("previous"):
+        md += [f"比較対象: `{report['previous']}`", ""]
+    md += [
+        "| id | tier | status | audio (s) | ASR RTF | CER | stages (s) | 決定事項 | ToDo | 担当空欄 | 期限空欄 | 再利用 |",
+        "|---|---|---|---|---|---|---|---|---|---|---|---|",
+    ]
+    for r in report["items"].values():
+        if r["status"] != "ok":
+            md.append(f"| {r['id']} | {r['tier']} | error | | | | | | | | | |")
+            continue
+        blank = r.get("todo_blank_rate") or {}
+        md.append(
+            f"| {r['id']} | {r['tier']} | ok | {_fmt(r.get('audio_sec'))} | {_fmt(r.get('asr_rtf'), '.3f')} "
+            f"| {_fmt(r.get('cer'), '.2%')} | {_stage_total(r):.1f} | {r['decisions']} | {r['todos']} | {_fmt(blank.get('owner'), '.0%')} "
+            f"| {_fmt(blank.get('due'), '.0%')} | {', '.join(r.get('reused') or []) or '-'} |"
+        )
+    errors = [r for r in report["items"].values() if r["status"] != "ok"]
+    if errors:
+        md += ["", "## エラー", ""] + [f"- {r['id']}: {r['error']}" for r in errors]
+    if rows is not None:
+        md += ["", "## 前回との比較", ""]
+        for row in rows:
+            detail = f" ({'; '.join(row['reasons'])})" if row["reasons"] else ""
+            delta = ""
+            if "decisions_delta" in row:
+                delta = f" 決定事項 {row['decisions_delta']:+d} / ToDo {row['todos_delta']:+d} / stages {row['stage_sec_delta']:+.1f}s"
+            md.append(f"- {row['id']}: {row['status']}{detail}{delta}")
+    return "\n".join(md) + "\n"
+
+
+def _report_path(reports_dir: Path) -> Path:
+    stamp = dt.datetime.now().strftime("%Y%m%d_%H%M%S")
+    path = reports_dir / f"eval_{stamp}.json"
+    n = 2
+    while path.exists():
+        path = reports_dir / f"eval_{stamp}_{n}.json"
+        n += 1
+    return path
+
+
+def eval_pipeline(
+    config_path: Path,
+    manifest: Path | None = None,
+    workers: int | None = None,
+    only: Sequence[str] | None = None,
+    compare_to: Path | None = None,
+) -> int:
+    """CLI entry: run the golden manifest, write the report, compare with the previous report
+    (or compare_to). Returns the exit code (1 when an item fails or regresses)."""
+    cfg = load_config(config_path)
+    ev = cfg["eval"]
+    project_root: Path = cfg["__project_root__"]
+    manifest_path = manifest or project_root / ev["manifest"]
+    items = load_manifest(manifest_path)
+    if only:
+        unknown = set(only) - {it.id for it in items}
+        if unknown:
+            raise ValueError(f"Unknown eval item(s): {', '.join(sorted(unknown))}")
+        items = [it for it in items if it.id in only]
+    output_dir = (project_root / ev["output_dir"]).resolve()
+    reports_dir = output_dir / "reports"
+    reports_dir.mkdir(parents=True, exist_ok=True)
+    previous_path = compare_to
+    if previous_path is None:
+        earlier = sorted(reports_dir.glob("eval_*.json"))
+        previous_path = earlier[-1] if earlier else None
+
+    print(f"[Eval] {len(items)} item(s) from {manifest_path}")
+    report = run_eval(items, config_path, output_dir, max_workers=workers or int(ev["max_workers"]))
+    report["manifest"] = str(manifest_path)
+    rows = None
+    if previous_path is not None:
+        report["previous"] = str(previous_path)
+        rows = compare(
+            report,
+            read_json(previous_path),
+            rtf_threshold=float(ev["rtf_threshold"]),
+            blank_tolerance=float(ev["blank_rate_tolerance"]),
+            cer_tolerance=float(ev["cer_tolerance"]),
+        )
+        report["comparison"] = rows
+    out = _report_path(reports_dir)
+    write_json(out, report)
+    write_text(out.with_suffix(".md"), render_report_md(report, rows))
+
+    failed = [r["id"] for r in report["items"].values() if r["status"] != "ok"]
+    for r in report["items"].values():
+        if r["status"] == "ok":
+            print(
+                f"[Eval] {r['id']:<12} decisions {r['decisions']:>3} todos {r['todos']:>3} "
+                f"RTF {_fmt(r.get('asr_rtf'), '.3f')} CER {_fmt(r.get('cer'), '.2%')} stages {_stage_total(r):.1f}s"
+            )
+        else:
+            print(f"[Eval] {r['id']:<12} ERROR {r['error']}")
+    regressions = [row for row in rows or [] if row["status"] == "regression"]
+    for row in regressions:
+        print(f"[Eval] REGRESSION {row['id']}: {'; '.join(row['reasons'])}")
+    if rows is not None:
+        print(f"[Eval] vs {previous_path.name}: {len(regressions)} regression(s), {sum(r['status'] == 'improved' for r in rows)} improved")
+    print(f"[OK] Eval report: {out}")
+    return 1 if failed or regressions else 0
@@ -0,0 +1,490 @@
+"""Local stand-in LLM server for load/latency benchmarking (no API quota needed).
+
+Speaks the OpenAI chat-completions (``POST /v1/chat/completions``) and Ollama
+(``POST /api/chat``) protocols, streaming or not, plus the OpenAI Batch API
+(``/v1/files`` + ``/v1/batches``) and Anthropic Message Batches (``/v1/messages/batches``)
+so ``mpipe batch`` can be exercised offline. Responses are minutes-schema JSON
+derived from the transcript in the prompt. Latency distribution, error/429 injection,
+stream chunking and response size are configurable. ``GET /stats`` returns counters.
+
+    mpipe fake-llm --port 8089 --latency lognormal:2.0,0.5 --rate-429 0.05
+    # minutes.yml: summarize.ollama_base_url: http://127.0.0.1:8089
+    #              summarize.openai_base_url: http://127.0.0.1:8089/v1
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+_TS_PREFIX = re.compile(r"^\[\d{1,3}:\d{2}(?::\d{2})?\]\s*")
+_SPEAKER_PREFIX = re.compile(r"^[^\s:：]{1,20}[:：]\s*")
+_DUE = re.compile(r"(\d{1,2}月\d{1,2}日|\d{1,2}/\d{1,2}|来週[^\s、。]*|今週中|月末|明日)")
+
+
+@dataclass
+class LatencyModel:
+    """Latency distribution parsed from ``kind:params`` (seconds).
+
+    fixed:S | uniform:LO,HI | normal:MEAN,STD | lognormal:MEDIAN,SIGMA
+    """
+
+    kind: str = "fixed"
+    params: Tuple[float, ...] = (0.0,)
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyModel":
+        kind, _, rest = (spec or "fixed:0").partition(":")
+        params = tuple(float(x) for x in rest.split(",") if x.strip()) or (0.0,)
+        if kind not in ("fixed", "uniform", "normal", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {kind}")
+        return cls(kind=kind, params=params)
+
+    def sample(self, rng: random.Random) -> float:
+        p = self.params
+        if self.kind == "uniform":
+            return rng.uniform(p[0], p[1] if len(p) > 1 else p[0])
+        if self.kind == "normal":
+            return max(0.0, rng.gauss(p[0], p[1] if len(p) > 1 else 0.0))
+        if self.kind == "lognormal":
+            median = max(p[0], 1e-6)
+            return rng.lognormvariate(math.log(median), p[1] if len(p) > 1 else 0.5)
+        return p[0]
+
+
+@dataclass
+class FakeLLMConfig:
+    latency: LatencyModel = field(default_factory=LatencyModel)
+    error_rate: float = 0.0
+    rate_429: float = 0.0
+    retry_after: float = 1.0
+    stream_chunk_chars: int = 16
+    token_delay: float = 0.0
+    items: int = 5
+    pad_chars: int = 0
+    seed: Optional[int] = None
+    batch_delay: float = 0.0
+
+
+@dataclass
+class FakeLLMStats:
+    requests: int = 0
+    ok: int = 0
+    errors: int = 0
+    rate_limited: int = 0
+    streamed: int = 0
+    batch_items: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def bump(self, **kw: int) -> None:
+        with self._lock:
+            for k, v in kw.items():
+                setattr(self, k, getattr(self, k) + v)
+
+    def to_dict(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "ok": self.ok,
+                "errors": self.errors,
+                "rate_limited": self.rate_limited,
+                "streamed": self.streamed,
+                "batch_items": self.batch_items,
+            }
+
+
+def _transcript_lines(prompt: str) -> List[str]:
+    lines = []
+    for raw in prompt.splitlines():
+        line = raw.strip()
+        if not line or line.startswith(("#", "{", "}", "-", "必須")):
+            continue
+        line = _TS_PREFIX.sub("", line)
+        line = _SPEAKER_PREFIX.sub("", line)
+        if line:
+            lines.append(line)
+    return lines
+
+
+def fake_minutes(system_prompt: str, user_prompt: str, items: int = 5, pad_chars: int = 0) -> Dict[str, Any]:
+    """Schema-shaped minutes JSON derived (deterministically) from the prompt's transcript lines."""
+    lines = _transcript_lines(user_prompt)
+    seed = int(hashlib.sha256((system_prompt + user_prompt).encode("utf-8")).hexdigest()[:8], 16)
+    rng = random.Random(seed)
+
+    def _pick(pattern: str) -> List[str]:
+        hits = [l for l in lines if re.search(pattern, l)]
+        return hits[:items]
+
+    decisions = _pick(r"決定|決め|合意|承認|確定")
+    todo_lines = _pick(r"お願い|します|やります|対応|までに|確認")
+    todos = []
+    for l in todo_lines:
+        m = _DUE.search(l)
+        todos.append({"owner": "", "task": l[:80], "due": m.group(1) if m else ""})
+    sample = rng.sample(lines, min(items, len(lines))) if lines else []
+    return {
+        "meeting": {"title": "（fake-llm）", "date": "", "participants": []},
+        "summary": [l[:120] for l in lines[:items]] or ["（fake-llm）入力が空です。"],
+        "decisions": [d[:120] for d in decisions],
+        "todos": todos,
+        "topics": [l[:20] for l in sample],
+        "open_questions": [l[:120] for l in _pick(r"[?？]|検討|未定")],
+        "next_steps": [],
+        "notes": "x" * pad_chars,
+    }
+
+
+def _messages_to_prompts(messages: List[Dict[str, Any]]) -> Tuple[str, str]:
+    def _text(content: Any) -> str:
+        if isinstance(content, list):
+            return "".join(str(b.get("text", "")) for b in content if isinstance(b, dict))
+        return str(content or "")
+
+    system = "\n".join(_text(m.get("content")) for m in messages if m.get("role") == "system")
+    user = "\n".join(_text(m.get("content")) for m in messages if m.get("role") == "user")
+    return system, user
+
+
+def _chat_completion(model: str, content: str, usage: Tuple[int, int], rid: str) -> Dict[str, Any]:
+    return {
+        "id": rid,
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {
+            "prompt_tokens": usage[0],
+            "completion_tokens": usage[1],
+            "total_tokens": usage[0] + usage[1],
+            "prompt_tokens_details": {"cached_tokens": 0},
+        },
+    }
+
+
+def _multipart_files(content_type: str, body: bytes) -> Dict[str, bytes]:
+    msg = BytesParser(policy=HTTP).parsebytes(b"Content-Type: " + content_type.encode("latin-1") + b"\r\n\r\n" + body)
+    parts: Dict[str, bytes] = {}
+    for part in msg.iter_parts():
+        name = part.get_param("name", header="content-disposition")
+        if name:
+            parts[str(name)] = part.get_payload(decode=True) or b""
+    return parts
+
+
+def make_handler(config: FakeLLMConfig, stats: FakeLLMStats) -> type:
+    rng = random.Random(config.seed)
+    rng_lock = threading.Lock()
+    # batch jobs: uploaded files and batches, completed lazily once batch_delay has passed
+    files: Dict[str, bytes] = {}
+    batches: Dict[str, Dict[str, Any]] = {}
+    store_lock = threading.Lock()
+
+    def _draw() -> Tuple[float, float]:
+        with rng_lock:
+            return rng.random(), config.latency.sample(rng)
+
+    def _complete(messages: List[Dict[str, Any]]) -> Tuple[str, Tuple[int, int]]:
+        system, user = _messages_to_prompts(messages)
+        content = json.dumps(fake_minutes(system, user, config.items, config.pad_chars), ensure_ascii=False)
+        return content, (len(system) + len(user), len(content))
+
+    def _run_batch(batch: Dict[str, Any]) -> None:
+        """Produce results for a batch (called under store_lock)."""
+        if batch["done"] or time.monotonic() - batch["t0"] < config.batch_delay:
+            return
+        ok = failed = 0
+        out: List[str] = []
+        for i, item in enumerate(batch["items"], 1):
+            stats.bump(batch_items=1)
+            roll, _ = _draw()
+            failed_item = roll < config.error_rate
+            ok, failed = ok + (not failed_item), failed + failed_item
+            if batch["kind"] == "openai":
+                body = item.get("body") or {}
+                if failed_item:
+                    line = {"id": f"batch_req_{i}", "custom_id": item["custom_id"], "response": None,
+                            "error": {"code": "server_error", "message": "injected error (fake-llm)"}}
+                else:
+                    content, usage = _complete(body.get("messages") or [])
+                    completion = _chat_completion(body.get("model") or "fake", content, usage, f"chatcmpl-fake-b{i}")
+                    line = {"id": f"batch_req_{i}", "custom_id": item["custom_id"],
+                            "response": {"status_code": 200, "body": completion}, "error": None}
+            else:
+                params = item.get("params") or {}
+                if failed_item:
+                    line = {"custom_id": item["custom_id"],
+                            "result": {"type": "errored", "error": {"type": "api_error", "message": "injected error (fake-llm)"}}}
+                else:
+                    messages = [{"role": "system", "content": params.get("system") or ""}] + list(params.get("messages") or [])
+                    content, usage = _complete(messages)
+                    line = {"custom_id": item["custom_id"], "result": {"type": "succeeded", "message": {
+                        "id": f"msg_fake_{i}", "type": "message", "role": "assistant",
+                        "model": params.get("model") or "fake",
+                        "content": [{"type": "text", "text": content}],
+                        "usage": {"input_tokens": usage[0], "output_tokens": usage[1]},
+                    }}}
+            out.append(json.dumps(line, ensure_ascii=False))
+        batch["results"] = ("\n".join(out) + "\n").encode("utf-8")
+        batch["counts"] = (ok, failed)
+        batch["done"] = True
+        if batch["kind"] == "openai":
+            file_id = f"file-fake-{len(files) + 1}"
+            files[file_id] = batch["results"]
+            batch["output_file_id"] = file_id
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+            pass
+
+        def _send_json(self, status: int, obj: Any, headers: Optional[Dict[str, str]] = None) -> None:
+            body = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+            self._send_bytes(status, body, "application/json", headers)
+
+        def _send_bytes(self, status: int, body: bytes, content_type: str, headers: Optional[Dict[str, str]] = None) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _start_stream(self, content_type: str) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+
+        def _write_chunk(self, data: bytes) -> None:
+            self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+            self.wfile.flush()
+
+        def _end_stream(self) -> None:
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+
+        def do_GET(self) -> None:  # noqa: N802
+            path = self.path.rstrip("/")
+            if path == "/stats":
+                self._send_json(200, stats.to_dict())
+                return
+            m = re.fullmatch(r"(?:/v1)?/batches/([\w-]+)", path)
+            if m:
+                self._openai_batch_status(m.group(1))
+                return
+            m = re.fullmatch(r"(?:/v1)?/files/([\w-]+)/content", path)
+            if m:
+                with store_lock:
+                    data = files.get(m.group(1))
+                if data is None:
+                    self._send_json(404, {"error": {"message": "no such file"}})
+                else:
+                    self._send_bytes(200, data, "application/jsonl")
+                return
+            m = re.fullmatch(r"/v1/messages/batches/([\w-]+)(/results)?", path)
+            if m:
+                self._anthropic_batch(m.group(1), results=bool(m.group(2)))
+                return
+            self._send_json(404, {"error": "not found"})
+
+        def do_POST(self) -> None:  # noqa: N802
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            path = self.path.rstrip("/")
+            if path in ("/v1/files", "/files"):
+                self._upload_file(raw)
+                return
+            try:
+                req = json.loads(raw or b"{}")
+            except ValueError:
+                self._send_json(400, {"error": "invalid json"})
+                return
+            if path in ("/v1/batches", "/batches"):
+                self._create_openai_batch(req)
+                return
+            if path == "/v1/messages/batches":
+                self._create_anthropic_batch(req)
+                return
+            if path not in ("/v1/chat/completions", "/chat/completions", "/api/chat"):
+                self._send_json(404, {"error": "not found"})
+                return
+            stats.bump(requests=1)
+            roll, delay = _draw()
+            if roll < config.rate_429:
+                stats.bump(rate_limited=1)
+                self._send_json(
+                    429,
+                    {"error": {"message": "rate limited (fake-llm)", "type": "rate_limit_error"}},
+                    headers={"Retry-After": f"{config.retry_after:g}"},
+                )
+                return
+            time.sleep(delay)
+            if roll < config.rate_429 + config.error_rate:
+                stats.bump(errors=1)
+                self._send_json(500, {"error": {"message": "injected error (fake-llm)", "type": "server_error"}})
+                return
+
+            content, usage = _complete(req.get("messages") or [])
+            model = req.get("model") or "fake"
+            if req.get("stream"):
+                stats.bump(streamed=1)
+                if path == "/api/chat":
+                    self._stream_ollama(model, content, usage)
+                else:
+                    self._stream_openai(model, content, usage)
+            elif path == "/api/chat":
+                self._send_json(200, {
+                    "model": model,
+                    "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                    "message": {"role": "assistant", "content": content},
+                    "done": True,
+                    "prompt_eval_count": usage[0],
+                    "eval_count": usage[1],
+                })
+            else:
+                self._send_json(200, _chat_completion(model, content, usage, f"chatcmpl-fake-{stats.requests}"))
+            stats.bump(ok=1)
+
+        def _upload_file(self, raw: bytes) -> None:
+            parts = _multipart_files(self.headers.get("Content-Type") or "", raw)
+            if "file" not in parts:
+                self._send_json(400, {"error": {"message": "multipart field 'file' is required"}})
+                return
+            with store_lock:
+                file_id = f"file-fake-{len(files) + 1}"
+                files[file_id] = parts["file"]
+            purpose = parts.get("purpose", b"batch").decode("utf-8")
+            self._send_json(200, {"id": file_id, "object": "file", "purpose": purpose, "bytes": len(parts["file"])})
+
+        def _create_openai_batch(self, req: Dict[str, Any]) -> None:
+            with store_lock:
+                data = files.get(req.get("input_file_id") or "")
+                if data is None:
+                    self._send_json(404, {"error": {"message": "no such input file"}})
+                    return
+                items = [json.loads(l) for l in data.decode("utf-8").splitlines() if l.strip()]
+                batch_id = f"batch_fake_{len(batches) + 1}"
+                batches[batch_id] = {"kind": "openai", "items": items, "t0": time.monotonic(), "done": False,
+                                     "created": int(time.time()), "endpoint": req.get("endpoint")}
+            self._openai_batch_status(batch_id)
+
+        def _openai_batch_status(self, batch_id: str) -> None:
+            with store_lock:
+                batch = batches.get(batch_id)
+                if batch is None or batch["kind"] != "openai":
+                    self._send_json(404, {"error": {"message": "no such batch"}})
+                    return
+                _run_batch(batch)
+                ok, failed = batch.get("counts", (0, 0))
+                body = {
+                    "id": batch_id,
+                    "object": "batch",
+                    "endpoint": batch["endpoint"],
+                    "status": "completed" if batch["done"] else "in_progress",
+                    "created_at": batch["created"],
+                    "output_file_id": batch.get("output_file_id"),
+                    "request_counts": {"total": len(batch["items"]), "completed": ok, "failed": failed},
+                }
+            self._send_json(200, body)
+
+        def _create_anthropic_batch(self, req: Dict[str, Any]) -> None:
+            with store_lock:
+                batch_id = f"msgbatch_fake_{len(batches) + 1}"
+                batches[batch_id] = {"kind": "anthropic", "items": list(req.get("requests") or []),
+                                     "t0": time.monotonic(), "done": False, "created": int(time.time())}
+            self._anthropic_batch(batch_id)
+
+        def _anthropic_batch(self, batch_id: str, results: bool = False) -> None:
+            with store_lock:
+                batch = batches.get(batch_id)
+                if batch is None or batch["kind"] != "anthropic":
+                    self._send_json(404, {"error": {"type": "not_found_error", "message": "no such batch"}})
+                    return
+                _run_batch(batch)
+                if results:
+                    if not batch["done"]:
+                        self._send_json(404, {"error": {"type": "not_found_error", "message": "batch still processing"}})
+                    else:
+                        self._send_bytes(200, batch["results"], "application/x-jsonl")
+                    return
+                ok, failed = batch.get("counts", (0, 0))
+                host = self.headers.get("Host") or "%s:%s" % self.server.server_address[:2]
+                body = {
+                    "id": batch_id,
+                    "type": "message_batch",
+                    "processing_status": "ended" if batch["done"] else "in_progress",
+                    "request_counts": {
+                        "processing": 0 if batch["done"] else len(batch["items"]),
+                        "succeeded": ok,
+                        "errored": failed,
+                        "canceled": 0,
+                        "expired": 0,
+                    },
+                    "results_url": f"http://{host}/v1/messages/batches/{batch_id}/results" if batch["done"] else None,
+                }
+            self._send_json(200, body)
+
+        def _pieces(self, content: str) -> List[str]:
+            n = max(1, config.stream_chunk_chars)
+            return [content[i:i + n] for i in range(0, len(content), n)]
+
+        def _stream_openai(self, model: str, content: str, usage: Tuple[int, int]) -> None:
+            self._start_stream("text/event-stream")
+            base = {"id": "chatcmpl-fake", "object": "chat.completion.chunk", "created": int(time.time()), "model": model}
+            for piece in self._pieces(content):
+                chunk = {**base, "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]}
+                self._write_chunk(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+                time.sleep(config.token_delay)
+            final = {**base, "choices": [], "usage": {"prompt_tokens": usage[0], "completion_tokens": usage[1], "total_tokens": sum(usage)}}
+            self._write_chunk(f"data: {json.dumps(final)}\n\n".encode("utf-8"))
+            self._write_chunk(b"data: [DONE]\n\n")
+            self._end_stream()
+
+        def _stream_ollama(self, model: str, content: str, usage: Tuple[int, int]) -> None:
+            self._start_stream("application/x-ndjson")
+            for piece in self._pieces(content):
+                line = {"model": model, "message": {"role": "assistant", "content": piece}, "done": False}
+                self._write_chunk((json.dumps(line, ensure_ascii=False) + "\n").encode("utf-8"))
+                time.sleep(config.token_delay)
+            final = {"model": model, "message": {"role": "assistant", "content": ""}, "done": True,
+                     "prompt_eval_count": usage[0], "eval_count": usage[1]}
+            self._write_chunk((json.dumps(final) + "\n").encode("utf-8"))
+            self._end_stream()
+
+    return Handler
+
+
+def make_server(config: FakeLLMConfig, host: str = "127.0.0.1", port: int = 8089) -> Tuple[ThreadingHTTPServer, FakeLLMStats]:
+    """Create (not start) the server; port=0 picks a free port (see server.server_address)."""
+    stats = FakeLLMStats()
+    server = ThreadingHTTPServer((host, port), make_handler(config, stats))
+    server.daemon_threads = True
+    return server, stats
+
+
+def serve(config: FakeLLMConfig, host: str = "127.0.0.1", port: int = 8089) -> None:
+    server, stats = make_server(config, host, port)
+    h, p = server.server_address[:2]
+    print(
+        f"[fake-llm] listening on http://{h}:{p} "
+        "(OpenAI: /v1/chat/completions + /v1/batches, Anthropic: /v1/messages/batches, Ollama: /api/chat, stats: /stats)"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"[fake-llm] stats: {stats.to_dict()}")
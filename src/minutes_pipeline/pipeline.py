@@ -1,13 +1,21 @@
 from __future__ import annotations
 
 import datetime as dt
+import hashlib
 import http.client
 import json
+import queue
 import re
+import shutil
+import subprocess
+import threading
 import time
 import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Tuple, TypeVar
+from typing import Any, Callable, Dict, Iterator, List, Tuple, TypeVar
 
 T = TypeVar("T")
 
@@ -34,33 +42,80 @@ def _retry_on_network_error(
     raise RuntimeError("retry exhausted")
 
 from .config import load_config
+from .dag import Stage, record_stage, run_stages, stale_reason
+from .profiling import RunProfiler, latency_summary
+from .repetition import RepetitionCollapser
+from .tracing import instant, span, start_tracing, stop_tracing
 from .io import ensure_dir, materialize_run_paths, read_json, write_json, write_text
-from .summarize.llm_adapter import get_summarizer, run_llm_and_parse_json
-from .summarize.prompt import load_prompt_text, load_schema, try_validate_schema, extract_json
+from .summarize.batch import BatchRequest, BatchStatus, batch_client_from_config
+from .summarize.cache import get_response_cache
+from .summarize.cassette import get_recorder
+from .summarize.llm_adapter import (
+    hedge_policy_from_config,
+    prompt_cache_stats,
+    run_llm_and_parse_json,
+    summarizer_from_config,
+)
+from .summarize.scheduler import get_scheduler
+from .summarize.similarity import MinHashLSH
+from .summarize.prompt import estimate_tokens, load_prompt_text, load_schema, try_validate_schema, extract_json
 from .summarize.render import (
     render_minutes_md,
     check_minutes_quality,
     _render_minutes_md_sections_format,
 )
-from .summarize.models import validate_minutes_json
-
-
-def run_pipeline(input_media: Path, config_path: Path) -> None:
+from .summarize.models import normalize_minutes
+
+
+def run_pipeline(
+    input_media: Path,
+    config_path: Path,
+    no_cache: bool = False,
+    record: bool = False,
+    replay: Path | None = None,
+    force: List[str] | None = None,
+    stream: bool = False,
+    profile: bool = False,
+    pstats: bool = False,
+    trace: bool = False,
+    run_dir: Path | None = None,
+    steps: List[str] | None = None,
+    instrument: bool = True,
+) -> Dict[str, Any]:
+    """Run the stage DAG for one recording; stages whose inputs and config are unchanged
+    since the last run in the same run folder are skipped (force names stages to re-run).
+
+    With stream (or pipeline.streaming) ASR, preprocess, chunk and summarize run overlapped;
+    see _run_streaming. With profile (or profile.enabled) per-stage timings and memory peaks
+    go to run_metadata.json "profile"; pstats also writes cProfile dumps to logs/. With trace
+    (or profile.trace) spans are written to logs/trace.json (Chrome trace-event format).
+
+    run_dir / steps override naming.output_folder and pipeline.steps (used by mpipe eval).
+    instrument=False turns profiling and tracing off whatever the config says: both are
+    process-global, so concurrent runs in one process would cut each other's measurements.
+    Returns the run metadata (also written to run_metadata.json)."""
     cfg = load_config(config_path)
+    _apply_summarize_overrides(cfg, no_cache=no_cache, record=record, replay=replay)
+    if steps is not None:
+        cfg["pipeline"]["steps"] = list(steps)
     project_root: Path = cfg["__project_root__"]
 
-    today = dt.datetime.now().date().isoformat()
-    stem = input_media.stem
-    run_folder = cfg["naming"]["output_folder"].format(date=today, stem=stem)
+    if run_dir is not None:
+        output_dir, run_folder = run_dir.parent, run_dir.name
+    else:
+        today = dt.datetime.now().date().isoformat()
+        output_dir = Path(cfg["paths"]["output_dir"])
+        run_folder = cfg["naming"]["output_folder"].format(date=today, stem=input_media.stem)
 
     rp = materialize_run_paths(
         project_root=project_root,
-        output_dir=Path(cfg["paths"]["output_dir"]),
+        output_dir=output_dir,
         run_folder_name=run_folder,
         minutes_md_name=cfg["summarize"].get("output_md", "minutes_draft.md"),
     )
     _ensure_run_dirs(rp)
 
+    previous = read_json(rp.metadata_json) if rp.metadata_json.exists() else {}
     meta = {
         "run_at": dt.datetime.now().isoformat(timespec="seconds"),
         "input_media": str(input_media.resolve()),
@@ -68,48 +123,333 @@ def run_pipeline(input_media: Path, config_path: Path) -> None:
         "output_dir": str(rp.run_dir),
         "steps": cfg["pipeline"]["steps"],
         "versions": {"minutes_pipeline": "0.3.0"},
+        "stages": (previous.get("stages") if isinstance(previous, dict) else None) or {},
     }
     write_json(rp.metadata_json, meta)
 
-    # ASR
-    if "asr" in cfg["pipeline"]["steps"]:
-        transcript_raw = _step_asr(input_media, cfg)
-        write_json(rp.transcript_raw, transcript_raw)
-    else:
-        transcript_raw = read_json(rp.transcript_raw)
-
-    # preprocess
-    if "preprocess" in cfg["pipeline"]["steps"]:
-        transcript_clean = _step_preprocess(transcript_raw, cfg)
-        write_json(rp.transcript_clean, transcript_clean)
-    else:
-        transcript_clean = transcript_raw
-
-    # summarize
-    if "summarize" in cfg["pipeline"]["steps"]:
-        engine = (cfg["summarize"].get("engine") or "mock").lower()
-        if engine == "manual":
-            # generate request pack in the run folder and stop
-            _write_request_pack(transcript_clean, cfg, out_dir=rp.run_dir)
-            # also write a placeholder minutes draft
-            placeholder = (
-                "# 議事録（ドラフト）\n\n"
-                "この実行は `summarize.engine: manual` のため、LLM UI向けのリクエストパックを出力しました。\n\n"
-                f"- 次に: `mpipe request {rp.transcript_clean}`（再生成可）\n"
-                f"- ChatGPT/Copilotに `llm_transcript.txt` をアップロードし、`llm_instructions.md` の指示を貼り付け\n"
-                f"- 返ってきたJSONを `llm_output.json` として保存\n"
-                f"- 適用: `mpipe apply {rp.run_dir/'llm_output.json'} --transcript {rp.transcript_clean}`\n"
-            )
-            write_text(rp.minutes_md, placeholder)
-        else:
-            minutes_md = _step_summarize(transcript_clean, cfg)
-            write_text(rp.minutes_md, minutes_md)
+    forced = list(force or [])
+    if no_cache:
+        # fresh LLM responses were asked for, so an up-to-date summarize stage still runs
+        forced.append("summarize")
+    profiler = None
+    if instrument and (profile or pstats or cfg["profile"].get("enabled")):
+        profiler = RunProfiler(
+            rp.logs_dir,
+            cprofile=pstats or bool(cfg["profile"].get("cprofile")),
+            trace_memory=bool(cfg["profile"].get("tracemalloc", True)),
+        )
+    tracing = instrument and (trace or bool(cfg["profile"].get("trace")))
+    if tracing:
+        start_tracing()
+
+    @contextmanager
+    def _around(name: str) -> Iterator[None]:
+        with span(f"stage.{name}", "stage"):
+            with profiler.stage(name) if profiler is not None else nullcontext():
+                yield
 
+    try:
+        stages = _pipeline_stages(input_media, cfg, rp, profiler=profiler)
+        if stream or cfg["pipeline"].get("streaming"):
+            with _around("stream"):
+                streamed = _maybe_stream(input_media, cfg, rp, stages, meta, forced)
+            write_json(rp.metadata_json, meta)
+            if streamed:
+                # the stream just ran these; forcing them again would repeat ASR and LLM calls
+                if "all" in forced:
+                    forced = [n for n in PIPELINE_STAGES if n not in _STREAMED_STAGES]
+                forced = [n for n in forced if n not in _STREAMED_STAGES]
+        results = run_stages(
+            stages,
+            meta["stages"],
+            force=forced,
+            base=rp.run_dir,
+            on_record=lambda: write_json(rp.metadata_json, meta),
+            around=_around,
+        )
+    finally:
+        if tracing:
+            trace_path = rp.logs_dir / "trace.json"
+            stop_tracing(trace_path)
+            meta["trace"] = str(trace_path)
+            print(f"[Trace] {trace_path}")
+    meta["last_run"] = {r.name: r.status for r in results}
+    if profiler is not None:
+        _note_asr_profile(profiler, meta, rp)
+        meta["profile"] = profiler.report()
+        profiler.print_summary()
+    write_json(rp.metadata_json, meta)
+    ran = [r.name for r in results if r.status == "ran"]
+    print(f"[Stages] ran: {', '.join(ran) or '-'}; up to date: {sum(r.status == 'skipped' for r in results)}")
     print(f"[OK] Output: {rp.run_dir}")
+    return meta
+
+
+def _note_asr_profile(profiler: RunProfiler, meta: Dict[str, Any], rp) -> None:
+    """ASR real-time factor (ASR seconds per audio second) for the asr or stream stage."""
+    streamed = meta.get("streaming") if "stream" in profiler.stages else None
+    asr_sec = streamed["asr_sec"] if streamed else profiler.stages.get("asr", {}).get("wall_sec")
+    if not asr_sec or not rp.transcript_raw.exists():
+        return
+    raw = read_json(rp.transcript_raw)
+    segs = raw.get("segments") or []
+    audio_sec = raw.get("duration") or (float(segs[-1].get("end", 0.0)) if segs else 0.0)
+    if audio_sec:
+        name = "stream" if streamed else "asr"
+        profiler.note(name, audio_sec=round(audio_sec, 1), rtf=round(asr_sec / audio_sec, 4))
+        if streamed:
+            profiler.note(name, llm=streamed.get("llm"))
+
+
+PIPELINE_STAGES = ("ingest", "asr", "preprocess", "chunk", "summarize", "merge", "render", "check")
+
+
+def _pipeline_stages(input_media: Path, cfg: Dict[str, Any], rp, profiler: RunProfiler | None = None) -> List[Stage]:
+    """ingest → asr → preprocess → chunk → summarize → merge → render → check.
+
+    pipeline.steps enables asr / preprocess / summarize (summarize covers chunk through check;
+    the finer names may be listed too). With asr off transcript_raw.json must already exist in
+    the run folder; with preprocess off later stages read the raw transcript.
+    """
+    steps = set(cfg["pipeline"]["steps"])
+    summarize_on = "summarize" in steps
+    project_root: Path = cfg["__project_root__"]
+    summ = cfg["summarize"]
+    chunks_dir = rp.run_dir / "chunks"
+    manifest_path = chunks_dir / "manifest.json"
+    llm_output = rp.run_dir / "llm_output.json"
+    check_path = rp.run_dir / "quality_check.json"
+
+    def _source() -> Path:
+        return rp.transcript_clean if "preprocess" in steps else rp.transcript_raw
+
+    def _chunk_files() -> List[Path]:
+        if not manifest_path.exists():
+            return []
+        return [chunks_dir / c["file"] for c in read_json(manifest_path).get("chunks", [])]
+
+    def _partials() -> List[Path]:
+        return [rp.run_dir / f"partial_{i:02d}.json" for i in range(1, len(_chunk_files()) + 1)]
+
+    def _project_files(*rel: str) -> List[Path]:
+        # dictionaries / prompt / schema are optional (built-in defaults when absent)
+        paths = [(project_root / r).resolve() for r in rel if r]
+        return [p for p in paths if p.exists()]
+
+    def _asr() -> None:
+        raw = _step_asr(input_media, cfg)
+        if profiler is not None and "two_pass" in raw:
+            profiler.note("asr", two_pass=raw["two_pass"])
+        write_json(rp.transcript_raw, raw)
+
+    def _preprocess() -> None:
+        write_json(rp.transcript_clean, _step_preprocess(read_json(rp.transcript_raw), cfg))
+
+    def _chunk() -> None:
+        _write_chunks(read_json(_source()), cfg, chunks_dir, source=_source())
+
+    def _summarize() -> bool:
+        if (summ.get("engine") or "mock").lower() == "manual":
+            _write_manual_pack(read_json(_source()), cfg, rp)
+            return False
+        texts = [p.read_text(encoding="utf-8") for p in _chunk_files()]
+        for p in rp.run_dir.glob("partial_*.json"):
+            p.unlink()  # left over from a run with more chunks
+        llm: Dict[str, Any] = {}
+        for path, obj in zip(_partials(), _summarize_blocks(texts, cfg, run_dir=rp.run_dir, stats=llm)):
+            write_json(path, obj)
+        if profiler is not None:
+            profiler.note("summarize", llm=llm)
+        return True
+
+    def _merge() -> None:
+        schema = load_schema(project_root, summ["schema_path"])
+        objs = [read_json(p) for p in _partials()]
+        # a single partial is the model's answer as-is (no normalization by the merge)
+        merged = objs[0] if len(objs) == 1 else _merge_objects(objs, cfg, rp.run_dir, schema)
+        write_json(llm_output, merged)
+
+    def _render() -> None:
+        schema = load_schema(project_root, summ["schema_path"])
+        write_text(rp.minutes_md, _render_with_schema_notes(read_json(llm_output), schema))
+
+    def _check() -> None:
+        warnings = check_minutes_quality(read_json(llm_output))
+        if warnings:
+            print("[品質チェック]")
+            for w in warnings:
+                print(f"  - {w}")
+        write_json(check_path, {"warnings": warnings})
+
+    summarize_cfg = {
+        k: summ.get(k)
+        for k in ("engine", "model", "record", "replay_cassette", "openai_base_url", "anthropic_base_url", "ollama_base_url")
+    }
+    return [
+        Stage("ingest", lambda: None, inputs=lambda: [input_media], enabled="asr" in steps),
+        Stage("asr", _asr, deps=("ingest",), inputs=lambda: [input_media], outputs=lambda: [rp.transcript_raw],
+              config=cfg["asr"], enabled="asr" in steps),
+        Stage("preprocess", _preprocess, deps=("asr",), inputs=lambda: [rp.transcript_raw, *_project_files(*cfg["preprocess"]["dictionaries"].values())],
+              outputs=lambda: [rp.transcript_clean], config=cfg["preprocess"], enabled="preprocess" in steps),
+        Stage("chunk", _chunk, deps=("preprocess",), inputs=lambda: [_source()], outputs=lambda: [manifest_path, *_chunk_files()],
+              config={"chunk": cfg["chunk"], "compact": summ.get("compact")}, enabled=summarize_on or "chunk" in steps),
+        Stage("summarize", _summarize, deps=("chunk",),
+              inputs=lambda: [*_chunk_files(), *_project_files(summ["prompt_path"], summ["schema_path"])],
+              outputs=_partials, config=summarize_cfg, enabled=summarize_on),
+        Stage("merge", _merge, deps=("summarize",), inputs=_partials, outputs=lambda: [llm_output],
+              config=cfg["merge"], enabled=summarize_on or "merge" in steps),
+        Stage("render", _render, deps=("merge",), inputs=lambda: [llm_output, *_project_files(summ["schema_path"])],
+              outputs=lambda: [rp.minutes_md], enabled=summarize_on or "render" in steps),
+        Stage("check", _check, deps=("render",), inputs=lambda: [llm_output], outputs=lambda: [check_path],
+              enabled=summarize_on or "check" in steps),
+    ]
+
+
+def _write_manual_pack(transcript_clean: Dict[str, Any], cfg: Dict[str, Any], rp) -> None:
+    """Request pack in the run folder plus a placeholder minutes draft (summarize.engine: manual)."""
+    _write_request_pack(transcript_clean, cfg, out_dir=rp.run_dir)
+    placeholder = (
+        "# 議事録（ドラフト）\n\n"
+        "この実行は `summarize.engine: manual` のため、LLM UI向けのリクエストパックを出力しました。\n\n"
+        f"- 次に: `mpipe request {rp.transcript_clean}`（再生成可）\n"
+        f"- ChatGPT/Copilotに `llm_transcript.txt` をアップロードし、`llm_instructions.md` の指示を貼り付け\n"
+        f"- 返ってきたJSONを `llm_output.json` として保存\n"
+        f"- 適用: `mpipe apply {rp.run_dir/'llm_output.json'} --transcript {rp.transcript_clean}`\n"
+    )
+    write_text(rp.minutes_md, placeholder)
+
+
+# -----------------------------
+# Streaming (ASR → preprocess → chunk → summarize, overlapped)
+# -----------------------------
+_STREAMED_STAGES = ("ingest", "asr", "preprocess", "chunk", "summarize")
+
 
+def _maybe_stream(
+    input_media: Path, cfg: Dict[str, Any], rp, stages: List[Stage], meta: Dict[str, Any], forced: List[str]
+) -> bool:
+    """Run the streamed stages overlapped and record them, so run_stages only does merge → check.
+    Returns whether the stream ran.
 
-def summarize_only(input_transcript_clean: Path, config_path: Path) -> None:
+    Falls back to running stages in order when streaming cannot help: asr or summarize is
+    off, the engine is manual, ASR is already up to date (nothing to overlap with), or
+    two-pass ASR is on (its second pass needs the whole first pass).
+    """
+    steps = cfg["pipeline"]["steps"]
+    engine = (cfg["summarize"].get("engine") or "mock").lower()
+    if "asr" not in steps or "summarize" not in steps or engine == "manual":
+        print("[Stream] needs the asr and summarize steps and a non-manual engine; running stages in order.")
+        return False
+    if cfg["asr"]["two_pass"].get("enabled"):
+        print("[Stream] two-pass ASR refines spans after the first pass; running stages in order.")
+        return False
+    by_name = {st.name: st for st in stages}
+    if not ({"all", "asr", "ingest"} & set(forced)) and not stale_reason(by_name["asr"], meta["stages"], base=rp.run_dir):
+        print("[Stream] ASR is up to date; running stages in order.")
+        return False
+    meta["streaming"] = _run_streaming(input_media, cfg, rp)
+    for name in _STREAMED_STAGES:
+        if by_name[name].enabled:
+            record_stage(by_name[name], meta["stages"], base=rp.run_dir)
+    return True
+
+
+def _run_streaming(input_media: Path, cfg: Dict[str, Any], rp) -> Dict[str, float]:
+    """ASR segments flow through a queue into per-segment preprocess and the online chunker;
+    each chunk is summarized (thread pool) as soon as it closes while ASR decodes later audio.
+    Writes the same files as the asr/preprocess/chunk/summarize stages and returns timings."""
+    done = object()
+    segments: "queue.Queue[Any]" = queue.Queue(maxsize=1024)
+    header: Dict[str, Any] = {}
+
+    def _produce() -> None:
+        try:
+            info, segs = _asr_segments(input_media, cfg)
+            header.update(info)
+            for seg in segs:
+                segments.put(seg)
+        except BaseException as e:  # re-raised in the consumer
+            segments.put(e)
+        finally:
+            segments.put(done)
+
+    preprocess_on = "preprocess" in cfg["pipeline"]["steps"]
+    clean = _segment_cleaner(cfg) if preprocess_on else (lambda seg: seg)
+    collapser = RepetitionCollapser.from_config(cfg) if preprocess_on else None
+    chunker = _OnlineChunker(cfg)
+    summarize_one, finish = _block_summarizer(cfg, rp.run_dir)
+    raw: List[Dict[str, Any]] = []
+    cleaned: List[Dict[str, Any]] = []
+    chunks: List[Tuple[str, float, float, int]] = []
+    futures = []
+
+    t0 = time.perf_counter()
+    threading.Thread(target=_produce, name="mpipe-asr", daemon=True).start()
+    with ThreadPoolExecutor(max_workers=_summarize_workers(cfg)) as ex:
+
+        def _dispatch(chunk: Tuple[str, float, float, int]) -> None:
+            chunks.append(chunk)
+            instant("stream.chunk_closed", "stream", chunk=len(chunks), chars=chunk[3])
+            futures.append(ex.submit(summarize_one, chunk[0]))
+            print(f"[Stream] chunk {len(chunks)} closed at {_sec_to_mmss(chunk[2])} ({chunk[3]} chars) -> summarizing")
+
+        def _add(seg: Dict[str, Any]) -> None:
+            cleaned.append(seg)
+            closed = chunker.add(seg)
+            if closed is not None:
+                _dispatch(closed)
+
+        while True:
+            item = segments.get()
+            if item is done:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            raw.append(item)
+            with span("stream.preprocess", "stream"):
+                seg = clean(item)
+            if seg is None:
+                continue
+            # the collapser may hold a few segments back while a repeat is undecided
+            for ready in collapser.push(seg) if collapser is not None else [seg]:
+                _add(ready)
+        asr_sec = time.perf_counter() - t0
+        for ready in collapser.flush() if collapser is not None else []:
+            _add(ready)
+        last = chunker.close()
+        if last is not None:
+            _dispatch(last)
+        partials = [f.result() for f in futures]
+    total_sec = time.perf_counter() - t0
+    llm = finish()
+
+    write_json(rp.transcript_raw, {**header, "segments": raw})
+    source = rp.transcript_raw
+    if preprocess_on:
+        extra = {"repetition": _report_repetition(collapser)} if collapser is not None else {}
+        write_json(rp.transcript_clean, {**header, **extra, "segments": cleaned})
+        source = rp.transcript_clean
+    _write_chunk_files(chunks, rp.run_dir / "chunks", source=source, target_chars=chunker.target_chars)
+    for p in rp.run_dir.glob("partial_*.json"):
+        p.unlink()
+    for i, obj in enumerate(partials, 1):
+        write_json(rp.run_dir / f"partial_{i:02d}.json", obj)
+    print(
+        f"[Stream] ASR {asr_sec:.1f}s, summaries done {total_sec:.1f}s "
+        f"(+{total_sec - asr_sec:.1f}s after ASR, {len(chunks)} chunks)"
+    )
+    return {"asr_sec": round(asr_sec, 3), "summarize_done_sec": round(total_sec, 3), "chunks": len(chunks), "llm": llm}
+
+
+def summarize_only(
+    input_transcript_clean: Path,
+    config_path: Path,
+    no_cache: bool = False,
+    record: bool = False,
+    replay: Path | None = None,
+) -> None:
     cfg = load_config(config_path)
+    _apply_summarize_overrides(cfg, no_cache=no_cache, record=record, replay=replay)
     transcript_clean = read_json(input_transcript_clean)
 
     engine = (cfg["summarize"].get("engine") or "mock").lower()
@@ -118,7 +458,7 @@ def summarize_only(input_transcript_clean: Path, config_path: Path) -> None:
         print(f"[OK] Request pack written to: {input_transcript_clean.parent}")
         return
 
-    minutes_md = _step_summarize(transcript_clean, cfg)
+    minutes_md = _step_summarize(transcript_clean, cfg, run_dir=input_transcript_clean.parent)
     out_path = input_transcript_clean.parent / cfg["summarize"].get("output_md", "minutes_draft.md")
     write_text(out_path, minutes_md)
     print(f"[OK] Output: {out_path}")
@@ -150,17 +490,15 @@ def apply_llm_output(llm_json_path: Path, transcript_clean_path: Path, config_pa
 
     # Accept raw JSON text too (in case saved as .txt)
     raw = llm_json_path.read_text(encoding="utf-8").strip()
-    minutes_obj = extract_json(raw) if not raw.startswith("{") else json.loads(raw)
+    minutes_obj = extract_json(raw)
 
-    # Pydantic validation with type normalization
+    # Pydantic validation with type normalization (skipped when already canonical)
     try:
-        validated_model, pydantic_warnings = validate_minutes_json(minutes_obj)
+        minutes_obj, pydantic_warnings = normalize_minutes(minutes_obj)
         if pydantic_warnings:
             print("[Pydantic検証警告]")
             for w in pydantic_warnings:
                 print(f"  - {w}")
-        # Convert back to dict for rendering
-        minutes_obj = validated_model.to_dict()
     except Exception as e:
         print(f"[Pydantic検証エラー] {e}")
         # Continue with original data if validation fails completely
@@ -193,11 +531,17 @@ def apply_llm_output(llm_json_path: Path, transcript_clean_path: Path, config_pa
     print(f"[OK] Output: {out_md}")
 
 
-def eval_pipeline(config_path: Path) -> None:
-    cfg = load_config(config_path)
-    print("[EVAL] config ok")
-    print("[EVAL] steps:", cfg["pipeline"]["steps"])
-    print("[EVAL] summarize.engine:", cfg["summarize"].get("engine"))
+def _apply_summarize_overrides(
+    cfg: Dict[str, Any], no_cache: bool = False, record: bool = False, replay: Path | None = None
+) -> None:
+    """Apply CLI flags (--no-cache / --record / --replay) on top of minutes.yml."""
+    if no_cache:
+        cfg["summarize"]["cache"]["bypass"] = True
+    if record:
+        cfg["summarize"]["record"] = True
+    if replay is not None:
+        cfg["summarize"]["engine"] = "replay"
+        cfg["summarize"]["replay_cassette"] = str(replay.resolve())
 
 
 def _ensure_run_dirs(rp) -> None:
@@ -209,6 +553,37 @@ def _ensure_run_dirs(rp) -> None:
 # ASR (Whisper)
 # -----------------------------
 def _step_asr(input_media: Path, cfg: Dict[str, Any]) -> Dict[str, Any]:
+    if cfg["asr"]["two_pass"].get("enabled"):
+        return _two_pass_asr(input_media, cfg)
+    header, segments = _asr_segments(input_media, cfg)
+    return {**header, "segments": list(segments)}
+
+
+_ASR_NOT_FOUND = (
+    "Whisper backend not found. Install one of:\n"
+    "  pip install openai-whisper\n"
+    "  pip install faster-whisper\n"
+    "Or install with optional deps: pip install -e \".[asr]\""
+)
+
+
+def _asr_segment(start: float, end: float, text: str, src: Any) -> Dict[str, Any]:
+    """Segment dict with the decoder's confidence (avg_logprob, no_speech_prob,
+    compression_ratio) when available; src is a faster-whisper Segment or a whisper dict."""
+    seg: Dict[str, Any] = {"start": start, "end": end, "speaker": None, "text": (text or "").strip()}
+    for key in ("avg_logprob", "no_speech_prob", "compression_ratio"):
+        value = src.get(key) if isinstance(src, dict) else getattr(src, key, None)
+        if value is not None:
+            seg[key] = round(float(value), 4)
+    return seg
+
+
+def _asr_segments(
+    input_media: Path, cfg: Dict[str, Any], model: str | None = None
+) -> Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]:
+    """({language, duration}, segments). With faster-whisper segments are decoded lazily while
+    iterating; duration (seconds of audio) is None when the backend does not report it.
+    model overrides asr.model (the fast first pass of two-pass ASR)."""
     engine = cfg["asr"].get("engine", "whisper")
     if engine != "whisper":
         raise ValueError(f"Unsupported ASR engine: {engine}")
@@ -216,43 +591,238 @@ def _step_asr(input_media: Path, cfg: Dict[str, Any]) -> Dict[str, Any]:
     # Prefer faster-whisper
     try:
         from faster_whisper import WhisperModel  # type: ignore
-        model_name = cfg["asr"].get("model", "large-v3")
+        model_name = model or cfg["asr"].get("model", "large-v3")
         device = cfg["asr"].get("device", "cpu")
         compute_type = cfg["asr"].get("compute_type", "int8")
 
         def _load_faster_whisper():
             return WhisperModel(model_name, device=device, compute_type=compute_type)
 
-        model = _retry_on_network_error(_load_faster_whisper)
-        segments_iter, info = model.transcribe(str(input_media), vad_filter=True)
-        segments = []
-        for s in segments_iter:
-            segments.append({"start": float(s.start), "end": float(s.end), "speaker": None, "text": (s.text or "").strip()})
-        return {"language": getattr(info, "language", None), "segments": segments}
+        with span("asr.model_load", "asr", model=model_name):
+            whisper_model = _retry_on_network_error(_load_faster_whisper)
+        with span("asr.prepare", "asr"):
+            segments_iter, info = whisper_model.transcribe(str(input_media), vad_filter=True)
+        segments = (_asr_segment(float(s.start), float(s.end), s.text, s) for s in _traced_windows(segments_iter))
+        return {"language": getattr(info, "language", None), "duration": getattr(info, "duration", None)}, segments
     except ImportError:
         pass
 
     # Fallback: openai-whisper
     try:
         import whisper  # type: ignore
-        model_name = cfg["asr"].get("model", "large")
+        model_name = model or cfg["asr"].get("model", "large")
 
         def _load_openai_whisper():
             return whisper.load_model(model_name)
 
-        model = _retry_on_network_error(_load_openai_whisper)
-        result = model.transcribe(str(input_media), fp16=False)
-        segments = []
-        for s in result.get("segments", []):
-            segments.append({"start": float(s.get("start", 0.0)), "end": float(s.get("end", 0.0)), "speaker": None, "text": (s.get("text", "") or "").strip()})
-        return {"language": result.get("language"), "segments": segments}
+        with span("asr.model_load", "asr", model=model_name):
+            whisper_model = _retry_on_network_error(_load_openai_whisper)
+        with span("asr.transcribe", "asr"):
+            result = whisper_model.transcribe(str(input_media), fp16=False)
+        segments = (
+            _asr_segment(float(s.get("start", 0.0)), float(s.get("end", 0.0)), s.get("text", ""), s)
+            for s in result.get("segments", [])
+        )
+        return {"language": result.get("language"), "duration": None}, segments
     except ImportError as e:
-        raise RuntimeError(
-            "Whisper backend not found. Install one of:\n"
-            "  pip install openai-whisper\n"
-            "  pip install faster-whisper\n"
-            "Or install with optional deps: pip install -e \".[asr]\""
-        ) from e
+        raise RuntimeError(_ASR_NOT_FOUND) from e
+
+
+_SAMPLE_RATE = 16000
+
+
+def _decode_span(input_media: Path, start: float, end: float) -> Any:
+    """Mono 16 kHz float32 samples of [start, end) only: ffmpeg seeks to the span, so the
+    rest of the recording is never decoded or held in memory."""
+    import numpy as np  # type: ignore
+
+    cmd = [
+        "ffmpeg", "-nostdin", "-v", "error",
+        "-ss", f"{start:.3f}", "-t", f"{max(0.0, end - start):.3f}", "-i", str(input_media),
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(_SAMPLE_RATE), "-",
+    ]
+    try:
+        out = subprocess.run(cmd, capture_output=True, check=True).stdout
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"ffmpeg failed to decode {input_media} [{start:.1f}-{end:.1f}s]: {e.stderr.decode(errors='replace').strip()}") from e
+    return np.frombuffer(out, np.int16).astype(np.float32) / 32768.0
+
+
+def _asr_spans(
+    input_media: Path, cfg: Dict[str, Any], spans: List[Tuple[float, float]], model: str
+) -> Tuple[List[List[Dict[str, Any]]], Dict[str, float]]:
+    """Transcribe audio spans (start, end seconds) with one model load; segment times are
+    absolute. Each span is decoded on its own with ffmpeg; only without an ffmpeg binary
+    (faster-whisper decodes through PyAV) is the whole recording decoded once and sliced.
+    Returns (segments per span, {load_sec, decode_sec}); audio decoding counts as load."""
+    try:
+        from faster_whisper import WhisperModel, decode_audio  # type: ignore
+
+        def _load() -> Any:
+            return WhisperModel(model, device=cfg["asr"].get("device", "cpu"), compute_type=cfg["asr"].get("compute_type", "int8"))
+
+        def _audio() -> Any:
+            return decode_audio(str(input_media), sampling_rate=_SAMPLE_RATE)
+
+        def _run(m: Any, clip: Any) -> List[Any]:
+            segs, _info = m.transcribe(clip, vad_filter=True)
+            return [(float(x.start), float(x.end), x.text, x) for x in segs]
+    except ImportError:
+        try:
+            import whisper  # type: ignore
+        except ImportError as e:
+            raise RuntimeError(_ASR_NOT_FOUND) from e
+
+        def _load() -> Any:
+            return whisper.load_model(model)
+
+        def _audio() -> Any:
+            return whisper.load_audio(str(input_media))
+
+        def _run(m: Any, clip: Any) -> List[Any]:
+            res = m.transcribe(clip, fp16=False)
+            return [(float(x.get("start", 0.0)), float(x.get("end", 0.0)), x.get("text", ""), x) for x in res.get("segments", [])]
+
+    t0 = time.perf_counter()
+    with span("asr.model_load", "asr", model=model):
+        whisper_model = _retry_on_network_error(_load)
+    whole = None if shutil.which("ffmpeg") else _audio()
+    load_sec = time.perf_counter() - t0
+    decode_sec = 0.0
+    out: List[List[Dict[str, Any]]] = []
+    for start, end in spans:
+        t1 = time.perf_counter()
+        if whole is None:
+            clip = _decode_span(input_media, start, end)
+        else:
+            clip = whole[int(start * _SAMPLE_RATE):int(end * _SAMPLE_RATE)]
+        t2 = time.perf_counter()
+        with span("asr.refine", "asr", audio=f"{_sec_to_mmss(start)}-{_sec_to_mmss(end)}"):
+            decoded = _run(whisper_model, clip)
+        load_sec += t2 - t1
+        decode_sec += time.perf_counter() - t2
+        out.append([
+            _asr_segment(round(start + a, 3), round(min(end, start + b), 3), text, src)
+            for a, b, text, src in decoded
+        ])
+    return out, {"load_sec": load_sec, "decode_sec": decode_sec}
+
+
+def _is_low_confidence(seg: Dict[str, Any], tp: Dict[str, Any]) -> bool:
+    """Whisper's own fallback signals: low avg log-probability or a high compression ratio
+    (repetition). A high no_speech_prob alone is not one; see _is_silence."""
+    if not (seg.get("text") or "").strip():
+        return False
+    logprob = seg.get("avg_logprob")
+    ratio = seg.get("compression_ratio")
+    return (logprob is not None and logprob < tp["avg_logprob_below"]) or (
+        ratio is not None and ratio > tp["compression_ratio_above"]
+    )
+
+
+def _is_silence(seg: Dict[str, Any], tp: Dict[str, Any]) -> bool:
+    """Whisper's silence test: high no_speech_prob together with low avg log-probability."""
+    logprob = seg.get("avg_logprob")
+    no_speech = seg.get("no_speech_prob")
+    return (
+        no_speech is not None and no_speech > tp["no_speech_prob_above"]
+        and logprob is not None and logprob < tp["avg_logprob_below"]
+    )
+
+
+def _low_confidence_spans(segs: List[Dict[str, Any]], tp: Dict[str, Any]) -> List[Tuple[int, int, float, float]]:
+    """(first, last+1, start, end) per span to re-transcribe: flagged segments closer than
+    merge_gap_sec are joined (with what lies between), padded by pad_sec without reaching
+    into the neighbouring kept segments."""
+    flagged = [i for i, seg in enumerate(segs) if _is_low_confidence(seg, tp)]
+    groups: List[List[int]] = []
+    for i in flagged:
+        if groups and float(segs[i]["start"]) - float(segs[groups[-1][1]]["end"]) <= tp["merge_gap_sec"]:
+            groups[-1][1] = i
+        else:
+            groups.append([i, i])
+    spans = []
+    pad = float(tp["pad_sec"])
+    for first, last in groups:
+        start = float(segs[first]["start"]) - pad
+        end = float(segs[last]["end"]) + pad
+        if first > 0:
+            start = max(start, float(segs[first - 1]["end"]))
+        if last + 1 < len(segs):
+            end = min(end, float(segs[last + 1]["start"]))
+        spans.append((first, last + 1, max(0.0, start), end))
+    return spans
+
+
+def _two_pass_asr(input_media: Path, cfg: Dict[str, Any]) -> Dict[str, Any]:
+    """Fast model over the whole recording, then asr.model only on low-confidence spans,
+    spliced back in place. transcript["two_pass"] reports the compute saved: the large-model
+    time for the full audio is extrapolated from its measured decode speed on the spans."""
+    tp = cfg["asr"]["two_pass"]
+    model = cfg["asr"].get("model", "large-v3")
+    t0 = time.perf_counter()
+    header, first = _asr_segments(input_media, cfg, model=tp["fast_model"])
+    segs = list(first)
+    fast_sec = time.perf_counter() - t0
+    audio_sec = float(header.get("duration") or (segs[-1]["end"] if segs else 0.0))
+
+    spans = _low_confidence_spans(segs, tp)
+    refined: List[List[Dict[str, Any]]] = []
+    timing = {"load_sec": 0.0, "decode_sec": 0.0}
+    if spans:
+        refined, timing = _asr_spans(input_media, cfg, [(a, b) for _, _, a, b in spans], model)
+    out: List[Dict[str, Any]] = []
+    pos = 0
+    for (first_i, end_i, _, _), new in zip(spans, refined):
+        out.extend(segs[pos:first_i])
+        if new:
+            out.extend({**seg, "refined": True} for seg in new)
+        else:
+            # the large model heard nothing: keep the first pass unless Whisper itself calls it silence
+            out.extend(seg for seg in segs[first_i:end_i] if not _is_silence(seg, tp))
+        pos = end_i
+    out.extend(segs[pos:])
+
+    span_audio = sum(b - a for _, _, a, b in spans)
+    stats: Dict[str, Any] = {
+        "fast_model": tp["fast_model"],
+        "model": model,
+        "spans": len(spans),
+        "replaced_segments": sum(e - f for f, e, _, _ in spans),
+        "refined_audio_sec": round(span_audio, 1),
+        "refined_ratio": round(span_audio / audio_sec, 4) if audio_sec else None,
+        "fast_sec": round(fast_sec, 3),
+        "refine_sec": round(timing["load_sec"] + timing["decode_sec"], 3),
+    }
+    if span_audio and audio_sec:
+        full_sec = timing["load_sec"] + timing["decode_sec"] * audio_sec / span_audio
+        spent = fast_sec + stats["refine_sec"]
+        stats["full_model_sec_est"] = round(full_sec, 3)
+        stats["saved_sec_est"] = round(full_sec - spent, 3)
+        stats["saved_ratio_est"] = round(1 - spent / full_sec, 4) if full_sec else None
+        print(
+            f"[ASR] two-pass: {len(spans)} span(s), {span_audio:.0f}s of {audio_sec:.0f}s re-transcribed with {model}; "
+            f"~{stats['saved_sec_est']:.0f}s ({stats['saved_ratio_est']:.0%}) saved vs {model} on everything"
+        )
+    else:
+        print(f"[ASR] two-pass: no low-confidence spans; {model} was not needed ({tp['fast_model']} only)")
+    return {**header, "two_pass": stats, "segments": out}
+
+
+def _traced_windows(segments_iter: Iterator[Any]) -> Iterator[Any]:
+    """Yield decoder segments, with one "asr.window" span per decode step when tracing.
+    The next() that ends the iteration raises StopIteration through its span, which the
+    tracer drops, so a trace has exactly one window per segment."""
+    it = iter(segments_iter)
+    while True:
+        try:
+            with span("asr.window", "asr") as args:
+                seg = next(it)
+                if args is not None:
+                    args["audio"] = f"{_sec_to_mmss(float(seg.start))}-{_sec_to_mmss(float(seg.end))}"
+        except StopIteration:
+            return
+        yield seg
 
 
 # -----------------------------
@@ -260,22 +830,46 @@ def _step_asr(input_media: Path, cfg: Dict[str, Any]) -> Dict[str, Any]:
 # -----------------------------
 def _step_preprocess(transcript: Dict[str, Any], cfg: Dict[str, Any]) -> Dict[str, Any]:
     segs: List[Dict[str, Any]] = transcript.get("segments", [])
+    clean = _segment_cleaner(cfg)
+    cleaned_segments = [c for c in (clean(seg) for seg in segs) if c is not None]
+
+    out = dict(transcript)
+    collapser = RepetitionCollapser.from_config(cfg)
+    if collapser is not None:
+        kept: List[Dict[str, Any]] = []
+        for seg in cleaned_segments:
+            kept.extend(collapser.push(seg))
+        kept.extend(collapser.flush())
+        cleaned_segments = kept
+        out["repetition"] = _report_repetition(collapser)
+    out["segments"] = cleaned_segments
+    return out
+
+
+def _report_repetition(collapser: RepetitionCollapser) -> Dict[str, Any]:
+    summary = collapser.summary()
+    if summary["collapsed"]:
+        print(
+            f"[Preprocess] repetition loops collapsed: {len(summary['collapsed'])} "
+            f"(-{summary['removed_segments']} segments, -{summary['removed_chars']} chars)"
+        )
+    return summary
+
+
+def _segment_cleaner(cfg: Dict[str, Any]) -> Callable[[Dict[str, Any]], Dict[str, Any] | None]:
+    """Per-segment preprocess (dictionaries loaded once); None when nothing is left."""
     terms_map = _load_terms_map(cfg)
     stop_phrases = _load_stop_phrases(cfg)
 
-    cleaned_segments = []
-    for seg in segs:
+    def _clean(seg: Dict[str, Any]) -> Dict[str, Any] | None:
         text = seg.get("text", "") or ""
         text = _normalize_whitespace(text)
         text = _apply_term_map(text, terms_map)
         text = _remove_stop_phrases(text, stop_phrases)
         text = _light_cleanup(text)
-        if text.strip():
-            cleaned_segments.append({**seg, "text": text})
+        return {**seg, "text": text} if text.strip() else None
 
-    out = dict(transcript)
-    out["segments"] = cleaned_segments
-    return out
+    return _clean
 
 
 def _load_terms_map(cfg: Dict[str, Any]) -> List[Tuple[str, str]]:
@@ -340,40 +934,121 @@ def _light_cleanup(text: str) -> str:
 # -----------------------------
 # Summarize (LLM adapters)
 # -----------------------------
-def _step_summarize(transcript_clean: Dict[str, Any], cfg: Dict[str, Any]) -> str:
-    project_root: Path = cfg["__project_root__"]
-    prompt_text = load_prompt_text(project_root, cfg["summarize"]["prompt_path"])
-    schema = load_schema(project_root, cfg["summarize"]["schema_path"])
+def _summarizer_for_run(cfg: Dict[str, Any], run_dir: Path | None = None):
+    """Configured summarizer, wrapped in a cassette recorder when summarize.record is on."""
+    summarizer = summarizer_from_config(cfg)
+    if cfg["summarize"].get("record") and run_dir is not None:
+        cassette = run_dir / cfg["summarize"].get("cassette_name", "llm_cassette.json")
+        summarizer = get_recorder(summarizer, cassette)
+    return summarizer
 
-    system_prompt = (
-        "あなたは高精度な議事録作成アシスタントです。"
-        "必ず指定されたJSON Schemaに適合する**JSONのみ**を返してください。"
-        "余計な文章やMarkdownは禁止です。"
-        "決定事項とToDo（担当・期限）を特に重視してください。"
-        "ToDoには会議後にやるタスクのみを含めてください。"
-    )
 
+def _step_summarize(transcript_clean: Dict[str, Any], cfg: Dict[str, Any], run_dir: Path | None = None) -> str:
+    schema = load_schema(cfg["__project_root__"], cfg["summarize"]["schema_path"])
+    compact = cfg["summarize"].get("compact")
+    _print_compaction_report(transcript_clean, compact)
     transcript_block = _format_transcript_for_prompt(
-        transcript_clean, max_chars=int(cfg['summarize'].get('max_transcript_chars', 40000))
+        transcript_clean, max_chars=int(cfg['summarize'].get('max_transcript_chars', 40000)), compact=compact
     )
+    minutes_obj = _summarize_blocks([transcript_block], cfg, run_dir=run_dir)[0]
+    return _render_with_schema_notes(minutes_obj, schema)
+
+
+def _summarize_blocks(
+    blocks: List[str], cfg: Dict[str, Any], run_dir: Path | None = None, stats: Dict[str, Any] | None = None
+) -> List[Dict[str, Any]]:
+    """One LLM call per transcript block (chunk), in parallel up to rate_limit.max_concurrency.
+    stats (when given) receives call latencies and token usage."""
+    summarize_one, finish = _block_summarizer(cfg, run_dir)
+    if len(blocks) == 1:
+        results = [summarize_one(blocks[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=min(_summarize_workers(cfg), len(blocks))) as ex:
+            results = list(ex.map(summarize_one, blocks))
+    usage = finish()
+    if stats is not None:
+        stats.update(usage)
+    return results
+
+
+def _summarize_workers(cfg: Dict[str, Any]) -> int:
+    return max(1, int(cfg["summarize"]["rate_limit"].get("max_concurrency") or 1))
 
-    user_prompt = (
-        prompt_text.strip()
-        + "\n\n"
-        + "## 文字起こし（整形後）\n"
-        + transcript_block
-        + "\n\n"
-        + "## 出力はJSONのみ\n"
-        + _schema_hint(schema)
-    )
 
-    engine = cfg["summarize"].get("engine", "mock")
+def _block_summarizer(
+    cfg: Dict[str, Any], run_dir: Path | None = None
+) -> Tuple[Callable[[str], Dict[str, Any]], Callable[[], Dict[str, Any]]]:
+    """(summarize one transcript block -> minutes object, print and return usage stats when done).
+
+    Prompt, schema, summarizer, cache, hedge and scheduler are set up once and shared by all
+    blocks (the returned function is thread-safe)."""
+    project_root: Path = cfg["__project_root__"]
+    prompt_text = load_prompt_text(project_root, cfg["summarize"]["prompt_path"])
+    schema = load_schema(project_root, cfg["summarize"]["schema_path"])
+
     model = cfg["summarize"].get("model")
-    ollama_base = cfg["summarize"].get("ollama_base_url", "http://localhost:11434")
+    summarizer = _summarizer_for_run(cfg, run_dir)
+    # recording must see every request, so cached responses are not served
+    cache = None if cfg["summarize"].get("record") else get_response_cache(cfg)
+    hedge = hedge_policy_from_config(cfg)
+    scheduler = get_scheduler(cfg)
+
+    latencies: List[float] = []
+    # summarizer, cache and hedge policy are process-wide: report only this run's share
+    usage_log: List[Dict[str, Any]] = []
+    cache_before = cache.stats() if cache is not None else {}
+    hedge_before = hedge.stats() if hedge is not None else {}
+
+    def _one(block: str) -> Dict[str, Any]:
+        system_prompt, user_prompt = _build_summarize_prompts(prompt_text, schema, block)
+        t0 = time.perf_counter()
+        try:
+            with span("llm.summarize", "llm", chars=len(block)):
+                return _call(system_prompt, user_prompt)
+        finally:
+            latencies.append(time.perf_counter() - t0)
+
+    def _call(system_prompt: str, user_prompt: str) -> Dict[str, Any]:
+        return run_llm_and_parse_json(
+            summarizer,
+            system_prompt,
+            user_prompt,
+            model=model,
+            cache=cache,
+            stream=bool(cfg["summarize"].get("stream", False)),
+            stream_retries=int(cfg["summarize"].get("stream_retries", 1)),
+            schema=schema,
+            progress=bool(cfg["summarize"].get("stream_progress", True)),
+            stream_strict_types=bool(cfg["summarize"].get("stream_strict_types", False)),
+            scheduler=scheduler,
+            hedge=hedge,
+            usage_log=usage_log,
+        )
+
+    def _delta(now: Dict[str, Any], before: Dict[str, Any], keys: Tuple[str, ...]) -> Dict[str, int]:
+        return {k: now[k] - before.get(k, 0) for k in keys}
+
+    def _finish() -> Dict[str, Any]:
+        if hedge is not None:
+            hs = _delta(hedge.stats(), hedge_before, ("calls", "hedged", "primary_wins", "hedge_wins"))
+            print(f"[LLM hedge] hedged={hs['hedged']}/{hs['calls']} primary_wins={hs['primary_wins']} hedge_wins={hs['hedge_wins']}")
+        if cache is not None:
+            st = _delta(cache.stats(), cache_before, ("hits", "misses", "coalesced"))
+            print(f"[LLM cache] hits={st['hits']} misses={st['misses']} coalesced={st['coalesced']}")
+            cache.evict()
+        pc = prompt_cache_stats(log=usage_log)
+        if pc["calls"]:
+            print(
+                f"[LLM usage] calls={pc['calls']} input={pc['input_tokens']} cached={pc['cached_tokens']} "
+                f"output={pc['output_tokens']} cached_ratio={pc['cached_ratio']}"
+            )
+        tokens = {k: pc[k] for k in ("input_tokens", "output_tokens", "cached_tokens")}
+        return {**latency_summary(latencies), **tokens}
+
+    return _one, _finish
 
-    summarizer = get_summarizer(engine, ollama_base_url=ollama_base)
-    minutes_obj = run_llm_and_parse_json(summarizer, system_prompt, user_prompt, model=model)
 
+def _render_with_schema_notes(minutes_obj: Dict[str, Any], schema: Dict[str, Any]) -> str:
     err = try_validate_schema(minutes_obj, schema)
     if err:
         minutes_obj.setdefault("notes", "")
@@ -382,12 +1057,41 @@ def _step_summarize(transcript_clean: Dict[str, Any], cfg: Dict[str, Any]) -> st
     return render_minutes_md(minutes_obj)
 
 
+SUMMARIZE_SYSTEM_PROMPT = (
+    "あなたは高精度な議事録作成アシスタントです。"
+    "必ず指定されたJSON Schemaに適合する**JSONのみ**を返してください。"
+    "余計な文章やMarkdownは禁止です。"
+    "決定事項とToDo（担当・期限）を特に重視してください。"
+    "ToDoには会議後にやるタスクのみを含めてください。"
+)
+
+
+def _build_summarize_prompts(prompt_text: str, schema: Dict[str, Any], transcript_block: str) -> Tuple[str, str]:
+    """Return (system, user). Static parts (rules, template, schema) form a stable system prefix
+    so providers can cache it across chunk calls and meetings; only the transcript varies."""
+    system_prompt = (
+        SUMMARIZE_SYSTEM_PROMPT
+        + "\n\n## 作業指示\n"
+        + prompt_text.strip()
+        + "\n\n## JSON Schema\n"
+        + json.dumps(schema, ensure_ascii=False, sort_keys=True)
+        + "\n\n## 出力はJSONのみ\n"
+        + _schema_hint(schema)
+    )
+    user_prompt = "## 文字起こし（整形後）\n" + transcript_block
+    return system_prompt, user_prompt
+
+
 def _write_request_pack(transcript_clean: Dict[str, Any], cfg: Dict[str, Any], out_dir: Path) -> None:
     """Create files for ChatGPT/Copilot UI summarization (no API)."""
     schema = load_schema(cfg["__project_root__"], cfg["summarize"]["schema_path"])
     prompt_text = load_prompt_text(cfg["__project_root__"], cfg["summarize"]["prompt_path"])
 
-    transcript_block = _format_transcript_for_prompt(transcript_clean, max_chars=int(cfg['summarize'].get('max_transcript_chars', 40000)))
+    compact = cfg["summarize"].get("compact")
+    _print_compaction_report(transcript_clean, compact)
+    transcript_block = _format_transcript_for_prompt(
+        transcript_clean, max_chars=int(cfg['summarize'].get('max_transcript_chars', 40000)), compact=compact
+    )
 
     instr_name = cfg["summarize"].get("manual_instructions_md", "llm_instructions.md")
     txt_name = cfg["summarize"].get("manual_transcript_txt", "llm_transcript.txt")
@@ -491,17 +1195,21 @@ def _schema_hint(schema: Dict[str, Any]) -> str:
     return "必須トップレベルキー: " + ", ".join(req)
 
 
-def _format_transcript_for_prompt(transcript: Dict[str, Any], max_chars: int = 40000) -> str:
+def _format_transcript_for_prompt(
+    transcript: Dict[str, Any],
+    max_chars: int = 40000,
+    compact: Dict[str, Any] | None = None,
+) -> str:
     segs = transcript.get("segments", []) or []
+    if compact and compact.get("enabled"):
+        source_lines = _compact_transcript_lines(segs, compact)
+    else:
+        source_lines = [_segment_prompt_line(s) for s in segs]
     lines = []
     total = 0
-    for s in segs:
-        start = float(s.get("start", 0.0))
-        speaker = s.get("speaker") or "Speaker"
-        text = (s.get("text") or "").strip()
-        if not text:
+    for line in source_lines:
+        if not line:
             continue
-        line = f"[{_sec_to_mmss(start)}] {speaker}: {text}"
         lines.append(line)
         total += len(line) + 1
         if total > max_chars:
@@ -510,6 +1218,109 @@ def _format_transcript_for_prompt(transcript: Dict[str, Any], max_chars: int = 4
     return "\n".join(lines)
 
 
+def _segment_prompt_line(s: Dict[str, Any]) -> str:
+    """Full-format prompt line: [mm:ss] Speaker: text (empty when text is blank)."""
+    text = (s.get("text") or "").strip()
+    if not text:
+        return ""
+    speaker = s.get("speaker") or "Speaker"
+    return f"[{_sec_to_mmss(float(s.get('start', 0.0)))}] {speaker}: {text}"
+
+
+DEFAULT_FILLER_PHRASES = [
+    "えー", "えーと", "ええと", "えっと", "あー", "あのー", "あの", "その", "まあ", "うーん", "うん", "んー",
+]
+_FILLER_PUNCT = r"[\s、。,.!?！？…・]"
+
+
+@lru_cache(maxsize=16)
+def _filler_only_re(fillers: Tuple[str, ...]) -> "re.Pattern[str]":
+    # whole tokens only: "そのまま" is "その" + "まま", not a filler followed by noise
+    alts = "|".join(re.escape(f) for f in sorted(fillers, key=len, reverse=True) if f)
+    return re.compile(rf"(?:{alts}|{_FILLER_PUNCT})*" if alts else rf"{_FILLER_PUNCT}*")
+
+
+def _is_filler_only(text: str, fillers: List[str]) -> bool:
+    """True when text is nothing but filler phrases and punctuation."""
+    return _filler_only_re(tuple(fillers)).fullmatch(text) is not None
+
+
+def _compact_transcript_lines(segs: List[Dict[str, Any]], compact: Dict[str, Any]) -> List[str]:
+    """Coalesce consecutive same-speaker segments, emit [mm:ss] only every N seconds, drop filler-only lines.
+
+    A speaker prefix is written only when the segment carries a real speaker label.
+    """
+    interval = float(compact.get("timestamp_interval_sec", 60))
+    max_line = int(compact.get("max_line_chars", 400))
+    fillers = sorted(
+        set(DEFAULT_FILLER_PHRASES) | set(compact.get("filler_phrases") or []), key=len, reverse=True
+    )
+
+    lines: List[str] = []
+    buf: List[str] = []
+    buf_len = 0
+    cur_speaker: Any = object()
+    last_ts: float | None = None
+
+    def _flush() -> None:
+        nonlocal buf, buf_len
+        if buf:
+            lines.append("".join(buf))
+        buf, buf_len = [], 0
+
+    for s in segs:
+        text = (s.get("text") or "").strip()
+        if not text or _is_filler_only(text, fillers):
+            continue
+        start = float(s.get("start", 0.0))
+        speaker = s.get("speaker")
+        ts_due = last_ts is None or start - last_ts >= interval
+        if buf and (speaker != cur_speaker or ts_due or buf_len + len(text) > max_line):
+            _flush()
+        if not buf:
+            prefix = ""
+            if ts_due:
+                prefix = f"[{_sec_to_mmss(start)}] "
+                last_ts = start
+            if speaker:
+                prefix += f"{speaker}: "
+            buf.append(prefix)
+            buf_len = len(prefix)
+            cur_speaker = speaker
+        elif not buf[-1].endswith(("。", "！", "？", "、", ".", "!", "?")):
+            buf.append(" ")
+            buf_len += 1
+        buf.append(text)
+        buf_len += len(text)
+    _flush()
+    return lines
+
+
+def _compaction_report(transcript: Dict[str, Any], compact: Dict[str, Any] | None) -> Dict[str, int] | None:
+    """Before/after chars and estimated tokens for the compact prompt format (None when disabled)."""
+    if not compact or not compact.get("enabled"):
+        return None
+    segs = transcript.get("segments", []) or []
+    before = "\n".join(l for l in (_segment_prompt_line(s) for s in segs) if l)
+    after = "\n".join(_compact_transcript_lines(segs, compact))
+    return {
+        "chars_before": len(before),
+        "chars_after": len(after),
+        "tokens_before": estimate_tokens(before),
+        "tokens_after": estimate_tokens(after),
+    }
+
+
+def _print_compaction_report(transcript: Dict[str, Any], compact: Dict[str, Any] | None) -> None:
+    rep = _compaction_report(transcript, compact)
+    if rep is None:
+        return
+    print(
+        f"[Compact] chars {rep['chars_before']} -> {rep['chars_after']}, "
+        f"tokens ~{rep['tokens_before']} -> ~{rep['tokens_after']}"
+    )
+
+
 def _format_transcript_plain(transcript: Dict[str, Any], max_chars: int = 20000) -> str:
     segs = transcript.get("segments", []) or []
     txt = "\n".join([(s.get("text") or "").strip() for s in segs if (s.get("text") or "").strip()])
@@ -529,30 +1340,29 @@ def run_chunk(transcript_clean_path: Path, config_path: Path) -> None:
     """Split transcript_clean.json into chunks (20k–40k chars) and write manifest."""
     cfg = load_config(config_path)
     transcript_clean = read_json(transcript_clean_path)
-    run_dir = transcript_clean_path.parent
-    chunks_dir = run_dir / "chunks"
-    ensure_dir(chunks_dir)
+    chunks_dir = transcript_clean_path.parent / "chunks"
+    manifest = _write_chunks(transcript_clean, cfg, chunks_dir, source=transcript_clean_path)
+    print(f"[OK] Chunks: {chunks_dir} ({len(manifest['chunks'])} files)")
+
 
+def _write_chunks(transcript: Dict[str, Any], cfg: Dict[str, Any], chunks_dir: Path, source: Path) -> Dict[str, Any]:
+    """Write chunks_dir/chunk_XX.txt and manifest.json; returns the manifest."""
+    _print_compaction_report(transcript, cfg["summarize"].get("compact"))
     target_chars = int(cfg.get("chunk", {}).get("target_chars", 30000))
-    min_chars = int(cfg.get("chunk", {}).get("min_chars", 10000))
+    return _write_chunk_files(_chunk_texts(transcript, cfg), chunks_dir, source=source, target_chars=target_chars)
 
-    slices = _build_chunk_slices(
-        transcript_clean, target_chars=target_chars, min_chars=min_chars
-    )
-    segs = transcript_clean.get("segments", []) or []
+
+def _write_chunk_files(
+    chunks: List[Tuple[str, float, float, int]], chunks_dir: Path, source: Path, target_chars: int
+) -> Dict[str, Any]:
+    ensure_dir(chunks_dir)
+    for p in chunks_dir.glob("chunk_*.txt"):
+        p.unlink()  # a re-chunk may produce fewer files
     chunk_list: List[Dict[str, Any]] = []
 
-    for idx, (start_i, end_i, start_sec, end_sec, char_count) in enumerate(slices, 1):
-        chunk_segs = segs[start_i:end_i]
-        lines = []
-        for s in chunk_segs:
-            start = float(s.get("start", 0.0))
-            speaker = s.get("speaker") or "Speaker"
-            text = (s.get("text") or "").strip()
-            if text:
-                lines.append(f"[{_sec_to_mmss(start)}] {speaker}: {text}")
+    for idx, (text, start_sec, end_sec, char_count) in enumerate(chunks, 1):
         chunk_path = chunks_dir / f"chunk_{idx:02d}.txt"
-        write_text(chunk_path, "\n".join(lines))
+        write_text(chunk_path, text)
         chunk_list.append({
             "file": chunk_path.name,
             "start_sec": round(start_sec, 1),
@@ -561,22 +1371,54 @@ def run_chunk(transcript_clean_path: Path, config_path: Path) -> None:
         })
 
     manifest = {
-        "source": str(transcript_clean_path),
+        "source": str(source),
         "target_chars": target_chars,
         "chunks": chunk_list,
     }
     write_json(chunks_dir / "manifest.json", manifest)
-    print(f"[OK] Chunks: {chunks_dir} ({len(chunk_list)} files)")
+    return manifest
+
+
+def _chunk_texts(transcript: Dict[str, Any], cfg: Dict[str, Any]) -> List[Tuple[str, float, float, int]]:
+    """(text, start_sec, end_sec, char_count) per chunk, using chunk.* sizes and summarize.compact."""
+    target_chars = int(cfg.get("chunk", {}).get("target_chars", 30000))
+    min_chars = int(cfg.get("chunk", {}).get("min_chars", 10000))
+    compact = cfg["summarize"].get("compact")
+    use_compact = bool(compact and compact.get("enabled"))
+    segs = transcript.get("segments", []) or []
+    out: List[Tuple[str, float, float, int]] = []
+    for start_i, end_i, start_sec, end_sec, char_count in _build_chunk_slices(
+        transcript, target_chars=target_chars, min_chars=min_chars, compact=use_compact
+    ):
+        text, char_count = _chunk_text(segs[start_i:end_i], compact if use_compact else None, char_count)
+        out.append((text, start_sec, end_sec, char_count))
+    return out
+
+
+def _chunk_text(chunk_segs: List[Dict[str, Any]], compact: Dict[str, Any] | None, char_count: int) -> Tuple[str, int]:
+    """Prompt text for one chunk; compact lines are re-measured after compaction."""
+    if compact:
+        lines = _compact_transcript_lines(chunk_segs, compact)
+        char_count = sum(len(l) + 1 for l in lines)
+    else:
+        lines = [l for l in (_segment_prompt_line(s) for s in chunk_segs) if l]
+    return "\n".join(lines), char_count
 
 
 def _build_chunk_slices(
-    transcript: Dict[str, Any], target_chars: int = 30000, min_chars: int = 10000
+    transcript: Dict[str, Any], target_chars: int = 30000, min_chars: int = 10000, compact: bool = False
 ) -> List[Tuple[int, int, float, float, int]]:
-    """Build (start_idx, end_idx, start_sec, end_sec, char_count) per chunk."""
+    """Build (start_idx, end_idx, start_sec, end_sec, char_count) per chunk.
+
+    With compact=True sizes are measured on segment text only (approximating the compact format).
+    """
     segs = transcript.get("segments", []) or []
     if not segs:
         return []
 
+    def _line_len(s: Dict[str, Any]) -> int:
+        return _chunk_line_len(s, compact)
+
     slices: List[Tuple[int, int, float, float, int]] = []
     start_i = 0
     acc = 0
@@ -584,11 +1426,7 @@ def _build_chunk_slices(
 
     for i, s in enumerate(segs):
         start = float(s.get("start", 0.0))
-        speaker = s.get("speaker") or "Speaker"
-        text = (s.get("text") or "").strip()
-        line = f"[{_sec_to_mmss(start)}] {speaker}: {text}" if text else ""
-        line_len = len(line) + (1 if line else 0)
-        acc += line_len
+        acc += _line_len(s)
         end_sec = float(s.get("end", start))
 
         if acc >= target_chars or (acc >= min_chars and i == len(segs) - 1):
@@ -599,30 +1437,187 @@ def _build_chunk_slices(
                 chunk_start_sec = float(segs[start_i].get("start", 0.0))
 
     if start_i < len(segs):
-        acc = 0
-        for j in range(start_i, len(segs)):
-            s = segs[j]
-            st = float(s.get("start", 0.0))
-            sp = s.get("speaker") or "Speaker"
-            tx = (s.get("text") or "").strip()
-            ln = f"[{_sec_to_mmss(st)}] {sp}: {tx}" if tx else ""
-            acc += len(ln) + (1 if ln else 0)
+        acc = sum(_line_len(segs[j]) for j in range(start_i, len(segs)))
         slices.append((start_i, len(segs), chunk_start_sec, float(segs[-1].get("end", 0.0)), acc))
 
     return slices
 
 
+def _chunk_line_len(s: Dict[str, Any], compact: bool) -> int:
+    if compact:
+        text = (s.get("text") or "").strip()
+        return len(text) + 1 if text else 0
+    line = _segment_prompt_line(s)
+    return len(line) + (1 if line else 0)
+
+
+class _OnlineChunker:
+    """Incremental _chunk_texts: feed segments as they arrive; a chunk is returned as soon as it
+    reaches chunk.target_chars. close() returns the remainder. Produces the same chunks as
+    _chunk_texts over the full transcript."""
+
+    def __init__(self, cfg: Dict[str, Any]) -> None:
+        self.target_chars = int(cfg.get("chunk", {}).get("target_chars", 30000))
+        compact = cfg["summarize"].get("compact")
+        self.compact = compact if compact and compact.get("enabled") else None
+        self._segs: List[Dict[str, Any]] = []
+        self._acc = 0
+
+    def add(self, seg: Dict[str, Any]) -> Tuple[str, float, float, int] | None:
+        self._segs.append(seg)
+        self._acc += _chunk_line_len(seg, self.compact is not None)
+        return self._emit() if self._acc >= self.target_chars else None
+
+    def close(self) -> Tuple[str, float, float, int] | None:
+        return self._emit() if self._segs else None
+
+    def _emit(self) -> Tuple[str, float, float, int]:
+        segs, acc = self._segs, self._acc
+        self._segs, self._acc = [], 0
+        start_sec = float(segs[0].get("start", 0.0))
+        end_sec = float(segs[-1].get("end", segs[-1].get("start", 0.0)))
+        text, char_count = _chunk_text(segs, self.compact, acc)
+        return text, start_sec, end_sec, char_count
+
+
 # -----------------------------
 # Merge (部分要約 → 最終JSON)
 # -----------------------------
-def run_merge(partial_paths: List[Path], config_path: Path, out_path: Path | None = None) -> Path:
-    """Merge partial JSONs into one schema-compliant final JSON. Dedupe ToDo; conflicting due → 未確定."""
+def run_merge(
+    partial_paths: List[Path],
+    config_path: Path,
+    out_path: Path | None = None,
+    tree_k: int | None = None,
+    merge_engine: str | None = None,
+) -> Path:
+    """Merge partial JSONs into one schema-compliant final JSON. Dedupe ToDo; conflicting due → 未確定.
+
+    With tree_k (or merge.tree_k) and more partials than k, merge in groups of k per level
+    (tree-reduce); levels are persisted under merge_tree/ so an interrupted run resumes.
+    """
     if not partial_paths:
         raise ValueError("At least one partial JSON path is required.")
     cfg = load_config(config_path)
     project_root: Path = cfg["__project_root__"]
     schema = load_schema(project_root, cfg["summarize"]["schema_path"])
 
+    objs = [_read_partial(p) for p in partial_paths if p.exists()]
+    run_dir = partial_paths[0].parent if partial_paths else Path.cwd()
+    merged = _merge_objects(objs, cfg, run_dir, schema, tree_k=tree_k, merge_engine=merge_engine)
+
+    err = try_validate_schema(merged, schema)
+    if err:
+        merged.setdefault("notes", "")
+        merged["notes"] = (merged["notes"] + "\n\n[SchemaValidationError]\n" + err).strip()
+
+    if out_path is None:
+        out_path = run_dir / "llm_output.json"
+    write_json(out_path, merged)
+    print(f"[OK] Merged: {out_path}")
+    return out_path
+
+
+def _merge_objects(
+    objs: List[Dict[str, Any]],
+    cfg: Dict[str, Any],
+    run_dir: Path,
+    schema: Dict[str, Any],
+    tree_k: int | None = None,
+    merge_engine: str | None = None,
+) -> Dict[str, Any]:
+    """Flat merge, or tree-reduce under run_dir/merge_tree when there are more objects than k."""
+    k = tree_k if tree_k is not None else cfg["merge"].get("tree_k")
+    if k and int(k) >= 2 and len(objs) > int(k):
+        engine = (merge_engine or cfg["merge"].get("engine") or "deterministic").lower()
+        return _tree_reduce_merge(objs, int(k), run_dir / "merge_tree", cfg, engine=engine, schema=schema)
+    return _merge_partial_objects(objs, similarity=cfg["merge"].get("similarity"))
+
+
+def watch_merge(
+    watch_dir: Path,
+    config_path: Path,
+    interval: float = 1.0,
+    idle_exit: float | None = None,
+    stop: threading.Event | None = None,
+) -> int:
+    """Watch watch_dir for partial_*.json and keep llm_output.json / minutes_draft.md up to date.
+
+    Parsed partials are kept in memory keyed by (mtime, size), so each poll re-reads only new
+    or changed files; a file that does not parse yet (still being saved) is retried on the next
+    poll. Stops on Ctrl-C, when stop is set, or after idle_exit seconds without changes.
+    Returns the number of merges written.
+    """
+    cfg = load_config(config_path)
+    schema = load_schema(cfg["__project_root__"], cfg["summarize"]["schema_path"])
+    similarity = cfg["merge"].get("similarity")
+    out_json = watch_dir / "llm_output.json"
+    out_md = watch_dir / cfg["summarize"].get("output_md", "minutes_draft.md")
+    manifest_path = watch_dir / "chunks" / "manifest.json"
+
+    parsed: Dict[Path, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+    merges = 0
+    last_change = time.monotonic()
+    print(f"[Watch] {watch_dir} (partial_*.json, every {interval:g}s; Ctrl-C to stop)")
+    try:
+        while stop is None or not stop.is_set():
+            changed = False
+            present = set()
+            for p in sorted(watch_dir.glob("partial_*.json")):
+                present.add(p)
+                try:
+                    st = p.stat()
+                except OSError:
+                    continue
+                sig = (st.st_mtime_ns, st.st_size)
+                if p in parsed and parsed[p][0] == sig:
+                    continue
+                seen = p in parsed
+                try:
+                    parsed[p] = (sig, _read_partial(p))
+                except (OSError, ValueError) as e:
+                    print(f"[Watch] {p.name}: not readable yet ({e})")
+                    continue
+                print(f"[Watch] {'updated' if seen else 'loaded'} {p.name}")
+                changed = True
+            for p in [p for p in parsed if p not in present]:
+                del parsed[p]
+                changed = True
+
+            if changed and parsed:
+                merged = _merge_partial_objects([parsed[p][1] for p in sorted(parsed)], similarity=similarity)
+                err = try_validate_schema(merged, schema)
+                if err:
+                    merged["notes"] = (merged["notes"] + "\n\n[SchemaValidationError]\n" + err).strip()
+                write_json(out_json, merged)
+                write_text(out_md, render_minutes_md(normalize_minutes(merged)[0]))
+                merges += 1
+                expected = len(read_json(manifest_path).get("chunks", [])) if manifest_path.exists() else None
+                progress = f"{len(parsed)}/{expected}" if expected else str(len(parsed))
+                print(f"[Watch] merged {progress} partials -> {out_md.name}")
+            if changed:
+                last_change = time.monotonic()
+            elif idle_exit is not None and time.monotonic() - last_change >= idle_exit:
+                break
+            if stop is not None:
+                stop.wait(interval)
+            else:
+                time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+    print(f"[OK] Watch stopped after {merges} merges: {out_json}")
+    return merges
+
+
+def _read_partial(p: Path) -> Dict[str, Any]:
+    raw = p.read_text(encoding="utf-8").strip()
+    return extract_json(raw)
+
+
+def _merge_partial_objects(objs: List[Dict[str, Any]], similarity: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    """Deterministic merge of partial (or already merged) objects into the final shape.
+
+    With similarity (merge.similarity) enabled, near-duplicate ToDos/decisions are merged too.
+    """
     merged: Dict[str, Any] = {
         "meeting": {"title": "", "date": "", "participants": []},
         "summary": [],
@@ -641,11 +1636,7 @@ def run_merge(partial_paths: List[Path], config_path: Path, out_path: Path | Non
     all_next: List[str] = []
     meeting_seen = False
 
-    for p in partial_paths:
-        if not p.exists():
-            continue
-        raw = p.read_text(encoding="utf-8").strip()
-        obj = extract_json(raw) if not raw.startswith("{") else json.loads(raw)
+    for obj in objs:
         for d in obj.get("decisions", []) or []:
             all_decisions.append(_normalize_decision_item(d))
         all_todos.extend(obj.get("todos", []) or [])
@@ -658,23 +1649,131 @@ def run_merge(partial_paths: List[Path], config_path: Path, out_path: Path | Non
         if obj.get("summary"):
             merged["summary"] = merged["summary"] or obj["summary"]
 
-    merged["decisions"] = _merge_decisions(all_decisions)
-    merged["todos"] = _merge_todos(all_todos)
+    index = _similarity_index(similarity)
+    merged["decisions"] = _merge_decisions(all_decisions, index)
+    merged["todos"] = _merge_todos(all_todos, index)
     merged["topics"] = _dedupe_strings(all_topics)
     merged["open_questions"] = _dedupe_strings(all_open)
     merged["next_steps"] = _dedupe_strings(all_next)
+    return merged
+
+
+def _tree_reduce_merge(
+    objs: List[Dict[str, Any]],
+    k: int,
+    tree_dir: Path,
+    cfg: Dict[str, Any],
+    engine: str = "deterministic",
+    schema: Dict[str, Any] | None = None,
+) -> Dict[str, Any]:
+    """Merge in groups of k per level until one object remains.
+
+    Each node is written to tree_dir/level_XX/node_YYY.json with a hash of its inputs and of
+    how they are merged (engine, model, prompt/schema, similarity settings); a node whose
+    stored hash matches is reused, so a failed run resumes mid-tree.
+    LLM-backed merges of the same level run in parallel (merge.max_workers).
+    """
+    summarize_engine = (cfg["summarize"].get("engine") or "mock").lower()
+    use_llm = engine == "llm" and summarize_engine not in ("mock", "manual")
+    if engine == "llm" and not use_llm:
+        print(f"[WARN] merge.engine=llm needs an API/ollama summarize.engine (got {summarize_engine}); using deterministic merge.")
+    max_workers = max(1, int(cfg["merge"].get("max_workers", 4)))
+    merge_key = {"engine": "deterministic", "similarity": cfg["merge"].get("similarity")}
+    if use_llm:
+        merge_key.update(
+            engine="llm",
+            summarize_engine=summarize_engine,
+            model=cfg["summarize"].get("model"),
+            prompt=_content_hash(_merge_prompts([], schema or {})[0]),
+        )
+
+    level = 1
+    current = objs
+    while len(current) > 1:
+        level_dir = tree_dir / f"level_{level:02d}"
+        groups = [current[i:i + k] for i in range(0, len(current), k)]
+        results: List[Dict[str, Any] | None] = [None] * len(groups)
+        todo: List[Tuple[int, List[Dict[str, Any]], str]] = []
+        for idx, group in enumerate(groups):
+            inputs_hash = _content_hash([merge_key, group])
+            node_path = level_dir / f"node_{idx + 1:03d}.json"
+            if node_path.exists():
+                try:
+                    node = read_json(node_path)
+                    if node.get("inputs_hash") == inputs_hash:
+                        results[idx] = node["result"]
+                        continue
+                except (OSError, ValueError, KeyError):
+                    pass
+            todo.append((idx, group, inputs_hash))
+
+        def _merge_node(item: Tuple[int, List[Dict[str, Any]], str]) -> Tuple[int, Dict[str, Any]]:
+            idx, group, inputs_hash = item
+            if len(group) == 1:
+                result = group[0]
+            elif use_llm:
+                result = _llm_merge_group(group, cfg, schema or {}, run_dir=tree_dir.parent)
+            else:
+                result = _merge_partial_objects(group, similarity=cfg["merge"].get("similarity"))
+            write_json(level_dir / f"node_{idx + 1:03d}.json", {"inputs_hash": inputs_hash, "result": result})
+            return idx, result
+
+        if use_llm and len(todo) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as ex:
+                for idx, result in ex.map(_merge_node, todo):
+                    results[idx] = result
+        else:
+            for item in todo:
+                idx, result = _merge_node(item)
+                results[idx] = result
+
+        reused = len(groups) - len(todo)
+        print(f"[Merge] level {level}: {len(current)} -> {len(groups)} (reused {reused})")
+        current = [r for r in results if r is not None]
+        level += 1
+    return current[0] if current else _merge_partial_objects([], similarity=cfg["merge"].get("similarity"))
+
+
+def _llm_merge_group(
+    group: List[Dict[str, Any]], cfg: Dict[str, Any], schema: Dict[str, Any], run_dir: Path | None = None
+) -> Dict[str, Any]:
+    """Merge one group of partials with the configured LLM; falls back to deterministic on failure."""
+    system_prompt, user_prompt = _merge_prompts(group, schema)
+    try:
+        with span("llm.merge", "llm", partials=len(group)):
+            obj = run_llm_and_parse_json(
+                _summarizer_for_run(cfg, run_dir),
+                system_prompt,
+                user_prompt,
+                model=cfg["summarize"].get("model"),
+                cache=None if cfg["summarize"].get("record") else get_response_cache(cfg),
+                schema=schema,
+                progress=False,
+                scheduler=get_scheduler(cfg),
+            )
+    except Exception as e:  # noqa
+        print(f"[WARN] LLM merge failed ({e}); using deterministic merge for this group.")
+        return _merge_partial_objects(group, similarity=cfg["merge"].get("similarity"))
+    # normalize shape/dedupe on top of the model output
+    return _merge_partial_objects([obj], similarity=cfg["merge"].get("similarity"))
 
-    err = try_validate_schema(merged, schema)
-    if err:
-        merged.setdefault("notes", "")
-        merged["notes"] = (merged["notes"] + "\n\n[SchemaValidationError]\n" + err).strip()
 
-    if out_path is None:
-        run_dir = partial_paths[0].parent if partial_paths else Path.cwd()
-        out_path = run_dir / "llm_output.json"
-    write_json(out_path, merged)
-    print(f"[OK] Merged: {out_path}")
-    return out_path
+def _merge_prompts(group: List[Dict[str, Any]], schema: Dict[str, Any]) -> Tuple[str, str]:
+    system_prompt = (
+        "あなたは議事録の統合アシスタントです。"
+        "複数の部分JSONを1つのJSONに統合し、**JSONのみ**を返してください。"
+        "重複ToDoは1件にまとめ、期限が矛盾する場合は due を「未確定」にしてください。"
+        "決定事項と未決事項を混同しないでください。"
+        + _schema_hint(schema)
+    )
+    user_prompt = "\n\n".join(
+        f"## partial {i:02d}\n" + json.dumps(obj, ensure_ascii=False) for i, obj in enumerate(group, 1)
+    )
+    return system_prompt, user_prompt
+
+
+def _content_hash(obj: Any) -> str:
+    return hashlib.sha256(json.dumps(obj, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
 
 
 def _normalize_decision_item(d: Any) -> Dict[str, Any]:
@@ -690,8 +1789,21 @@ def _normalize_decision_item(d: Any) -> Dict[str, Any]:
     return {"text": str(d), "timestamp": "", "evidence": ""}
 
 
-def _merge_decisions(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Dedupe by text; merge timestamp/evidence from first occurrence."""
+def _similarity_index(similarity: Dict[str, Any] | None) -> MinHashLSH | None:
+    if not similarity or not similarity.get("enabled", False):
+        return None
+    return MinHashLSH(
+        threshold=float(similarity.get("threshold", 0.8)),
+        ngram=int(similarity.get("ngram", 2)),
+        num_perm=int(similarity.get("num_perm", 64)),
+    )
+
+
+def _merge_decisions(items: List[Dict[str, Any]], index: MinHashLSH | None = None) -> List[Dict[str, Any]]:
+    """Dedupe by text; merge timestamp/evidence from first occurrence.
+
+    With a similarity index, near-duplicate texts are merged into the first of their cluster.
+    """
     seen: set[str] = set()
     out: List[Dict[str, Any]] = []
     for x in items:
@@ -705,7 +1817,17 @@ def _merge_decisions(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         if (x.get("evidence") or "").strip():
             entry["evidence"] = (x.get("evidence") or "").strip()
         out.append(entry)
-    return out
+    if index is None or len(out) < 2:
+        return out
+    merged: List[Dict[str, Any]] = []
+    for cluster in index.cluster([d["text"] for d in out]):
+        base = out[cluster[0]]
+        for j in cluster[1:]:
+            for k in ("timestamp", "evidence"):
+                if out[j].get(k) and not base.get(k):
+                    base[k] = out[j][k]
+        merged.append(base)
+    return merged
 
 
 def _dedupe_strings(items: List[str]) -> List[str]:
@@ -719,8 +1841,12 @@ def _dedupe_strings(items: List[str]) -> List[str]:
     return out
 
 
-def _merge_todos(todos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Dedupe by task; if same task with different due → due = 未確定. Preserve timestamp/evidence."""
+def _merge_todos(todos: List[Dict[str, Any]], index: MinHashLSH | None = None) -> List[Dict[str, Any]]:
+    """Dedupe by task; if same task with different due → due = 未確定. Preserve timestamp/evidence.
+
+    With a similarity index, near-duplicate tasks (compatible owners) are folded into the first
+    of their cluster with the same due rule.
+    """
     key_to_todo: Dict[str, Dict[str, Any]] = {}
     for t in todos:
         task = (t.get("task") or "").strip()
@@ -732,20 +1858,46 @@ def _merge_todos(todos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         ev = (t.get("evidence") or "").strip()
         key = task
         if key in key_to_todo:
-            existing = key_to_todo[key]
-            if (existing.get("due") or "").strip() != due and due:
-                existing["due"] = "未確定"
-            if ts and not (existing.get("timestamp") or "").strip():
-                existing["timestamp"] = ts
-            if ev and not (existing.get("evidence") or "").strip():
-                existing["evidence"] = ev
+            _fold_todo(key_to_todo[key], {"due": due, "timestamp": ts, "evidence": ev})
         else:
             key_to_todo[key] = {"owner": owner, "task": task, "due": due or ""}
             if ts:
                 key_to_todo[key]["timestamp"] = ts
             if ev:
                 key_to_todo[key]["evidence"] = ev
-    return list(key_to_todo.values())
+    out = list(key_to_todo.values())
+    if index is None or len(out) < 2:
+        return out
+
+    owners = [_owner_key(t["owner"]) for t in out]
+    clusters = index.cluster(
+        [t["task"] for t in out],
+        compatible=lambda a, b: not owners[a] or not owners[b] or owners[a] == owners[b],
+    )
+    merged: List[Dict[str, Any]] = []
+    for cluster in clusters:
+        base = out[cluster[0]]
+        for j in cluster[1:]:
+            _fold_todo(base, out[j])
+        merged.append(base)
+    return merged
+
+
+def _fold_todo(existing: Dict[str, Any], other: Dict[str, Any]) -> None:
+    """Fold a duplicate into existing: differing due → 未確定; fill owner/timestamp/evidence."""
+    due = (other.get("due") or "").strip()
+    if (existing.get("due") or "").strip() != due and due:
+        existing["due"] = "未確定"
+    if (other.get("owner") or "").strip() and not (existing.get("owner") or "").strip():
+        existing["owner"] = other["owner"].strip()
+    for k in ("timestamp", "evidence"):
+        v = (other.get(k) or "").strip()
+        if v and not (existing.get(k) or "").strip():
+            existing[k] = v
+
+
+def _owner_key(owner: str) -> str:
+    return re.sub(r"(さん|様|氏|くん|君)$", "", (owner or "").strip())
 
 
 # -----------------------------
@@ -755,7 +1907,7 @@ def run_check(json_path: Path, config_path: Path) -> None:
     """Run quality check on minutes JSON and print warnings."""
     cfg = load_config(config_path)
     raw = json_path.read_text(encoding="utf-8").strip()
-    minutes_obj = extract_json(raw) if not raw.startswith("{") else json.loads(raw)
+    minutes_obj = extract_json(raw)
     schema = load_schema(cfg["__project_root__"], cfg["summarize"]["schema_path"])
     err = try_validate_schema(minutes_obj, schema)
     if err:
@@ -769,3 +1921,205 @@ def run_check(json_path: Path, config_path: Path) -> None:
             print(f"  - {w}")
     else:
         print("[品質チェック] 警告なし")
+
+
+# -----------------------------
+# Batch (provider batch jobs: submit → status → collect)
+# -----------------------------
+def batch_submit(transcript_paths: List[Path], config_path: Path, job_path: Path | None = None) -> Path:
+    """Package chunk requests for many meetings into one provider batch job and persist the job file."""
+    if not transcript_paths:
+        raise ValueError("At least one transcript_clean.json path is required.")
+    cfg = load_config(config_path)
+    client = batch_client_from_config(cfg)
+    project_root: Path = cfg["__project_root__"]
+
+    requests: List[BatchRequest] = []
+    meetings: List[Dict[str, Any]] = []
+    for m_idx, path in enumerate(transcript_paths, 1):
+        meeting = {
+            "id": f"m{m_idx:03d}",
+            "transcript": str(path.resolve()),
+            "run_dir": str(path.resolve().parent),
+        }
+        chunk_requests = _batch_chunk_requests(meeting, cfg)
+        requests.extend(chunk_requests)
+        meeting["chunks"] = [r.custom_id for r in chunk_requests]
+        meetings.append(meeting)
+    if not requests:
+        raise ValueError("No transcript segments to submit.")
+
+    job_id = client.submit(requests)
+    job = {
+        "version": 1,
+        "engine": client.engine,
+        "config_path": str(config_path.resolve()),
+        "submitted_at": dt.datetime.now().isoformat(timespec="seconds"),
+        "phase": "chunk",
+        "chunk_job_id": job_id,
+        "merge_job_id": None,
+        "resubmits": 0,
+        "meetings": meetings,
+    }
+    if job_path is None:
+        job_path = project_root / cfg["summarize"]["batch"].get("job_file", "batch_job.json")
+    write_json(job_path, job)
+    print(f"[Batch] submitted {len(requests)} chunk requests for {len(meetings)} meetings: {job_id}")
+    print(f"[OK] Job: {job_path}")
+    return job_path
+
+
+def batch_status(job_path: Path) -> BatchStatus:
+    job = read_json(job_path)
+    cfg = _batch_job_config(job)
+    st = batch_client_from_config(cfg).status(_batch_current_job_id(job))
+    print(f"[Batch] phase={job['phase']} job={st.job_id} state={st.state} completed={st.completed}/{st.total} failed={st.failed}")
+    return st
+
+
+def batch_collect(job_path: Path, wait: bool = False) -> bool:
+    """Collect finished batch results into partial_XX.json per meeting, merge and render.
+
+    Chunks that failed or expired are listed under the meeting's "missing" in the job file
+    and resubmitted as a new chunk job (up to summarize.batch.max_resubmits times); collect
+    again once it completes. If chunks are still missing after that, nothing is rendered
+    and RuntimeError is raised, since minutes lacking part of the meeting would look final.
+    With merge.engine=llm, meetings with several chunks get a second (merge) batch job;
+    collect again once it completes. Returns True when every meeting has been rendered.
+    """
+    job = read_json(job_path)
+    if job.get("phase") == "done":
+        print("[Batch] already collected")
+        return True
+    cfg = _batch_job_config(job)
+    config_path = Path(job["config_path"])
+    client = batch_client_from_config(cfg)
+    poll = float(cfg["summarize"]["batch"].get("poll_interval_sec", 60))
+
+    job_id = _batch_current_job_id(job)
+    st = client.status(job_id)
+    while not st.done and wait:
+        print(f"[Batch] {job_id} {st.state} {st.completed}/{st.total}; next poll in {poll:.0f}s")
+        time.sleep(poll)
+        st = client.status(job_id)
+    if not st.done:
+        print(f"[Batch] {job_id} still {st.state} ({st.completed}/{st.total}); run collect again later")
+        return False
+    if st.state == "failed" and not st.completed:
+        raise RuntimeError(f"Batch job {job_id} failed: {st.raw.get('errors') or st.raw.get('status')}")
+    results = client.results(job_id)
+
+    if job["phase"] == "chunk":
+        for m in job["meetings"]:
+            m["missing"] = _write_batch_partials(m, results)
+            m["partials"] = [
+                str(Path(m["run_dir"]) / f"partial_{c_idx:02d}.json")
+                for c_idx, custom_id in enumerate(m["chunks"], 1)
+                if custom_id not in m["missing"]
+            ]
+        missing = [cid for m in job["meetings"] for cid in m["missing"]]
+        if missing:
+            max_resubmits = int(cfg["summarize"]["batch"].get("max_resubmits", 1))
+            if job.get("resubmits", 0) >= max_resubmits:
+                write_json(job_path, job)
+                raise RuntimeError(
+                    f"Batch chunks still missing after {max_resubmits} resubmit(s): {', '.join(missing)}; "
+                    "no minutes were rendered (see \"missing\" in the job file)"
+                )
+            retry = [
+                r for m in job["meetings"] if m["missing"]
+                for r in _batch_chunk_requests(m, cfg) if r.custom_id in m["missing"]
+            ]
+            job["chunk_job_id"] = client.submit(retry)
+            job["resubmits"] = job.get("resubmits", 0) + 1
+            write_json(job_path, job)
+            print(f"[Batch] resubmitted {len(retry)} missing chunk requests: {job['chunk_job_id']}; run collect again later")
+            return False
+        merge_requests: List[BatchRequest] = []
+        if (cfg["merge"].get("engine") or "deterministic").lower() == "llm":
+            schema = load_schema(cfg["__project_root__"], cfg["summarize"]["schema_path"])
+            for m in job["meetings"]:
+                if len(m["partials"]) > 1:
+                    group = [_read_partial(Path(p)) for p in m["partials"]]
+                    system_prompt, user_prompt = _merge_prompts(group, schema)
+                    merge_requests.append(
+                        BatchRequest(f"{m['id']}-merge", system_prompt, user_prompt, cfg["summarize"].get("model"))
+                    )
+        if merge_requests:
+            job["merge_job_id"] = client.submit(merge_requests)
+            job["phase"] = "merge"
+            write_json(job_path, job)
+            print(f"[Batch] submitted {len(merge_requests)} merge requests: {job['merge_job_id']}; run collect again later")
+            return False
+    merged_llm = results if job["phase"] == "merge" else {}
+
+    for m in job["meetings"]:
+        run_dir = Path(m["run_dir"])
+        out_path = run_dir / "llm_output.json"
+        text = merged_llm.get(f"{m['id']}-merge")
+        try:
+            obj = extract_json(text) if text else None
+        except ValueError as e:
+            print(f"[WARN] {m['id']}: merge result is not JSON ({e}); using deterministic merge.")
+            obj = None
+        if obj is not None:
+            write_json(out_path, _merge_partial_objects([obj], similarity=cfg["merge"].get("similarity")))
+        elif m.get("partials"):
+            run_merge([Path(p) for p in m["partials"]], config_path, out_path=out_path, merge_engine="deterministic")
+        else:
+            print(f"[WARN] {m['id']}: no results; skipped")
+            continue
+        apply_llm_output(out_path, Path(m["transcript"]), config_path)
+
+    job["phase"] = "done"
+    job["collected_at"] = dt.datetime.now().isoformat(timespec="seconds")
+    write_json(job_path, job)
+    print(f"[OK] Batch collected: {len(job['meetings'])} meetings")
+    return True
+
+
+def _batch_job_config(job: Dict[str, Any]) -> Dict[str, Any]:
+    cfg = load_config(Path(job["config_path"]))
+    cfg["summarize"]["engine"] = job["engine"]
+    return cfg
+
+
+def _batch_current_job_id(job: Dict[str, Any]) -> str:
+    return job["merge_job_id"] if job.get("phase") == "merge" else job["chunk_job_id"]
+
+
+def _batch_chunk_requests(meeting: Dict[str, Any], cfg: Dict[str, Any]) -> List[BatchRequest]:
+    """Chunk requests for one meeting of a batch job (rebuilt the same way for resubmits)."""
+    project_root: Path = cfg["__project_root__"]
+    prompt_text = load_prompt_text(project_root, cfg["summarize"]["prompt_path"])
+    schema = load_schema(project_root, cfg["summarize"]["schema_path"])
+    model = cfg["summarize"].get("model")
+    requests: List[BatchRequest] = []
+    transcript_clean = read_json(Path(meeting["transcript"]))
+    for c_idx, (text, _start, _end, _chars) in enumerate(_chunk_texts(transcript_clean, cfg), 1):
+        system_prompt, user_prompt = _build_summarize_prompts(prompt_text, schema, text)
+        requests.append(BatchRequest(f"{meeting['id']}-c{c_idx:02d}", system_prompt, user_prompt, model))
+    return requests
+
+
+def _write_batch_partials(meeting: Dict[str, Any], results: Dict[str, str]) -> List[str]:
+    """Write partial_XX.json for the meeting's pending chunks; returns the custom_ids still missing."""
+    run_dir = Path(meeting["run_dir"])
+    missing: List[str] = []
+    pending = set(meeting.get("missing", meeting["chunks"]))
+    for c_idx, custom_id in enumerate(meeting["chunks"], 1):
+        if custom_id not in pending:
+            continue
+        text = results.get(custom_id)
+        if text is None:
+            print(f"[WARN] {custom_id}: no result (failed or expired)")
+            missing.append(custom_id)
+            continue
+        try:
+            obj = extract_json(text)
+        except ValueError as e:
+            print(f"[WARN] {custom_id}: response is not JSON ({e})")
+            missing.append(custom_id)
+            continue
+        write_json(run_dir / f"partial_{c_idx:02d}.json", obj)
+    return missing
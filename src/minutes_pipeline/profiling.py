@@ -0,0 +1,120 @@
+"""Per-stage profiling for mpipe run --profile: wall/CPU time, memory peaks, cProfile dumps.
+
+CPU time is process-wide (all threads, e.g. ASR decoding or parallel LLM calls). Peak RSS
+comes from ``resource`` (Unix; omitted on Windows) and is the process high-water mark, so a
+stage's ``rss_growth_mb`` is how much it raised that mark. ``py_peak_mb`` is the peak of
+Python allocations during the stage (tracemalloc; slows allocation-heavy code, can be
+turned off). cProfile only sees the thread that runs the stage.
+"""
+from __future__ import annotations
+
+import cProfile
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+try:
+    import resource  # type: ignore
+except ImportError:  # Windows
+    resource = None  # type: ignore
+
+_MB = 1024 * 1024
+
+
+def peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / _MB if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def latency_summary(latencies: List[float]) -> Dict[str, Any]:
+    if not latencies:
+        return {"calls": 0}
+    xs = sorted(latencies)
+    pick = lambda q: xs[min(len(xs) - 1, int(q * len(xs)))]  # noqa: E731
+    return {
+        "calls": len(xs),
+        "latency_p50_sec": round(pick(0.5), 3),
+        "latency_p90_sec": round(pick(0.9), 3),
+        "latency_max_sec": round(xs[-1], 3),
+        "latency_total_sec": round(sum(xs), 3),
+    }
+
+
+class RunProfiler:
+    def __init__(self, logs_dir: Path, cprofile: bool = False, trace_memory: bool = True) -> None:
+        self.logs_dir = logs_dir
+        self.cprofile = cprofile
+        self.trace_memory = trace_memory
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self._started_tracemalloc = False
+        self._t0 = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        rss_before = peak_rss_mb()
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+            tracemalloc.reset_peak()
+        prof = cProfile.Profile() if self.cprofile else None
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+        if prof is not None:
+            prof.enable()
+        try:
+            yield
+        finally:
+            if prof is not None:
+                prof.disable()
+            entry: Dict[str, Any] = {
+                "wall_sec": round(time.perf_counter() - wall0, 3),
+                "cpu_sec": round(time.process_time() - cpu0, 3),
+            }
+            rss_after = peak_rss_mb()
+            if rss_after is not None:
+                entry["peak_rss_mb"] = rss_after
+                entry["rss_growth_mb"] = round(rss_after - (rss_before or 0.0), 1)
+            if self.trace_memory and tracemalloc.is_tracing():
+                entry["py_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / _MB, 1)
+            if prof is not None:
+                self.logs_dir.mkdir(parents=True, exist_ok=True)
+                path = self.logs_dir / f"profile_{name}.pstats"
+                prof.dump_stats(str(path))
+                entry["pstats"] = str(path)
+            self.stages.setdefault(name, {}).update(entry)
+
+    def note(self, name: str, **fields: Any) -> None:
+        """Attach extra measurements (ASR real-time factor, LLM latency/tokens) to a stage."""
+        self.stages.setdefault(name, {}).update(fields)
+
+    def report(self) -> Dict[str, Any]:
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        return {
+            "total_wall_sec": round(time.perf_counter() - self._t0, 3),
+            "peak_rss_mb": peak_rss_mb(),
+            "stages": self.stages,
+        }
+
+    def print_summary(self) -> None:
+        for name, e in self.stages.items():
+            if "wall_sec" not in e:
+                continue
+            line = f"[Profile] {name}: wall {e['wall_sec']:.2f}s cpu {e['cpu_sec']:.2f}s"
+            if "peak_rss_mb" in e:
+                line += f" peak RSS {e['peak_rss_mb']:.0f}MB (+{e['rss_growth_mb']:.0f})"
+            if "py_peak_mb" in e:
+                line += f" py peak {e['py_peak_mb']:.1f}MB"
+            if "rtf" in e:
+                line += f" RTF {e['rtf']:.3f}"
+            if e.get("llm", {}).get("calls"):
+                llm = e["llm"]
+                line += f" LLM {llm['calls']} calls p50 {llm['latency_p50_sec']:.2f}s"
+            print(line)
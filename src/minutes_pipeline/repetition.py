@@ -0,0 +1,184 @@
+"""Collapse Whisper repetition loops in a transcript (preprocess.repetition).
+
+Two kinds of loop are handled, both in one linear pass:
+
+* inside a segment: a unit of up to max_unit_chars repeated min_repeats+ times in a row
+  ("ありがとうございました" x 30) is cut back to one copy. Found with one regex scan per
+  segment (shortest unit first), so the cost is bounded by text length x max_unit_chars.
+  Units made only of digits are left alone ("1111111円" is an amount, not a loop).
+* across segments: runs of consecutive segments of one speaker whose normalized text
+  (NFKC, no punctuation/whitespace) repeats with a period of 1..max_period segments
+  (A A A A or A B A B A B) keep the first period only. Segments match when their texts are
+  equal or their character-bigram Jaccard similarity is at least `similarity`, so a loop
+  that drifts by a character ("ご視聴ありがとうございました" / "…ましたー" / "…ござました")
+  still collapses. Numbers and latin words must still agree exactly: "議題1について" and
+  "議題2について" are different lines. Segments shorter than min_segment_chars never form a run, so answers
+  like "はい。" or a round of "賛成です。" survive. Each segment is compared with at most
+  max_period recent segments, never pairwise across the transcript.
+
+The collapser is online (push/flush) so the streaming pipeline can use it per segment; it
+holds back at most max_period x min_repeats segments while a run is undecided. Every
+collapse is recorded (time range, unit, repeats, removed size) for transcript metadata.
+"""
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from .summarize.similarity import char_ngrams, jaccard
+from .text import normalize_text
+
+_NON_WORD = re.compile(r"[\W_]+")
+_ASCII_WORD = re.compile(r"[0-9a-z]+")
+
+
+def _fingerprint(text: str) -> str:
+    """Segment identity for run detection: NFKC, lower-case, punctuation/spaces dropped."""
+    return _NON_WORD.sub("", unicodedata.normalize("NFKC", text).lower())
+
+
+# (fingerprint, its bigrams, its numbers/latin words); None = too short to match
+_Key = Optional[Tuple[str, FrozenSet[str], Tuple[str, ...]]]
+
+
+class RepetitionCollapser:
+    def __init__(
+        self,
+        max_unit_chars: int = 20,
+        min_repeats: int = 3,
+        min_loop_chars: int = 12,
+        max_period: int = 3,
+        min_segment_chars: int = 6,
+        similarity: float = 0.75,
+    ) -> None:
+        self.min_repeats = max(2, int(min_repeats))
+        self.min_loop_chars = int(min_loop_chars)
+        self.max_period = max(1, int(max_period))
+        self.min_segment_chars = int(min_segment_chars)
+        self.similarity = float(similarity)
+        # a loop of L >= min_loop_chars chars repeats its unit, so the segment has at least
+        # L * (1 - 1/min_repeats) repeated characters: a cheap test before the regex scan
+        self._min_dup_chars = int(self.min_loop_chars * (1 - 1 / self.min_repeats))
+        self._text_loop = re.compile(r"(.{1,%d}?)\1{%d,}" % (max(1, int(max_unit_chars)), self.min_repeats - 1), re.S)
+        self.records: List[Dict[str, Any]] = []
+        self._buf: List[Tuple[Dict[str, Any], _Key]] = []  # (segment, run key)
+        self._loop: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_config(cls, cfg: Dict[str, Any]) -> "RepetitionCollapser | None":
+        rc = cfg["preprocess"]["repetition"]
+        if not rc.get("enabled"):
+            return None
+        return cls(
+            max_unit_chars=rc["max_unit_chars"],
+            min_repeats=rc["min_repeats"],
+            min_loop_chars=rc["min_loop_chars"],
+            max_period=rc["max_period"],
+            min_segment_chars=rc["min_segment_chars"],
+            similarity=rc["similarity"],
+        )
+
+    # -- inside one segment --------------------------------------------------------------
+    def collapse_text(self, seg: Dict[str, Any]) -> Dict[str, Any]:
+        text = seg.get("text") or ""
+        if len(text) - len(set(text)) < self._min_dup_chars:
+            return seg
+        found: List[Dict[str, Any]] = []
+
+        def _one(m: "re.Match[str]") -> str:
+            unit, run = m.group(1), m.group(0)
+            norm = normalize_text(unit)
+            if len(run) < self.min_loop_chars or not norm or norm.isdigit():
+                return run
+            found.append({"unit": unit, "repeats": len(run) // len(unit), "removed_chars": len(run) - len(unit)})
+            return unit
+
+        new_text = self._text_loop.sub(_one, text)
+        if not found:
+            return seg
+        for f in found:
+            self.records.append({"kind": "text", "start": seg.get("start"), "end": seg.get("end"), **f})
+        return {**seg, "text": new_text}
+
+    # -- across segments -----------------------------------------------------------------
+    def push(self, seg: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Feed one segment; returns the segments that are now final (possibly none)."""
+        seg = self.collapse_text(seg)
+        fp = _fingerprint(seg.get("text") or "")
+        # too short to tell a loop from a real answer
+        key: _Key = None
+        if len(fp) >= self.min_segment_chars:
+            key = (fp, char_ngrams(fp), tuple(_ASCII_WORD.findall(fp)))
+        loop = self._loop
+        if loop is not None:
+            if self._same(key, loop["unit"][loop["pos"]]) and seg.get("speaker") == loop["speaker"]:
+                rec = loop["record"]
+                rec["removed_segments"] += 1
+                rec["removed_chars"] += len(seg.get("text") or "")
+                rec["end"] = seg.get("end")
+                loop["pos"] = (loop["pos"] + 1) % len(loop["unit"])
+                rec["repeats"] = 1 + rec["removed_segments"] // len(loop["unit"])
+                return []
+            self._loop = None
+        self._buf.append((seg, key))
+        return self._drain(final=False)
+
+    def _same(self, a: _Key, b: _Key) -> bool:
+        if a is None or b is None:
+            return False
+        return a[0] == b[0] or (a[2] == b[2] and jaccard(a[1], b[1]) >= self.similarity)
+
+    def flush(self) -> List[Dict[str, Any]]:
+        self._loop = None
+        return self._drain(final=True)
+
+    def _drain(self, final: bool) -> List[Dict[str, Any]]:
+        out: List[Dict[str, Any]] = []
+        while self._buf:
+            n = len(self._buf)
+            keys = [k for _, k in self._buf]
+            # a run is one speaker repeating; the same words from several speakers are real
+            complete = None not in keys and len({s.get("speaker") for s, _ in self._buf}) == 1
+            # each later segment is compared with its counterpart in the first period, so a
+            # slowly drifting loop cannot chain its way past the threshold
+            periods = [
+                q for q in range(1, min(self.max_period + 1, n))
+                if all(self._same(keys[i], keys[i % q]) for i in range(q, n))
+            ] if complete else []
+            confirmed = [q for q in periods if n >= q * self.min_repeats]
+            if confirmed:
+                q = confirmed[0]
+                unit, dropped = self._buf[:q], self._buf[q:]
+                rec = {
+                    "kind": "segments",
+                    "start": dropped[0][0].get("start"),
+                    "end": dropped[-1][0].get("end"),
+                    "period": q,
+                    "unit": "".join(s.get("text") or "" for s, _ in unit)[:80],
+                    "repeats": 1 + len(dropped) // q,
+                    "removed_segments": len(dropped),
+                    "removed_chars": sum(len(s.get("text") or "") for s, _ in dropped),
+                }
+                self.records.append(rec)
+                self._loop = {
+                    "unit": [k for _, k in unit],
+                    "speaker": unit[0][0].get("speaker"),
+                    "pos": len(dropped) % q,
+                    "record": rec,
+                }
+                out.extend(s for s, _ in unit)
+                self._buf = []
+                break
+            undecided = periods or (n <= self.max_period and complete)
+            if undecided and not final:
+                break
+            out.append(self._buf.pop(0)[0])
+        return out
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "collapsed": self.records,
+            "removed_segments": sum(r.get("removed_segments", 0) for r in self.records),
+            "removed_chars": sum(r["removed_chars"] for r in self.records),
+        }
@@ -0,0 +1,183 @@
+"""Character / word error rate of a transcript against a reference (mpipe score, mpipe eval).
+
+    mpipe score output/meeting/transcript_raw.json golden/meeting_ref.json
+    mpipe score hyp.txt ref.txt --keep-punct
+
+Text is NFKC-normalized and lower-cased; whitespace and punctuation are dropped unless
+kept, so CER measures the recognised characters only. WER needs words, which Japanese does
+not mark: tokens are runs of one script (kanji / hiragana / katakana / latin+digits) in
+Japanese text and whitespace-separated words otherwise. It is a coarse but stable proxy
+for comparing ASR configurations.
+
+Edit distance uses the bit-parallel algorithm of Myers / Hyyrö with Python integers as bit
+vectors: one pass over the hypothesis, a handful of word-parallel operations per symbol.
+When both sides have segment timestamps, the reference is cut into ~window_sec windows at
+pauses and hypothesis segments are assigned to windows by their midpoint; each window is
+scored separately, which keeps the bit vectors short (2 h in well under a second) and
+locates where a configuration gets worse. Without timestamps the whole text is one window.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Hashable, List, Optional, Sequence
+
+from .io import read_json
+from .text import normalize_text
+
+_TOKEN_RE = re.compile(r"[一-鿿㐀-䶿々〆ヵヶ]+|[ぁ-ゟ]+|[゠-ヿ]+|[0-9a-z]+|\S")
+_JA_RE = re.compile(r"[ぁ-ゟ゠-ヿ一-鿿]")
+
+
+def edit_distance(ref: Sequence[Hashable], hyp: Sequence[Hashable]) -> int:
+    """Levenshtein distance (unit costs), bit-parallel over the reference."""
+    m = len(ref)
+    if m == 0:
+        return len(hyp)
+    if not hyp:
+        return m
+    peq: Dict[Hashable, int] = {}
+    for i, sym in enumerate(ref):
+        peq[sym] = peq.get(sym, 0) | (1 << i)
+    mask = (1 << m) - 1
+    high = 1 << (m - 1)
+    pv, mv, score = mask, 0, m
+    for sym in hyp:
+        eq = peq.get(sym, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+    return score
+
+
+def tokenize_words(text: str) -> List[str]:
+    """Words for WER: same-script runs for Japanese, whitespace words otherwise (see module doc)."""
+    if _JA_RE.search(text):
+        return _TOKEN_RE.findall(normalize_text(text))
+    return [w for w in (normalize_text(t) for t in text.split()) if w]
+
+
+@dataclass
+class _Seg:
+    start: float
+    end: float
+    text: str
+
+
+def _load(source: Path | str | Dict[str, Any]) -> List[_Seg] | str:
+    """Transcript JSON (segments) -> segments; .txt / plain string -> text."""
+    if isinstance(source, dict):
+        doc: Any = source
+    else:
+        path = Path(source)
+        if path.suffix.lower() != ".json":
+            return path.read_text(encoding="utf-8")
+        doc = read_json(path)
+    segs = doc.get("segments") if isinstance(doc, dict) else doc
+    if not isinstance(segs, list):
+        raise ValueError(f"Not a transcript (no segments): {source if not isinstance(source, dict) else 'dict'}")
+    return [
+        _Seg(float(s.get("start") or 0.0), float(s.get("end") or s.get("start") or 0.0), str(s.get("text") or ""))
+        for s in segs
+        if isinstance(s, dict)
+    ]
+
+
+def _cut_points(ref: List[_Seg], window_sec: float) -> List[float]:
+    """Window boundaries at pauses between reference segments, roughly every window_sec."""
+    cuts: List[float] = []
+    last = ref[0].start if ref else 0.0
+    for prev, nxt in zip(ref, ref[1:]):
+        if prev.end - last >= window_sec and nxt.start >= prev.end:
+            cut = (prev.end + nxt.start) / 2
+            cuts.append(cut)
+            last = cut
+    return cuts
+
+
+def _bucket(segs: List[_Seg], cuts: List[float]) -> List[List[str]]:
+    buckets: List[List[str]] = [[] for _ in range(len(cuts) + 1)]
+    i = 0
+    for s in sorted(segs, key=lambda x: x.start):
+        mid = (s.start + s.end) / 2
+        while i < len(cuts) and mid >= cuts[i]:
+            i += 1
+        buckets[i].append(s.text)
+    return buckets
+
+
+def score_transcripts(
+    hyp: Path | str | Dict[str, Any],
+    ref: Path | str | Dict[str, Any],
+    window_sec: Optional[float] = 60.0,
+    keep_punct: bool = False,
+) -> Dict[str, Any]:
+    """CER / WER of hyp against ref (transcript JSON paths or dicts, or .txt paths).
+
+    window_sec=None (or a side without timestamps) scores the whole text at once."""
+    hyp_doc, ref_doc = _load(hyp), _load(ref)
+    timed = window_sec is not None and not isinstance(hyp_doc, str) and not isinstance(ref_doc, str)
+    if timed:
+        cuts = _cut_points(ref_doc, window_sec)  # type: ignore[arg-type]
+        bounds = [ref_doc[0].start if ref_doc else 0.0, *cuts, ref_doc[-1].end if ref_doc else 0.0]  # type: ignore[index]
+        pairs = list(zip(_bucket(hyp_doc, cuts), _bucket(ref_doc, cuts)))  # type: ignore[arg-type]
+    else:
+        join = lambda d: d if isinstance(d, str) else "".join(s.text for s in d)  # noqa: E731
+        bounds = []
+        pairs = [([join(hyp_doc)], [join(ref_doc)])]
+
+    totals = {"char_errors": 0, "ref_chars": 0, "hyp_chars": 0, "word_errors": 0, "ref_words": 0}
+    windows: List[Dict[str, Any]] = []
+    for i, (h_parts, r_parts) in enumerate(pairs):
+        h_text, r_text = "".join(h_parts), "".join(r_parts)
+        h_chars, r_chars = normalize_text(h_text, keep_punct), normalize_text(r_text, keep_punct)
+        c_err = edit_distance(r_chars, h_chars)
+        h_words = [w for part in h_parts for w in tokenize_words(part)]
+        r_words = [w for part in r_parts for w in tokenize_words(part)]
+        totals["char_errors"] += c_err
+        totals["ref_chars"] += len(r_chars)
+        totals["hyp_chars"] += len(h_chars)
+        totals["word_errors"] += edit_distance(r_words, h_words)
+        totals["ref_words"] += len(r_words)
+        if timed:
+            windows.append({
+                "start": round(bounds[i], 2),
+                "end": round(bounds[i + 1], 2),
+                "ref_chars": len(r_chars),
+                "char_errors": c_err,
+                "cer": _ratio(c_err, len(r_chars)),
+            })
+    return {
+        "cer": _ratio(totals["char_errors"], totals["ref_chars"]),
+        "wer": _ratio(totals["word_errors"], totals["ref_words"]),
+        **totals,
+        "windows": windows,
+    }
+
+
+def _ratio(errors: int, total: int) -> Optional[float]:
+    return round(errors / total, 4) if total else None
+
+
+def _mmss(sec: float) -> str:
+    s = int(sec)
+    return f"{s // 3600:d}:{s // 60 % 60:02d}:{s % 60:02d}" if s >= 3600 else f"{s // 60:02d}:{s % 60:02d}"
+
+
+def print_score(result: Dict[str, Any], worst: int = 5) -> None:
+    pct = lambda x: "-" if x is None else f"{x * 100:.2f}%"  # noqa: E731
+    print(f"[Score] CER {pct(result['cer'])} ({result['char_errors']}/{result['ref_chars']} chars)")
+    print(f"[Score] WER {pct(result['wer'])} ({result['word_errors']}/{result['ref_words']} words)")
+    ranked = sorted((w for w in result["windows"] if w["ref_chars"]), key=lambda w: w["cer"], reverse=True)
+    for w in ranked[:worst]:
+        print(f"[Score]   {_mmss(w['start'])}-{_mmss(w['end'])}  CER {pct(w['cer'])}  ({w['char_errors']}/{w['ref_chars']})")
@@ -0,0 +1,248 @@
+"""Provider batch jobs (OpenAI Batch API / Anthropic Message Batches) for offline summarization.
+
+Requests are submitted in one job, polled, and collected later (typically within 24h at a
+discount). Talks to the REST endpoints with httpx so the same code runs against
+``mpipe fake-llm``.
+"""
+from __future__ import annotations
+
+import abc
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, ClassVar, Dict, List, Optional
+
+
+@dataclass
+class BatchRequest:
+    custom_id: str
+    system_prompt: str
+    user_prompt: str
+    model: Optional[str] = None
+
+
+@dataclass
+class BatchStatus:
+    job_id: str
+    state: str  # in_progress | completed | failed
+    total: int = 0
+    completed: int = 0
+    failed: int = 0
+    raw: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.state in ("completed", "failed")
+
+
+@dataclass
+class _BatchClient(abc.ABC):
+    base_url: str
+    api_key: Optional[str] = None
+    timeout: float = 180.0
+    temperature: float = 0.2
+    max_tokens: int = 4096
+
+    def _client(self) -> Any:
+        try:
+            import httpx  # type: ignore
+        except ImportError as e:
+            raise RuntimeError("httpx not installed. pip install -e '.[ollama]'") from e
+        return httpx.Client(base_url=self.base_url.rstrip("/"), timeout=self.timeout, headers=self._headers())
+
+    def _headers(self) -> Dict[str, str]:
+        return {}
+
+    @abc.abstractmethod
+    def submit(self, requests: List[BatchRequest]) -> str:
+        """Create a batch job for requests; returns the provider job id."""
+
+    @abc.abstractmethod
+    def status(self, job_id: str) -> BatchStatus: ...
+
+    @abc.abstractmethod
+    def results(self, job_id: str) -> Dict[str, str]:
+        """Return {custom_id: response text} for succeeded requests."""
+
+
+@dataclass
+class OpenAIBatchClient(_BatchClient):
+    engine: ClassVar[str] = "openai"
+    base_url: str = "https://api.openai.com/v1"
+    completion_window: str = "24h"
+
+    def _headers(self) -> Dict[str, str]:
+        key = self.api_key or os.environ.get("OPENAI_API_KEY")
+        return {"Authorization": f"Bearer {key}"} if key else {}
+
+    def _line(self, r: BatchRequest) -> str:
+        body = {
+            "model": r.model or "gpt-4o-mini",
+            "messages": [
+                {"role": "system", "content": r.system_prompt},
+                {"role": "user", "content": r.user_prompt},
+            ],
+            "temperature": self.temperature,
+        }
+        return json.dumps(
+            {"custom_id": r.custom_id, "method": "POST", "url": "/v1/chat/completions", "body": body},
+            ensure_ascii=False,
+        )
+
+    def submit(self, requests: List[BatchRequest]) -> str:
+        jsonl = "\n".join(self._line(r) for r in requests) + "\n"
+        with self._client() as c:
+            up = c.post(
+                "/files",
+                data={"purpose": "batch"},
+                files={"file": ("requests.jsonl", jsonl.encode("utf-8"), "application/jsonl")},
+            )
+            up.raise_for_status()
+            resp = c.post(
+                "/batches",
+                json={
+                    "input_file_id": up.json()["id"],
+                    "endpoint": "/v1/chat/completions",
+                    "completion_window": self.completion_window,
+                },
+            )
+            resp.raise_for_status()
+            return resp.json()["id"]
+
+    def status(self, job_id: str) -> BatchStatus:
+        with self._client() as c:
+            resp = c.get(f"/batches/{job_id}")
+            resp.raise_for_status()
+            data = resp.json()
+        state = data.get("status", "")
+        if state == "completed":
+            norm = "completed"
+        elif state in ("failed", "expired", "cancelled"):
+            norm = "failed"
+        else:
+            norm = "in_progress"
+        counts = data.get("request_counts") or {}
+        return BatchStatus(
+            job_id=job_id,
+            state=norm,
+            total=int(counts.get("total", 0)),
+            completed=int(counts.get("completed", 0)),
+            failed=int(counts.get("failed", 0)),
+            raw=data,
+        )
+
+    def results(self, job_id: str) -> Dict[str, str]:
+        st = self.status(job_id)
+        file_id = st.raw.get("output_file_id")
+        if not file_id:
+            return {}
+        with self._client() as c:
+            resp = c.get(f"/files/{file_id}/content")
+            resp.raise_for_status()
+            text = resp.text
+        out: Dict[str, str] = {}
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            body = ((item.get("response") or {}).get("body")) or {}
+            choices = body.get("choices") or []
+            if item.get("error") or not choices:
+                continue
+            out[item["custom_id"]] = choices[0].get("message", {}).get("content") or ""
+        return out
+
+
+@dataclass
+class AnthropicBatchClient(_BatchClient):
+    engine: ClassVar[str] = "anthropic"
+    base_url: str = "https://api.anthropic.com"
+    prompt_cache: bool = True
+
+    def _headers(self) -> Dict[str, str]:
+        headers = {"anthropic-version": "2023-06-01"}
+        key = self.api_key or os.environ.get("ANTHROPIC_API_KEY")
+        if key:
+            headers["x-api-key"] = key
+        return headers
+
+    def _params(self, r: BatchRequest) -> Dict[str, Any]:
+        system: Any = r.system_prompt
+        if self.prompt_cache:
+            system = [{"type": "text", "text": r.system_prompt, "cache_control": {"type": "ephemeral"}}]
+        return {
+            "model": r.model or "claude-3-5-sonnet-latest",
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature,
+            "system": system,
+            "messages": [{"role": "user", "content": r.user_prompt}],
+        }
+
+    def submit(self, requests: List[BatchRequest]) -> str:
+        payload = {"requests": [{"custom_id": r.custom_id, "params": self._params(r)} for r in requests]}
+        with self._client() as c:
+            resp = c.post("/v1/messages/batches", json=payload)
+            resp.raise_for_status()
+            return resp.json()["id"]
+
+    def status(self, job_id: str) -> BatchStatus:
+        with self._client() as c:
+            resp = c.get(f"/v1/messages/batches/{job_id}")
+            resp.raise_for_status()
+            data = resp.json()
+        counts = data.get("request_counts") or {}
+        failed = sum(int(counts.get(k, 0)) for k in ("errored", "canceled", "expired"))
+        completed = int(counts.get("succeeded", 0))
+        return BatchStatus(
+            job_id=job_id,
+            state="completed" if data.get("processing_status") == "ended" else "in_progress",
+            total=completed + failed + int(counts.get("processing", 0)),
+            completed=completed,
+            failed=failed,
+            raw=data,
+        )
+
+    def results(self, job_id: str) -> Dict[str, str]:
+        st = self.status(job_id)
+        url = st.raw.get("results_url")
+        if not url:
+            return {}
+        with self._client() as c:
+            resp = c.get(url)
+            resp.raise_for_status()
+            text = resp.text
+        out: Dict[str, str] = {}
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            result = item.get("result") or {}
+            if result.get("type") != "succeeded":
+                continue
+            blocks = (result.get("message") or {}).get("content") or []
+            out[item["custom_id"]] = "\n".join(b.get("text", "") for b in blocks if b.get("type") == "text").strip()
+        return out
+
+
+def batch_client_from_config(cfg: Dict[str, Any]) -> _BatchClient:
+    """Batch client for summarize.engine (openai | anthropic)."""
+    s = cfg["summarize"]
+    engine = (s.get("engine") or "mock").lower()
+    b = s.get("batch") or {}
+    opts: Dict[str, Any] = {
+        "timeout": float((s.get("http") or {}).get("timeout", 180.0)),
+        "max_tokens": int(b.get("max_tokens", 4096)),
+    }
+    if engine == "openai":
+        return OpenAIBatchClient(
+            base_url=s.get("openai_base_url") or "https://api.openai.com/v1",
+            completion_window=str(b.get("completion_window", "24h")),
+            **opts,
+        )
+    if engine == "anthropic":
+        return AnthropicBatchClient(
+            base_url=s.get("anthropic_base_url") or "https://api.anthropic.com",
+            prompt_cache=bool((s.get("prompt_cache") or {}).get("enabled", True)),
+            **opts,
+        )
+    raise ValueError(f"Batch mode needs summarize.engine openai or anthropic (got {engine}).")
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def make_cache_key(
+    engine: str,
+    model: Optional[str],
+    temperature: Optional[float],
+    system_prompt: str,
+    user_prompt: str,
+    base_url: Optional[str] = None,
+) -> str:
+    """Build a stable key from (engine, base_url, model, temperature, system hash, user hash)."""
+    parts = {
+        "engine": (engine or "").lower(),
+        "base_url": (base_url or "").rstrip("/"),
+        "model": model or "",
+        "temperature": temperature,
+        "system": _sha256(system_prompt),
+        "user": _sha256(user_prompt),
+    }
+    return _sha256(json.dumps(parts, sort_keys=True))
+
+
+@dataclass
+class ResponseCache:
+    """On-disk cache of raw LLM responses with LRU eviction and in-flight coalescing.
+
+    Entries live under ``cache_dir/<key[:2]>/<key>.json``. The file mtime is touched on
+    every hit, so eviction by mtime is least-recently-used. ``bypass`` skips lookups
+    (the fresh response is still stored).
+    """
+
+    cache_dir: Path
+    max_bytes: int = 200 * 1024 * 1024
+    max_age_seconds: Optional[float] = 30 * 24 * 3600
+    bypass: bool = False
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _inflight: Dict[str, Future] = field(default_factory=dict, init=False, repr=False)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        p = self._path(key)
+        try:
+            st = p.stat()
+        except OSError:
+            return None
+        if self.max_age_seconds is not None and time.time() - st.st_mtime > self.max_age_seconds:
+            p.unlink(missing_ok=True)
+            return None
+        try:
+            entry = json.loads(p.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            p.unlink(missing_ok=True)
+            return None
+        try:
+            os.utime(p, None)
+        except OSError:
+            pass
+        return entry.get("response")
+
+    def put(self, key: str, response: str, meta: Optional[Dict[str, Any]] = None) -> None:
+        p = self._path(key)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        entry = {"key": key, "created_at": time.time(), "meta": meta or {}, "response": response}
+        tmp = p.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, p)
+
+    def get_or_call(
+        self,
+        key: str,
+        fn: Callable[[], str],
+        meta: Optional[Dict[str, Any]] = None,
+        validate: Optional[Callable[[str], Any]] = None,
+        store: Optional[Callable[[str], bool]] = None,
+    ) -> str:
+        """Return cached response for key, or call fn once even if requested concurrently.
+
+        A fresh response is stored only after ``validate`` (if given) accepts it, so an
+        unusable answer is not replayed on every later run, and only if ``store`` (if given)
+        returns True for it. Disk reads happen outside the lock, which only guards the
+        in-flight table and the counters, so concurrent lookups do not queue on file I/O.
+        """
+        cached = None if self.bypass else self.get(key)
+        if cached is not None:
+            with self._lock:
+                self.hits += 1
+            return cached
+        with self._lock:
+            fut = self._inflight.get(key)
+            if fut is not None:
+                self.coalesced += 1
+                owner = False
+            else:
+                fut = Future()
+                self._inflight[key] = fut
+                owner = True
+        if not owner:
+            return fut.result()
+        try:
+            # a previous owner may have stored the response between our read and the lock
+            cached = None if self.bypass else self.get(key)
+            with self._lock:
+                if cached is not None:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+            if cached is not None:
+                fut.set_result(cached)
+                return cached
+            response = fn()
+            if validate is not None:
+                validate(response)
+            if store is None or store(response):
+                self.put(key, response, meta)
+            fut.set_result(response)
+            return response
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def evict(self) -> int:
+        """Drop expired entries, then oldest-accessed entries until under max_bytes."""
+        if not self.cache_dir.exists():
+            return 0
+        now = time.time()
+        entries: List[Tuple[float, int, Path]] = []
+        removed = 0
+        for p in self.cache_dir.glob("*/*.json"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            if self.max_age_seconds is not None and now - st.st_mtime > self.max_age_seconds:
+                p.unlink(missing_ok=True)
+                removed += 1
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        total = sum(size for _, size, _ in entries)
+        entries.sort()
+        for _, size, p in entries:
+            if total <= self.max_bytes:
+                break
+            p.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "coalesced": self.coalesced}
+
+
+_CACHES: Dict[Path, ResponseCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_response_cache(cfg: Dict[str, Any]) -> Optional[ResponseCache]:
+    """Build (or reuse) the response cache configured by summarize.cache; None when disabled."""
+    cc = cfg["summarize"].get("cache") or {}
+    engine = (cfg["summarize"].get("engine") or "mock").lower()
+    if not cc.get("enabled", True) or engine in ("mock", "manual", "replay"):
+        return None
+    cache_dir = (cfg["__project_root__"] / cc.get("dir", ".mpipe_cache/llm")).resolve()
+    max_age_days = cc.get("max_age_days", 30)
+    with _CACHES_LOCK:
+        cache = _CACHES.get(cache_dir)
+        if cache is None:
+            cache = ResponseCache(cache_dir=cache_dir)
+            _CACHES[cache_dir] = cache
+        cache.max_bytes = int(float(cc.get("max_mb", 200)) * 1024 * 1024)
+        cache.max_age_seconds = float(max_age_days) * 24 * 3600 if max_age_days is not None else None
+        cache.bypass = bool(cc.get("bypass", False))
+    return cache
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, ClassVar, Dict, Iterator, List, Optional
+
+
+class CassetteMiss(RuntimeError):
+    """Raised when a replay cassette has no recorded response for a request."""
+
+
+def request_key(system_prompt: str, user_prompt: str, model: Optional[str]) -> str:
+    h = hashlib.sha256()
+    for part in (model or "", system_prompt, user_prompt):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+@dataclass
+class RecordingSummarizer:
+    """Wraps a summarizer and appends every request/response pair (with timing) to a cassette file."""
+
+    inner: Any
+    cassette_path: Path
+    store_prompts: bool = True
+    interactions: List[Dict[str, Any]] = field(default_factory=list, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def engine(self) -> str:
+        return getattr(self.inner, "engine", type(self.inner).__name__)
+
+    @property
+    def temperature(self) -> Optional[float]:
+        return getattr(self.inner, "temperature", None)
+
+    @property
+    def usage_log(self) -> List[Dict[str, Any]]:
+        return getattr(self.inner, "usage_log", [])
+
+    def summarize(self, system_prompt: str, user_prompt: str, model: Optional[str] = None) -> str:
+        started = time.time()
+        t0 = time.monotonic()
+        response = self.inner.summarize(system_prompt=system_prompt, user_prompt=user_prompt, model=model)
+        self._record(system_prompt, user_prompt, model, response, started, time.monotonic() - t0, None)
+        return response
+
+    def stream(self, system_prompt: str, user_prompt: str, model: Optional[str] = None) -> Iterator[str]:
+        started = time.time()
+        t0 = time.monotonic()
+        first: Optional[float] = None
+        parts: List[str] = []
+        try:
+            for chunk in self.inner.stream(system_prompt=system_prompt, user_prompt=user_prompt, model=model):
+                if first is None:
+                    first = time.monotonic() - t0
+                parts.append(chunk)
+                yield chunk
+        finally:
+            # also record when the consumer stops early (object closed / hedge cancelled)
+            if parts:
+                self._record(system_prompt, user_prompt, model, "".join(parts), started, time.monotonic() - t0, first)
+
+    def _record(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        model: Optional[str],
+        response: str,
+        started: float,
+        latency: float,
+        first_token: Optional[float],
+    ) -> None:
+        entry: Dict[str, Any] = {
+            "key": request_key(system_prompt, user_prompt, model),
+            "engine": self.engine,
+            "model": model or "",
+            "started_at": round(started, 3),
+            "latency_sec": round(latency, 4),
+            "first_token_sec": round(first_token, 4) if first_token is not None else None,
+            "response": response,
+        }
+        if self.store_prompts:
+            entry["system_prompt"] = system_prompt
+            entry["user_prompt"] = user_prompt
+        with self._lock:
+            self.interactions.append(entry)
+            self._save()
+
+    def _save(self) -> None:
+        self.cassette_path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"version": 1, "interactions": self.interactions}
+        tmp = self.cassette_path.with_suffix(self.cassette_path.suffix + ".tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, self.cassette_path)
+
+    def close(self) -> None:
+        close = getattr(self.inner, "close", None)
+        if close is not None:
+            close()
+
+
+@dataclass
+class ReplaySummarizer:
+    """Serves responses recorded by RecordingSummarizer; identical requests replay in recorded order.
+
+    With ``simulate_latency`` the original latency (times ``latency_scale``) is slept before
+    returning; streamed replays spread it across chunks after the recorded first-token delay.
+    """
+
+    engine: ClassVar[str] = "replay"
+    cassette_path: Path = Path("llm_cassette.json")
+    simulate_latency: bool = False
+    latency_scale: float = 1.0
+    temperature: float = 0.0
+    _queues: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict, repr=False)
+    _cursor: Dict[str, int] = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __post_init__(self) -> None:
+        data = json.loads(Path(self.cassette_path).read_text(encoding="utf-8"))
+        for entry in data.get("interactions", []):
+            self._queues.setdefault(entry["key"], []).append(entry)
+
+    def _next(self, system_prompt: str, user_prompt: str, model: Optional[str]) -> Dict[str, Any]:
+        key = request_key(system_prompt, user_prompt, model)
+        with self._lock:
+            entries = self._queues.get(key)
+            if not entries:
+                raise CassetteMiss(f"No recorded response in {self.cassette_path} for request {key[:12]}")
+            i = self._cursor.get(key, 0)
+            self._cursor[key] = i + 1
+            return entries[min(i, len(entries) - 1)]
+
+    def summarize(self, system_prompt: str, user_prompt: str, model: Optional[str] = None) -> str:
+        entry = self._next(system_prompt, user_prompt, model)
+        if self.simulate_latency:
+            time.sleep(float(entry.get("latency_sec") or 0.0) * self.latency_scale)
+        return entry["response"]
+
+    def stream(self, system_prompt: str, user_prompt: str, model: Optional[str] = None) -> Iterator[str]:
+        entry = self._next(system_prompt, user_prompt, model)
+        text = entry["response"]
+        pieces = [text[i:i + 32] for i in range(0, len(text), 32)] or [""]
+        total = float(entry.get("latency_sec") or 0.0) * self.latency_scale
+        first = float(entry.get("first_token_sec") or 0.0) * self.latency_scale
+        per_piece = max(0.0, total - first) / len(pieces)
+        if self.simulate_latency:
+            time.sleep(first)
+        for piece in pieces:
+            yield piece
+            if self.simulate_latency:
+                time.sleep(per_piece)
+
+
+_RECORDERS: Dict[Path, RecordingSummarizer] = {}
+_RECORDERS_LOCK = threading.Lock()
+
+
+def get_recorder(inner: Any, cassette_path: Path) -> RecordingSummarizer:
+    """Shared recorder per cassette file so concurrent calls append to one cassette."""
+    path = cassette_path.resolve()
+    with _RECORDERS_LOCK:
+        rec = _RECORDERS.get(path)
+        if rec is None or rec.inner is not inner:
+            rec = RecordingSummarizer(inner=inner, cassette_path=path)
+            _RECORDERS[path] = rec
+    return rec
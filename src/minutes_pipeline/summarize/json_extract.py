@@ -0,0 +1,187 @@
+"""Locate and (lightly) repair the JSON object in a model response.
+
+A single string-aware pass finds balanced top-level ``{...}`` spans (braces inside strings
+are ignored), so prose, code fences, trailing examples or several objects around the answer
+do not matter. When no span parses, a repair pass fixes the usual slips (trailing commas,
+truncated tails, mismatched closers) locally instead of re-requesting the model.
+"""
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+_SIGNIFICANT = re.compile(r'["\\{}\[\]]')
+_PARTIAL_LITERAL = re.compile(r"[A-Za-z][A-Za-z]*$|-?\d+\.$|-$")
+
+
+def scan_objects(text: str) -> Tuple[List[Tuple[int, int]], Optional[int]]:
+    """Return (complete top-level object spans, start of an unterminated trailing object or None).
+
+    Linear in len(text); only quote/backslash/bracket characters are visited. Quotes outside
+    an object are prose and ignored.
+    """
+    spans: List[Tuple[int, int]] = []
+    start = -1
+    depth = 0
+    in_str = False
+    skip = -1
+    for m in _SIGNIFICANT.finditer(text):
+        i = m.start()
+        if i < skip:
+            continue
+        ch = text[i]
+        if in_str:
+            if ch == "\\":
+                skip = i + 2
+            elif ch == '"':
+                in_str = False
+            continue
+        if ch == '"':
+            in_str = depth > 0
+        elif ch == "{" or ch == "[":
+            if depth == 0:
+                if ch == "[":
+                    continue
+                start = i
+            depth += 1
+        elif depth:
+            depth -= 1
+            if depth == 0:
+                spans.append((start, i + 1))
+    return spans, (start if depth else None)
+
+
+def _loads_dict(s: str) -> Optional[Dict[str, Any]]:
+    try:
+        obj = json.loads(s, strict=False)
+    except ValueError:
+        return None
+    return obj if isinstance(obj, dict) else None
+
+
+def _strip_trailing_comma(out: List[str]) -> bool:
+    j = len(out) - 1
+    while j >= 0 and out[j].isspace():
+        j -= 1
+    if j >= 0 and out[j] == ",":
+        del out[j]
+        return True
+    return False
+
+
+def _drop_string_literal(s: str) -> str:
+    """Remove a trailing "..." literal from s (s ends with a closing quote)."""
+    j = len(s) - 2
+    while j >= 0:
+        if s[j] == '"':
+            k = j - 1
+            backslashes = 0
+            while k >= 0 and s[k] == "\\":
+                backslashes += 1
+                k -= 1
+            if backslashes % 2 == 0:
+                return s[:j]
+        j -= 1
+    return s
+
+
+def _trim_dangling(s: str, closer: str) -> str:
+    """Drop an incomplete trailing member (``"key"``, ``"key":``, partial literal, ``,``)."""
+    s = s.rstrip()
+    while True:
+        before = s
+        m = _PARTIAL_LITERAL.search(s)
+        if m and m.group(0) not in ("true", "false", "null"):
+            s = s[: m.start()].rstrip()
+        if s.endswith(","):
+            s = s[:-1].rstrip()
+        if s.endswith(":"):
+            s = _drop_string_literal(s[:-1].rstrip()).rstrip()
+        elif closer == "}" and s.endswith('"'):
+            head = _drop_string_literal(s).rstrip()
+            if head.endswith(",") or head.endswith("{"):
+                # a key without value
+                s = head
+        if s == before:
+            return s
+
+
+def repair_json(candidate: str) -> Tuple[str, List[str]]:
+    """Repair one object candidate (starting at ``{``). Returns (text, applied repair names)."""
+    repairs: List[str] = []
+    out: List[str] = []
+    stack: List[str] = []
+    in_str = False
+    esc = False
+    for ch in candidate:
+        if in_str:
+            out.append(ch)
+            if esc:
+                esc = False
+            elif ch == "\\":
+                esc = True
+            elif ch == '"':
+                in_str = False
+            continue
+        if ch == '"':
+            in_str = True
+            out.append(ch)
+        elif ch == "{" or ch == "[":
+            stack.append("}" if ch == "{" else "]")
+            out.append(ch)
+        elif ch == "}" or ch == "]":
+            if _strip_trailing_comma(out):
+                repairs.append("trailing_comma")
+            if not stack:
+                break
+            expected = stack.pop()
+            if expected != ch:
+                repairs.append("mismatched_bracket")
+            out.append(expected)
+            if not stack:
+                break
+        else:
+            out.append(ch)
+    if not stack:
+        return "".join(out), repairs
+
+    repairs.append("truncated")
+    if in_str:
+        if esc:
+            out.pop()
+        out.append('"')
+    text = "".join(out)
+    while stack:
+        closer = stack.pop()
+        text = _trim_dangling(text, closer) + closer
+    return text, repairs
+
+
+def parse_json_object(text: str) -> Tuple[Dict[str, Any], List[str]]:
+    """Best top-level JSON object in text and the repairs needed (empty when it parsed as-is).
+
+    Spans (including an unterminated, truncated trailing object) are tried largest first: the
+    answer is normally the biggest object and trailing examples are smaller. A span that does
+    not parse is repaired before falling back to smaller ones.
+    """
+    stripped = text.strip()
+    if stripped.startswith("{") and stripped.endswith("}"):
+        obj = _loads_dict(stripped)
+        if obj is not None:
+            return obj, []
+    spans, open_start = scan_objects(text)
+    if not spans and open_start is None:
+        raise ValueError("No JSON object found in model output.")
+    if open_start is not None:
+        spans.append((open_start, len(text)))
+    # top-level spans are disjoint, so trying each (and repairing it) stays linear overall
+    for a, b in sorted(spans, key=lambda sp: sp[1] - sp[0], reverse=True):
+        obj = _loads_dict(text[a:b])
+        if obj is not None:
+            return obj, []
+        fixed, repairs = repair_json(text[a:b])
+        obj = _loads_dict(fixed)
+        if obj is not None:
+            return obj, repairs or ["reparsed"]
+    raise ValueError("JSON object in model output could not be parsed or repaired.")
@@ -1,19 +1,55 @@
 from __future__ import annotations
 
+import abc
+import atexit
 import json
-from dataclasses import dataclass
-from typing import Any, Dict, Optional, Protocol
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Any, Callable, ClassVar, Deque, Dict, Iterator, List, Optional, Protocol, Tuple
 
-from .prompt import extract_json
+from .cache import ResponseCache, make_cache_key
+from .cassette import ReplaySummarizer
+from .json_extract import parse_json_object
+from .prompt import estimate_tokens, extract_json
+from .scheduler import RequestScheduler
+from .stream import IncrementalJSONValidator, StreamAborted, StreamProgress, collect_stream
+
+
+_USAGE = threading.local()
+
+
+@contextmanager
+def collect_usage(log: List[Dict[str, Any]]) -> Iterator[List[Dict[str, Any]]]:
+    """Also append usage recorded by summarizers on this thread to log.
+
+    Summarizers are shared process-wide, so their own usage_log mixes every run; a run
+    collects its own share with this around the calls it makes."""
+    prev = getattr(_USAGE, "log", None)
+    _USAGE.log = log
+    try:
+        yield log
+    finally:
+        _USAGE.log = prev
 
 
 class Summarizer(Protocol):
     def summarize(self, system_prompt: str, user_prompt: str, model: Optional[str] = None) -> str:
         ...
 
+    def stream(self, system_prompt: str, user_prompt: str, model: Optional[str] = None) -> Iterator[str]:
+        """Yield response text incrementally (tokens/deltas as the engine sends them)."""
+        ...
+
 
 @dataclass
 class MockSummarizer:
+    engine: ClassVar[str] = "mock"
+    temperature: float = 0.0
+
     def summarize(self, system_prompt: str, user_prompt: str, model: Optional[str] = None) -> str:
         minutes = {
             "meeting": {"title": "（自動生成）", "date": "", "participants": []},
@@ -29,15 +65,78 @@ class MockSummarizer:
         }
         return json.dumps(minutes, ensure_ascii=False)
 
+    def stream(self, system_prompt: str, user_prompt: str, model: Optional[str] = None) -> Iterator[str]:
+        text = self.summarize(system_prompt, user_prompt, model)
+        for i in range(0, len(text), 32):
+            yield text[i:i + 32]
+
 
 @dataclass
-class OpenAISummarizer:
-    def summarize(self, system_prompt: str, user_prompt: str, model: Optional[str] = None) -> str:
+class _PooledSummarizer(abc.ABC):
+    """Base for API summarizers that keep one long-lived, pooled client per instance."""
+
+    base_url: Optional[str] = None
+    temperature: float = 0.2
+    timeout: float = 180.0
+    max_connections: int = 10
+    max_keepalive_connections: int = 5
+    prompt_cache: bool = True
+    keep_alive: Optional[str] = None
+    usage_log: Deque[Dict[str, Any]] = field(default_factory=lambda: deque(maxlen=1000), init=False, repr=False)
+    _client: Any = field(default=None, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def _record_usage(self, model: str, **usage: Any) -> None:
+        """Append per-call token/prompt-cache metrics (input, output, cached, cache_write).
+
+        input_tokens counts uncached prompt tokens only, for every provider."""
+        entry = {"engine": getattr(self, "engine", ""), "model": model}
+        entry.update({k: int(v or 0) for k, v in usage.items()})
+        with self._lock:
+            self.usage_log.append(entry)
+        run_log = getattr(_USAGE, "log", None)
+        if run_log is not None:
+            run_log.append(entry)
+
+    def _http_client(self) -> Any:
+        import httpx  # type: ignore
+
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+        )
+        return httpx.Client(timeout=self.timeout, limits=limits)
+
+    @abc.abstractmethod
+    def _build_client(self) -> Any:
+        """Create the provider SDK client (called once, lazily, under the lock)."""
+
+    def _get_client(self) -> Any:
+        with self._lock:
+            if self._client is None:
+                self._client = self._build_client()
+            return self._client
+
+    def close(self) -> None:
+        with self._lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
+
+@dataclass
+class OpenAISummarizer(_PooledSummarizer):
+    engine: ClassVar[str] = "openai"
+
+    def _build_client(self) -> Any:
         try:
             from openai import OpenAI  # type: ignore
         except ImportError as e:
             raise RuntimeError("openai not installed. pip install -e '.[openai]'") from e
-        client = OpenAI()
+        return OpenAI(base_url=self.base_url, timeout=self.timeout, http_client=self._http_client())
+
+    def summarize(self, system_prompt: str, user_prompt: str, model: Optional[str] = None) -> str:
+        client = self._get_client()
         mdl = model or "gpt-4o-mini"
         resp = client.chat.completions.create(
             model=mdl,
@@ -45,43 +144,119 @@ class OpenAISummarizer:
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt},
             ],
-            temperature=0.2,
+            temperature=self.temperature,
         )
+        self._record_openai_usage(mdl, getattr(resp, "usage", None))
         return resp.choices[0].message.content or ""
 
+    def stream(self, system_prompt: str, user_prompt: str, model: Optional[str] = None) -> Iterator[str]:
+        client = self._get_client()
+        resp = client.chat.completions.create(
+            model=model or "gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            temperature=self.temperature,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        try:
+            for event in resp:
+                if event.choices and event.choices[0].delta.content:
+                    yield event.choices[0].delta.content
+                self._record_openai_usage(model or "gpt-4o-mini", getattr(event, "usage", None))
+        finally:
+            resp.close()
+
+    def _record_openai_usage(self, model: str, usage: Any) -> None:
+        if usage is None:
+            return
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = (getattr(details, "cached_tokens", 0) if details else 0) or 0
+        # prompt_tokens already includes the cached tokens (Anthropic reports them separately)
+        self._record_usage(
+            model,
+            input_tokens=(usage.prompt_tokens or 0) - cached,
+            output_tokens=usage.completion_tokens,
+            cached_tokens=cached,
+        )
+
 
 @dataclass
-class AnthropicSummarizer:
-    def summarize(self, system_prompt: str, user_prompt: str, model: Optional[str] = None) -> str:
+class AnthropicSummarizer(_PooledSummarizer):
+    engine: ClassVar[str] = "anthropic"
+
+    def _build_client(self) -> Any:
         try:
             import anthropic  # type: ignore
         except ImportError as e:
             raise RuntimeError("anthropic not installed. pip install -e '.[anthropic]'") from e
-        client = anthropic.Anthropic()
+        return anthropic.Anthropic(base_url=self.base_url, timeout=self.timeout, http_client=self._http_client())
+
+    def summarize(self, system_prompt: str, user_prompt: str, model: Optional[str] = None) -> str:
+        client = self._get_client()
         mdl = model or "claude-3-5-sonnet-latest"
         msg = client.messages.create(
             model=mdl,
             max_tokens=1500,
-            temperature=0.2,
-            system=system_prompt,
+            temperature=self.temperature,
+            system=self._system_blocks(system_prompt),
             messages=[{"role": "user", "content": user_prompt}],
         )
+        self._record_anthropic_usage(mdl, getattr(msg, "usage", None))
         parts = []
         for block in msg.content:
             if getattr(block, "type", None) == "text":
                 parts.append(block.text)
         return "\n".join(parts).strip()
 
+    def stream(self, system_prompt: str, user_prompt: str, model: Optional[str] = None) -> Iterator[str]:
+        client = self._get_client()
+        mdl = model or "claude-3-5-sonnet-latest"
+        with client.messages.stream(
+            model=mdl,
+            max_tokens=1500,
+            temperature=self.temperature,
+            system=self._system_blocks(system_prompt),
+            messages=[{"role": "user", "content": user_prompt}],
+        ) as st:
+            for text in st.text_stream:
+                yield text
+            self._record_anthropic_usage(mdl, getattr(st.get_final_message(), "usage", None))
+
+    def _system_blocks(self, system_prompt: str) -> Any:
+        """Mark the static system prefix for provider-side prompt caching."""
+        if not self.prompt_cache:
+            return system_prompt
+        return [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+
+    def _record_anthropic_usage(self, model: str, usage: Any) -> None:
+        if usage is None:
+            return
+        self._record_usage(
+            model,
+            input_tokens=getattr(usage, "input_tokens", 0),
+            output_tokens=getattr(usage, "output_tokens", 0),
+            cached_tokens=getattr(usage, "cache_read_input_tokens", 0),
+            cache_write_tokens=getattr(usage, "cache_creation_input_tokens", 0),
+        )
+
 
 @dataclass
-class OllamaSummarizer:
-    base_url: str = "http://localhost:11434"
+class OllamaSummarizer(_PooledSummarizer):
+    engine: ClassVar[str] = "ollama"
+    base_url: Optional[str] = "http://localhost:11434"
 
-    def summarize(self, system_prompt: str, user_prompt: str, model: Optional[str] = None) -> str:
+    def _build_client(self) -> Any:
         try:
-            import httpx  # type: ignore
+            import httpx  # type: ignore  # noqa: F401
         except ImportError as e:
             raise RuntimeError("httpx not installed. pip install -e '.[ollama]'") from e
+        return self._http_client()
+
+    def summarize(self, system_prompt: str, user_prompt: str, model: Optional[str] = None) -> str:
+        client = self._get_client()
         mdl = model or "llama3.1"
         payload = {
             "model": mdl,
@@ -90,27 +265,285 @@ class OllamaSummarizer:
                 {"role": "user", "content": user_prompt},
             ],
             "stream": False,
-            "options": {"temperature": 0.2},
+            "options": {"temperature": self.temperature},
         }
-        url = self.base_url.rstrip("/") + "/api/chat"
-        with httpx.Client(timeout=180.0) as client:
-            r = client.post(url, json=payload)
-            r.raise_for_status()
-            data = r.json()
+        if self.keep_alive:
+            payload["keep_alive"] = self.keep_alive
+        url = (self.base_url or "http://localhost:11434").rstrip("/") + "/api/chat"
+        r = client.post(url, json=payload)
+        r.raise_for_status()
+        data = r.json()
+        self._record_ollama_usage(mdl, data)
         return (data.get("message", {}) or {}).get("content", "") or ""
 
+    def stream(self, system_prompt: str, user_prompt: str, model: Optional[str] = None) -> Iterator[str]:
+        client = self._get_client()
+        payload = {
+            "model": model or "llama3.1",
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            "stream": True,
+            "options": {"temperature": self.temperature},
+        }
+        if self.keep_alive:
+            payload["keep_alive"] = self.keep_alive
+        url = (self.base_url or "http://localhost:11434").rstrip("/") + "/api/chat"
+        with client.stream("POST", url, json=payload) as r:
+            r.raise_for_status()
+            for line in r.iter_lines():
+                if not line.strip():
+                    continue
+                data = json.loads(line)
+                content = (data.get("message", {}) or {}).get("content", "")
+                if content:
+                    yield content
+                if data.get("done"):
+                    self._record_ollama_usage(payload["model"], data)
+                    break
+
+    def _record_ollama_usage(self, model: str, data: Dict[str, Any]) -> None:
+        # Ollama reuses the KV cache of a stable prefix while the model stays loaded
+        # (keep_alive); a cache hit shows up as a small prompt_eval_count.
+        self._record_usage(
+            model,
+            input_tokens=data.get("prompt_eval_count", 0),
+            output_tokens=data.get("eval_count", 0),
+        )
+
+
+_SUMMARIZERS: Dict[Tuple[Any, ...], Summarizer] = {}
+_SUMMARIZERS_LOCK = threading.Lock()
+
 
-def get_summarizer(engine: str, ollama_base_url: str = "http://localhost:11434") -> Summarizer:
+def get_summarizer(
+    engine: str,
+    ollama_base_url: str = "http://localhost:11434",
+    base_url: Optional[str] = None,
+    **client_opts: Any,
+) -> Summarizer:
+    """Return a cached summarizer per (engine, base_url, client_opts); None options are ignored."""
     e = (engine or "mock").lower()
     if e == "mock":
         return MockSummarizer()
-    if e == "openai":
-        return OpenAISummarizer()
-    if e == "anthropic":
-        return AnthropicSummarizer()
-    if e == "ollama":
-        return OllamaSummarizer(base_url=ollama_base_url)
-    raise ValueError(f"Unknown summarize.engine: {engine}")
+    classes = {"openai": OpenAISummarizer, "anthropic": AnthropicSummarizer, "ollama": OllamaSummarizer}
+    if e not in classes:
+        raise ValueError(f"Unknown summarize.engine: {engine}")
+    url = ollama_base_url if e == "ollama" else base_url
+    opts = {k: v for k, v in client_opts.items() if v is not None}
+    # a config with another timeout / pool size / cache setting gets its own client
+    key = (e, url, tuple(sorted(opts.items())))
+    with _SUMMARIZERS_LOCK:
+        inst = _SUMMARIZERS.get(key)
+        if inst is None:
+            inst = classes[e](base_url=url, **opts)
+            _SUMMARIZERS[key] = inst
+    return inst
+
+
+def summarizer_from_config(cfg: Dict[str, Any]) -> Summarizer:
+    """Build (or reuse) the summarizer described by the summarize section of minutes.yml."""
+    sc = cfg["summarize"]
+    engine = (sc.get("engine") or "mock").lower()
+    if engine == "replay":
+        path = (cfg["__project_root__"] / (sc.get("replay_cassette") or "llm_cassette.json")).resolve()
+        with _SUMMARIZERS_LOCK:
+            inst = _SUMMARIZERS.get(("replay", str(path)))
+            if inst is None:
+                inst = ReplaySummarizer(
+                    cassette_path=path,
+                    simulate_latency=bool(sc.get("replay_latency", False)),
+                    latency_scale=float(sc.get("replay_latency_scale", 1.0)),
+                )
+                _SUMMARIZERS[("replay", str(path))] = inst
+        return inst
+    http = sc.get("http") or {}
+    return get_summarizer(
+        engine,
+        ollama_base_url=sc.get("ollama_base_url", "http://localhost:11434"),
+        base_url=sc.get(f"{engine}_base_url"),
+        timeout=http.get("timeout"),
+        max_connections=http.get("max_connections"),
+        max_keepalive_connections=http.get("max_keepalive_connections"),
+        prompt_cache=(sc.get("prompt_cache") or {}).get("enabled"),
+        keep_alive=(sc.get("prompt_cache") or {}).get("ollama_keep_alive"),
+    )
+
+
+def prompt_cache_stats(summarizer: Optional[Summarizer] = None, log: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """Aggregate per-call usage: calls, tokens and prompt-cache hit ratio.
+
+    log (from collect_usage) limits this to one run; otherwise the summarizer's recent usage."""
+    log = list(log if log is not None else getattr(summarizer, "usage_log", []) or [])
+    input_tokens = sum(e.get("input_tokens", 0) for e in log)
+    cached = sum(e.get("cached_tokens", 0) for e in log)
+    cache_write = sum(e.get("cache_write_tokens", 0) for e in log)
+    prompt_tokens = input_tokens + cached + cache_write
+    return {
+        "calls": len(log),
+        "input_tokens": input_tokens,
+        "output_tokens": sum(e.get("output_tokens", 0) for e in log),
+        "cached_tokens": cached,
+        "cache_write_tokens": cache_write,
+        "cache_hit_calls": sum(1 for e in log if e.get("cached_tokens", 0) > 0),
+        "cached_ratio": round(cached / prompt_tokens, 3) if prompt_tokens else 0.0,
+    }
+
+
+def close_summarizers() -> None:
+    """Close pooled clients of all cached summarizers (also registered with atexit)."""
+    with _SUMMARIZERS_LOCK:
+        items = list(_SUMMARIZERS.values())
+        _SUMMARIZERS.clear()
+    for inst in items:
+        close = getattr(inst, "close", None)
+        if close is not None:
+            try:
+                close()
+            except Exception:  # noqa
+                pass
+
+
+atexit.register(close_summarizers)
+
+
+@dataclass
+class LatencyTracker:
+    """Sliding window of observed call latencies (seconds)."""
+
+    window: int = 50
+    _samples: Deque[float] = field(default_factory=deque, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+            while len(self._samples) > self.window:
+                self._samples.popleft()
+
+    def quantile(self, q: float, min_samples: int = 1) -> Optional[float]:
+        with self._lock:
+            if len(self._samples) < max(1, min_samples):
+                return None
+            xs = sorted(self._samples)
+        return xs[min(len(xs) - 1, int(q * len(xs)))]
+
+
+@dataclass
+class HedgePolicy:
+    """Issue a duplicate request when the primary is slower than the observed quantile.
+
+    The duplicate goes to ``fallback`` (another engine) or, if None, the same summarizer.
+    The first response that parses as JSON wins (schema problems are reported as notes,
+    as without hedging); the loser's stream is cancelled (non-streamed calls cannot be
+    interrupted, their result is discarded).
+    """
+
+    enabled: bool = True
+    quantile: float = 0.9
+    min_samples: int = 5
+    initial_delay: float = 60.0
+    fallback: Optional[Summarizer] = None
+    fallback_model: Optional[str] = None
+    fallback_scheduler: Optional[RequestScheduler] = None
+    latency: LatencyTracker = field(default_factory=LatencyTracker)
+    calls: int = 0
+    hedged: int = 0
+    primary_wins: int = 0
+    hedge_wins: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def delay(self) -> float:
+        q = self.latency.quantile(self.quantile, self.min_samples)
+        return self.initial_delay if q is None else q
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "hedge_rate": round(self.hedged / self.calls, 3) if self.calls else 0.0,
+            "primary_wins": self.primary_wins,
+            "hedge_wins": self.hedge_wins,
+            "delay_sec": round(self.delay(), 2),
+        }
+
+
+_HEDGE_POOL: Optional[ThreadPoolExecutor] = None
+_HEDGE_POOL_LOCK = threading.Lock()
+
+
+def _hedge_pool() -> ThreadPoolExecutor:
+    global _HEDGE_POOL
+    with _HEDGE_POOL_LOCK:
+        if _HEDGE_POOL is None:
+            _HEDGE_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="mpipe-hedge")
+        return _HEDGE_POOL
+
+
+def _hedged_call(
+    policy: HedgePolicy,
+    attempt: Callable[[Summarizer, Optional[str], Optional[RequestScheduler], threading.Event], str],
+    primary: Tuple[Summarizer, Optional[str], Optional[RequestScheduler]],
+    validate: Callable[[str], None],
+) -> Tuple[str, bool]:
+    """Returns (response, whether the fallback engine produced it)."""
+    pool = _hedge_pool()
+    launched: Dict[Future, Tuple[str, threading.Event, float]] = {}
+
+    def _launch(role: str, target: Tuple[Summarizer, Optional[str], Optional[RequestScheduler]]) -> Future:
+        cancel = threading.Event()
+        fut = pool.submit(attempt, target[0], target[1], target[2], cancel)
+        launched[fut] = (role, cancel, time.monotonic())
+        return fut
+
+    def _hedge_target() -> Tuple[Summarizer, Optional[str], Optional[RequestScheduler]]:
+        if policy.fallback is None:
+            return primary
+        return policy.fallback, policy.fallback_model, policy.fallback_scheduler
+
+    with policy._lock:
+        policy.calls += 1
+    _launch("primary", primary)
+    pending = set(launched)
+    done, pending = wait(pending, timeout=policy.delay())
+    hedged = False
+    errors: List[BaseException] = []
+    while True:
+        if not done and not hedged:
+            hedged = True
+            with policy._lock:
+                policy.hedged += 1
+            # a hedge that finishes at once must still be waited for, so never filter on done()
+            pending = pending | {_launch("hedge", _hedge_target())}
+        for fut in done:
+            role, _, started = launched[fut]
+            try:
+                raw = fut.result()
+                validate(raw)
+            except Exception as e:  # noqa
+                errors.append(e)
+                continue
+            if role == "primary" or policy.fallback is None:
+                policy.latency.record(time.monotonic() - started)
+            with policy._lock:
+                if role == "primary":
+                    policy.primary_wins += 1
+                else:
+                    policy.hedge_wins += 1
+            for other, (_, cancel, _) in launched.items():
+                if other is not fut:
+                    cancel.set()
+                    other.cancel()
+            return raw, role == "hedge" and policy.fallback is not None
+        if not pending:
+            if hedged or policy.fallback is None:
+                # without a fallback a "hedge" would only retry the same engine
+                raise errors[-1]
+            # primary failed fast: give the fallback one chance before giving up
+            done = set()
+            continue
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
 
 
 def run_llm_and_parse_json(
@@ -118,6 +551,154 @@ def run_llm_and_parse_json(
     system_prompt: str,
     user_prompt: str,
     model: Optional[str] = None,
+    cache: Optional[ResponseCache] = None,
+    stream: bool = False,
+    stream_retries: int = 1,
+    schema: Optional[Dict[str, Any]] = None,
+    progress: bool = True,
+    stream_strict_types: bool = False,
+    scheduler: Optional[RequestScheduler] = None,
+    est_output_tokens: int = 1000,
+    hedge: Optional[HedgePolicy] = None,
+    usage_log: Optional[List[Dict[str, Any]]] = None,
 ) -> Dict[str, Any]:
-    raw = summarizer.summarize(system_prompt=system_prompt, user_prompt=user_prompt, model=model)
-    return extract_json(raw)
+    est = estimate_tokens(system_prompt) + estimate_tokens(user_prompt) + est_output_tokens
+
+    def _attempt(
+        s: Summarizer,
+        mdl: Optional[str],
+        sched: Optional[RequestScheduler],
+        cancel: Optional[threading.Event] = None,
+    ) -> str:
+        def _engine_call() -> str:
+            with collect_usage(usage_log) if usage_log is not None else nullcontext():
+                if stream:
+                    return _call_streaming(
+                        s, system_prompt, user_prompt, mdl, stream_retries, schema, progress, cancel,
+                        strict_types=stream_strict_types,
+                    )
+                return s.summarize(system_prompt=system_prompt, user_prompt=user_prompt, model=mdl)
+
+        if sched is None:
+            return _engine_call()
+        return sched.call(_engine_call, est_tokens=est)
+
+    def _validate(raw: str) -> None:
+        # only an unparseable answer loses the race; schema problems are reported downstream
+        # as notes, exactly as on the unhedged path
+        extract_json(raw)
+
+    answered_by: List[Tuple[Summarizer, Optional[str]]] = []
+
+    def _call() -> str:
+        if hedge is None or not hedge.enabled:
+            return _attempt(summarizer, model, scheduler)
+        raw, by_fallback = _hedged_call(hedge, _attempt, (summarizer, model, scheduler), _validate)
+        if by_fallback and hedge.fallback is not None:
+            answered_by.append((hedge.fallback, hedge.fallback_model))
+        return raw
+
+    if cache is None:
+        return _parse_response(_call())
+    key, meta = _cache_entry(summarizer, model, system_prompt, user_prompt)
+    # truncated / refused / non-JSON answers are not cached, so a re-run asks again; an
+    # answer from the hedge fallback is stored under the fallback's key, not the primary's
+    raw = cache.get_or_call(key, _call, meta=meta, validate=parse_json_object, store=lambda _raw: not answered_by)
+    if answered_by:
+        fb_key, fb_meta = _cache_entry(*answered_by[0], system_prompt, user_prompt)
+        cache.put(fb_key, raw, fb_meta)
+    return _parse_response(raw)
+
+
+def _cache_entry(
+    summarizer: Summarizer, model: Optional[str], system_prompt: str, user_prompt: str
+) -> Tuple[str, Dict[str, Any]]:
+    """Response-cache key and metadata for a call answered by summarizer/model."""
+    engine = getattr(summarizer, "engine", type(summarizer).__name__)
+    temperature = getattr(summarizer, "temperature", None)
+    base_url = getattr(summarizer, "base_url", None)
+    key = make_cache_key(engine, model, temperature, system_prompt, user_prompt, base_url)
+    return key, {"engine": engine, "model": model or ""}
+
+
+def _parse_response(raw: str) -> Dict[str, Any]:
+    """Extract the JSON object, repairing minor slips locally rather than re-requesting."""
+    obj, repairs = parse_json_object(raw)
+    if repairs:
+        print(f"[LLM json] repaired locally: {', '.join(sorted(set(repairs)))}")
+    return obj
+
+
+_HEDGE_POLICIES: Dict[str, HedgePolicy] = {}
+
+
+def hedge_policy_from_config(cfg: Dict[str, Any]) -> Optional[HedgePolicy]:
+    """Return the process-wide hedge policy for summarize.hedge (None when disabled)."""
+    from .scheduler import get_scheduler
+
+    hc = cfg["summarize"].get("hedge") or {}
+    if not hc.get("enabled", False):
+        return None
+    engine = (cfg["summarize"].get("engine") or "mock").lower()
+    fb_engine = (hc.get("fallback_engine") or "").lower() or None
+    sc = cfg["summarize"]
+
+    def _url(e: str) -> Optional[str]:
+        return sc.get("ollama_base_url") if e == "ollama" else sc.get(f"{e}_base_url")
+
+    # one policy (latency history) per engine pair and settings; a config with other
+    # settings gets its own instead of silently sharing the first one
+    key = json.dumps(
+        [engine, _url(engine), fb_engine or engine, _url(fb_engine or engine), hc.get("fallback_model"),
+         hc.get("quantile", 0.9), hc.get("min_samples", 5), hc.get("initial_delay_sec", 60.0)],
+        default=str,
+    )
+    with _SUMMARIZERS_LOCK:
+        policy = _HEDGE_POLICIES.get(key)
+    if policy is not None:
+        return policy
+    fallback = None
+    fallback_scheduler = None
+    if fb_engine and fb_engine != engine:
+        fb_cfg = {**cfg, "summarize": {**cfg["summarize"], "engine": fb_engine}}
+        fallback = summarizer_from_config(fb_cfg)
+        fallback_scheduler = get_scheduler(fb_cfg)
+    policy = HedgePolicy(
+        quantile=float(hc.get("quantile", 0.9)),
+        min_samples=int(hc.get("min_samples", 5)),
+        initial_delay=float(hc.get("initial_delay_sec", 60.0)),
+        fallback=fallback,
+        fallback_model=hc.get("fallback_model"),
+        fallback_scheduler=fallback_scheduler,
+    )
+    with _SUMMARIZERS_LOCK:
+        return _HEDGE_POLICIES.setdefault(key, policy)
+
+
+def _call_streaming(
+    summarizer: Summarizer,
+    system_prompt: str,
+    user_prompt: str,
+    model: Optional[str],
+    retries: int,
+    schema: Optional[Dict[str, Any]],
+    progress: bool,
+    cancel: Optional[threading.Event] = None,
+    strict_types: bool = False,
+) -> str:
+    """Stream one response, aborting and retrying early when it is clearly not JSON (or, with
+    strict_types, when a top-level value does not start as the schema's type)."""
+    engine = getattr(summarizer, "engine", type(summarizer).__name__)
+    for attempt in range(retries + 1):
+        validator = IncrementalJSONValidator(schema=schema, strict_types=strict_types)
+        prog = StreamProgress(label=f"LLM:{engine}") if progress else None
+        chunks = summarizer.stream(system_prompt=system_prompt, user_prompt=user_prompt, model=model)
+        try:
+            return collect_stream(chunks, validator=validator, progress=prog, cancel=cancel)
+        except StreamAborted as e:
+            if prog is not None:
+                prog.finish(validator.chars)
+            if attempt >= retries:
+                raise
+            print(f"[LLM] malformed stream ({e}); retrying ({attempt + 1}/{retries})")
+    raise RuntimeError("stream retry exhausted")
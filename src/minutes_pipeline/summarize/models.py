@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, List, Union
+from functools import lru_cache
+from typing import Any, Dict, List, Sequence, Tuple, Union
 
-from pydantic import BaseModel, Field, field_validator, model_validator
+from pydantic import BaseModel, Field, TypeAdapter, field_validator, model_validator
 
 logger = logging.getLogger(__name__)
 
@@ -236,43 +237,18 @@ class MinutesModel(BaseModel):
         return str(v)
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert model to dict, handling nested models."""
-        result: Dict[str, Any] = {}
-        
-        # Meeting
-        if isinstance(self.meeting, MeetingModel):
-            result["meeting"] = self.meeting.model_dump()
-        else:
-            result["meeting"] = self.meeting
-        
-        # Summary (always list of strings now)
-        result["summary"] = self.summary
-        
-        # Decisions
-        decisions = []
-        for d in self.decisions:
-            if isinstance(d, DecisionModel):
-                decisions.append(d.model_dump())
-            else:
-                decisions.append(d)
-        result["decisions"] = decisions
-        
-        # Todos
-        todos = []
-        for t in self.todos:
-            if isinstance(t, TodoModel):
-                todos.append(t.model_dump())
-            else:
-                todos.append(t)
-        result["todos"] = todos
-        
-        # Simple fields
-        result["topics"] = self.topics
-        result["open_questions"] = self.open_questions
-        result["next_steps"] = self.next_steps
-        result["notes"] = self.notes
-        
-        return result
+        """Convert model to dict, handling nested models (serialized in one model_dump pass)."""
+        return self.model_dump()
+
+
+@lru_cache(maxsize=None)
+def _minutes_adapter() -> TypeAdapter:
+    return TypeAdapter(MinutesModel)
+
+
+@lru_cache(maxsize=None)
+def _minutes_list_adapter() -> TypeAdapter:
+    return TypeAdapter(List[MinutesModel])
 
 
 def validate_minutes_json(data: Dict[str, Any]) -> tuple[MinutesModel, List[str]]:
@@ -285,7 +261,7 @@ def validate_minutes_json(data: Dict[str, Any]) -> tuple[MinutesModel, List[str]
     warnings: List[str] = []
     
     try:
-        model = MinutesModel(**data)
+        model = _minutes_adapter().validate_python(data)
         return model, warnings
     except Exception as e:
         warnings.append(f"Validation error: {str(e)}")
@@ -295,3 +271,102 @@ def validate_minutes_json(data: Dict[str, Any]) -> tuple[MinutesModel, List[str]
             return model, warnings
         except Exception:
             raise
+
+
+_MEETING_KEYS = frozenset(("title", "date", "participants"))
+_DECISION_KEYS = frozenset(("text", "timestamp", "evidence"))
+_TODO_KEYS = frozenset(("owner", "task", "due", "timestamp", "evidence"))
+_LIST_FIELDS = ("summary", "decisions", "todos", "topics", "open_questions", "next_steps")
+
+
+def _clean_str(x: Any) -> bool:
+    return isinstance(x, str) and x != "" and x == x.strip()
+
+
+def is_canonical_minutes(data: Any) -> bool:
+    """True when data already has the exact shape MinutesModel(...).to_dict() would produce,
+    so validation and normalization can be skipped."""
+    if not isinstance(data, dict):
+        return False
+    if "meeting" in data:
+        # a present meeting (even {}) is filled with defaults by validation; only an absent one stays {}
+        meeting = data["meeting"]
+        if not isinstance(meeting, dict) or meeting.keys() != _MEETING_KEYS:
+            return False
+        if not (isinstance(meeting["title"], str) and isinstance(meeting["date"], str)):
+            return False
+        participants = meeting["participants"]
+        if not isinstance(participants, list) or not all(map(_clean_str, participants)):
+            return False
+    for key in _LIST_FIELDS:
+        if not isinstance(data.get(key, []), list):
+            return False
+    if not isinstance(data.get("notes", ""), str):
+        return False
+    for line in data.get("summary", []):
+        if not _clean_str(line) or "\n" in line:
+            return False
+    for d in data.get("decisions", []):
+        if isinstance(d, str):
+            continue
+        if not isinstance(d, dict) or d.keys() != _DECISION_KEYS:
+            return False
+        if not (_clean_str(d["text"]) or d["text"] == "") or not all(isinstance(v, str) for v in d.values()):
+            return False
+    for t in data.get("todos", []):
+        if not isinstance(t, dict) or t.keys() != _TODO_KEYS:
+            return False
+        for v in t.values():
+            if not isinstance(v, str) or v != v.strip():
+                return False
+    for key in ("topics", "open_questions"):
+        for x in data.get(key, []):
+            if not (isinstance(x, dict) or _clean_str(x)):
+                return False
+    return all(map(_clean_str, data.get("next_steps", [])))
+
+
+def _canonical_copy(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Field-ordered shallow copy with defaults (nested values are shared with data)."""
+    return {
+        "meeting": data.get("meeting", {}),
+        "summary": data.get("summary", []),
+        "decisions": data.get("decisions", []),
+        "todos": data.get("todos", []),
+        "topics": data.get("topics", []),
+        "open_questions": data.get("open_questions", []),
+        "next_steps": data.get("next_steps", []),
+        "notes": data.get("notes", ""),
+    }
+
+
+def normalize_minutes(data: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+    """Canonical minutes dict + warnings; equivalent to validate_minutes_json(data)[0].to_dict(),
+    but input that is already canonical skips pydantic entirely."""
+    if is_canonical_minutes(data):
+        return _canonical_copy(data), []
+    model, warnings = validate_minutes_json(data)
+    return model.to_dict(), warnings
+
+
+def validate_minutes_many(docs: Sequence[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], List[str]]]:
+    """Bulk normalize_minutes: canonical documents take the fast path, the rest are validated
+    in one TypeAdapter call (falling back to per-document validation if any of them fails)."""
+    results: List[Tuple[Dict[str, Any], List[str]]] = [({}, [])] * len(docs)
+    pending: List[int] = []
+    for i, doc in enumerate(docs):
+        if is_canonical_minutes(doc):
+            results[i] = (_canonical_copy(doc), [])
+        else:
+            pending.append(i)
+    if not pending:
+        return results
+    try:
+        models = _minutes_list_adapter().validate_python([docs[i] for i in pending])
+    except Exception:
+        for i in pending:
+            results[i] = normalize_minutes(docs[i])
+        return results
+    for i, model in zip(pending, models):
+        results[i] = (model.to_dict(), [])
+    return results
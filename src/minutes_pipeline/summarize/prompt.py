@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import json
-import re
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
+from .json_extract import parse_json_object
 from .schema import DEFAULT_SCHEMA
+from .validator import get_validator, schema_hash
 
 
 def load_prompt_text(project_root: Path, prompt_path: str) -> str:
@@ -15,32 +16,40 @@ def load_prompt_text(project_root: Path, prompt_path: str) -> str:
     return default_prompt()
 
 
+_SCHEMA_FILES: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+_SCHEMAS_BY_HASH: Dict[str, Dict[str, Any]] = {}
+
+
 def load_schema(project_root: Path, schema_path: str) -> Dict[str, Any]:
+    """Load the schema once per file state; identical content returns the same (shared) dict."""
     p = (project_root / schema_path).resolve()
-    if p.exists():
-        return json.loads(p.read_text(encoding="utf-8"))
-    return DEFAULT_SCHEMA
+    if not p.exists():
+        return DEFAULT_SCHEMA
+    st = p.stat()
+    key = (str(p), st.st_mtime_ns, st.st_size)
+    schema = _SCHEMA_FILES.get(key)
+    if schema is None:
+        loaded = json.loads(p.read_text(encoding="utf-8"))
+        schema = _SCHEMAS_BY_HASH.setdefault(schema_hash(loaded), loaded)
+        _SCHEMA_FILES[key] = schema
+    return schema
 
 
 def try_validate_schema(obj: Dict[str, Any], schema: Dict[str, Any]) -> Optional[str]:
-    try:
-        import jsonschema  # type: ignore
-        jsonschema.validate(instance=obj, schema=schema)
-        return None
-    except ImportError:
-        return None
-    except Exception as e:  # noqa
-        return str(e)
+    """None when obj conforms, else all errors (one per line). Falls back to a built-in
+    validator when jsonschema is not installed."""
+    return get_validator(schema).validate(obj)
 
 
 def extract_json(text: str) -> Dict[str, Any]:
-    text = text.strip()
-    if text.startswith("{") and text.endswith("}"):
-        return json.loads(text)
-    m = re.search(r"\{.*\}", text, flags=re.DOTALL)
-    if not m:
-        raise ValueError("No JSON object found in model output.")
-    return json.loads(m.group(0))
+    """Best JSON object in model output (see json_extract.parse_json_object); repairs minor slips."""
+    return parse_json_object(text)[0]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate: ~1 token per non-ASCII (Japanese) char, ~4 ASCII chars per token."""
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (len(text) - ascii_chars) + ascii_chars // 4
 
 
 def default_prompt() -> str:
@@ -17,6 +17,11 @@ def _decision_text_timestamp_evidence(d: Any) -> tuple[str, str, str]:
     return (str(d), "", "")
 
 
+def todo_blank_counts(todos: List[Dict[str, Any]]) -> Dict[str, int]:
+    """ToDo件数のうち owner / task / due が空欄のもの。"""
+    return {k: sum(1 for t in todos if not (t.get(k) or "").strip()) for k in ("owner", "task", "due")}
+
+
 def check_minutes_quality(minutes: Dict[str, Any]) -> List[str]:
     """品質チェック: ToDo空欄率・期限形式・決定事項/ToDo 0件警告。警告メッセージのリストを返す。"""
     warnings: List[str] = []
@@ -29,11 +34,9 @@ def check_minutes_quality(minutes: Dict[str, Any]) -> List[str]:
 
     n_todos = len(todos)
     if n_todos > 0:
-        empty_owner = sum(1 for t in todos if not (t.get("owner") or "").strip())
-        empty_task = sum(1 for t in todos if not (t.get("task") or "").strip())
-        empty_due = sum(1 for t in todos if not (t.get("due") or "").strip())
+        empty = todo_blank_counts(todos)
         warnings.append(
-            f"ToDo空欄率: owner {empty_owner}/{n_todos}, task {empty_task}/{n_todos}, due {empty_due}/{n_todos}"
+            f"ToDo空欄率: owner {empty['owner']}/{n_todos}, task {empty['task']}/{n_todos}, due {empty['due']}/{n_todos}"
         )
         # 期限形式: YYYY-MM-DD または 次回まで / 未確定 など
         due_re = re.compile(r"^\d{4}-\d{2}-\d{2}$")
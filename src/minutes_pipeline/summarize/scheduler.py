@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+_RETRYABLE_STATUS = {408, 409, 425, 429, 500, 502, 503, 504, 529}
+_RETRYABLE_NAMES = {
+    "APIConnectionError",
+    "APITimeoutError",
+    "ConnectError",
+    "ConnectTimeout",
+    "ReadTimeout",
+    "ReadError",
+    "RemoteProtocolError",
+    "PoolTimeout",
+    "InternalServerError",
+    "RateLimitError",
+    "OverloadedError",
+}
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    code = getattr(exc, "status_code", None)
+    if code is None:
+        code = getattr(getattr(exc, "response", None), "status_code", None)
+    return code if isinstance(code, int) else None
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        value = headers.get("retry-after")
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_error(exc: BaseException) -> Tuple[bool, bool]:
+    """Return (retryable, rate_limited) for an exception raised by an LLM SDK or httpx."""
+    status = _status_code(exc)
+    if status is not None:
+        return status in _RETRYABLE_STATUS, status == 429
+    if type(exc).__name__ in _RETRYABLE_NAMES:
+        return True, type(exc).__name__ == "RateLimitError"
+    return isinstance(exc, (ConnectionError, TimeoutError)), False
+
+
+@dataclass
+class TokenBucket:
+    """Blocking token bucket; capacity = one minute worth of budget."""
+
+    per_minute: float
+    _tokens: float = field(default=-1.0, repr=False)
+    _last: float = field(default_factory=time.monotonic, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __post_init__(self) -> None:
+        if self._tokens < 0:
+            self._tokens = self.per_minute
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """Take amount (capped at capacity), sleeping until available. Returns seconds waited."""
+        amount = min(amount, self.per_minute)
+        rate = self.per_minute / 60.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.per_minute, self._tokens + (now - self._last) * rate)
+                self._last = now
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return waited
+                delay = (amount - self._tokens) / rate
+            time.sleep(delay)
+            waited += delay
+
+
+@dataclass
+class RequestScheduler:
+    """Per-engine rate limiter with jittered exponential backoff and AIMD concurrency.
+
+    Concurrency grows by ~1 per window of successful calls and halves on a 429 or when
+    latency exceeds ``latency_target``; requests/min and tokens/min are enforced by
+    token buckets.
+    """
+
+    engine: str
+    requests_per_min: Optional[float] = None
+    tokens_per_min: Optional[float] = None
+    max_retries: int = 5
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+    max_concurrency: int = 4
+    min_concurrency: int = 1
+    latency_target: Optional[float] = None
+    requests: int = 0
+    retries: int = 0
+    rate_limited: int = 0
+    failures: int = 0
+    _limit: float = field(default=0.0, repr=False)
+    _inflight: int = field(default=0, repr=False)
+    _last_decrease: float = field(default=0.0, repr=False)
+    _cond: threading.Condition = field(default_factory=threading.Condition, repr=False)
+    _rpm: Optional[TokenBucket] = field(default=None, repr=False)
+    _tpm: Optional[TokenBucket] = field(default=None, repr=False)
+
+    def __post_init__(self) -> None:
+        self._limit = float(self.max_concurrency)
+        self._rpm = TokenBucket(self.requests_per_min) if self.requests_per_min else None
+        self._tpm = TokenBucket(self.tokens_per_min) if self.tokens_per_min else None
+
+    @property
+    def concurrency(self) -> int:
+        return max(self.min_concurrency, int(self._limit))
+
+    def call(self, fn: Callable[[], T], est_tokens: int = 0) -> T:
+        """Run fn under the rate/concurrency limits, retrying retryable errors with backoff."""
+        for attempt in range(self.max_retries + 1):
+            self._acquire_slot()
+            if self._rpm is not None:
+                self._rpm.acquire(1)
+            if self._tpm is not None and est_tokens:
+                self._tpm.acquire(est_tokens)
+            t0 = time.monotonic()
+            try:
+                with self._cond:
+                    self.requests += 1
+                result = fn()
+            except Exception as e:
+                self._release_slot()
+                retryable, throttled = classify_error(e)
+                if throttled:
+                    with self._cond:
+                        self.rate_limited += 1
+                    self._decrease()
+                if not retryable or attempt >= self.max_retries:
+                    with self._cond:
+                        self.failures += 1
+                    raise
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+                delay = max(delay, _retry_after(e) or 0.0)
+                with self._cond:
+                    self.retries += 1
+                print(f"[LLM:{self.engine}] {type(e).__name__}; retry in {delay:.1f}s ({attempt + 1}/{self.max_retries})")
+                time.sleep(delay)
+                continue
+            latency = time.monotonic() - t0
+            self._release_slot()
+            if self.latency_target is not None and latency > self.latency_target:
+                self._decrease()
+            else:
+                self._increase()
+            return result
+        raise RuntimeError("retry exhausted")
+
+    def _acquire_slot(self) -> None:
+        with self._cond:
+            while self._inflight >= self.concurrency:
+                self._cond.wait()
+            self._inflight += 1
+
+    def _release_slot(self) -> None:
+        with self._cond:
+            self._inflight -= 1
+            self._cond.notify_all()
+
+    def _increase(self) -> None:
+        with self._cond:
+            self._limit = min(float(self.max_concurrency), self._limit + 1.0 / max(self._limit, 1.0))
+            self._cond.notify_all()
+
+    def _decrease(self) -> None:
+        with self._cond:
+            now = time.monotonic()
+            # at most one halving per backoff window, so a burst of 429s counts once
+            if now - self._last_decrease < self.base_delay:
+                return
+            self._last_decrease = now
+            self._limit = max(float(self.min_concurrency), self._limit / 2.0)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "failures": self.failures,
+            "concurrency": self.concurrency,
+        }
+
+
+_SCHEDULERS: Dict[str, RequestScheduler] = {}
+_SCHEDULERS_LOCK = threading.Lock()
+
+
+def get_scheduler(cfg: Dict[str, Any]) -> Optional[RequestScheduler]:
+    """Return the shared scheduler for summarize.engine (None for mock/manual/replay)."""
+    engine = (cfg["summarize"].get("engine") or "mock").lower()
+    if engine in ("mock", "manual", "replay"):
+        return None
+    rl = cfg["summarize"].get("rate_limit") or {}
+    with _SCHEDULERS_LOCK:
+        sched = _SCHEDULERS.get(engine)
+        if sched is None:
+            sched = RequestScheduler(
+                engine=engine,
+                requests_per_min=rl.get("requests_per_min"),
+                tokens_per_min=rl.get("tokens_per_min"),
+                max_retries=int(rl.get("max_retries", 5)),
+                base_delay=float(rl.get("base_delay", 1.0)),
+                max_delay=float(rl.get("max_delay", 60.0)),
+                max_concurrency=int(rl.get("max_concurrency", 4)),
+                min_concurrency=int(rl.get("min_concurrency", 1)),
+                latency_target=rl.get("latency_target_sec"),
+            )
+            _SCHEDULERS[engine] = sched
+    return sched
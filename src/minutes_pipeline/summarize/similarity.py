@@ -0,0 +1,125 @@
+"""Near-duplicate clustering of short texts (ToDo tasks, decisions) with MinHash + LSH.
+
+Texts are compared as sets of character n-grams, which works for Japanese without a
+tokenizer. MinHash signatures are bucketed by LSH bands, so a text is only compared with cluster
+leaders sharing a band (near-linear instead of all pairs); candidates are confirmed with
+the exact Jaccard similarity of their n-gram sets.
+"""
+from __future__ import annotations
+
+import hashlib
+import math
+import re
+import struct
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+_MAX_HASH = (1 << 32) - 1
+_NOISE = re.compile(r"[\s、。,.!?！？・「」『』（）()\[\]【】]+")
+
+
+def char_ngrams(text: str, n: int = 2) -> FrozenSet[str]:
+    """NFKC-normalized, punctuation/space-free character n-grams (the whole text if shorter)."""
+    norm = _NOISE.sub("", unicodedata.normalize("NFKC", text or "").lower())
+    if len(norm) <= n:
+        return frozenset([norm]) if norm else frozenset()
+    return frozenset(norm[i:i + n] for i in range(len(norm) - n + 1))
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def _bands_for(num_perm: int, threshold: float, recall: float = 0.99) -> Tuple[int, int]:
+    """(bands, rows) with bands * rows == num_perm: the most rows per band (fewest false
+    candidates) that still makes a pair at the threshold a candidate with probability >= recall."""
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if 1.0 - (1.0 - threshold ** rows) ** bands >= recall:
+            best = (bands, rows)
+    return best
+
+
+def _min_band_hits(bands: int, p: float, recall: float = 0.99) -> int:
+    """Largest m such that a pair at the threshold (band match probability p) shares at least
+    m bands with probability >= recall; pairs sharing fewer bands skip the exact check."""
+    tail = 1.0
+    for m in range(1, bands + 1):
+        # P(X >= m) for X ~ Binomial(bands, p)
+        tail -= math.comb(bands, m - 1) * p ** (m - 1) * (1 - p) ** (bands - m + 1)
+        if tail < recall:
+            return max(1, m - 1)
+    return bands
+
+
+@dataclass
+class MinHashLSH:
+    threshold: float = 0.8
+    ngram: int = 2
+    num_perm: int = 64
+    seed: int = 1
+    _salt: bytes = field(default=b"", repr=False)
+    _unpack: Callable[[bytes], Tuple[int, ...]] = field(default=None, repr=False)  # type: ignore[assignment]
+    _cache: Dict[str, Tuple[int, ...]] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self) -> None:
+        self._salt = self.seed.to_bytes(8, "little")
+        self._unpack = struct.Struct(f"<{self.num_perm}I").unpack
+
+    def _gram_hashes(self, gram: str) -> Tuple[int, ...]:
+        # one XOF call yields num_perm independent 32-bit hash values for this n-gram
+        digest = hashlib.shake_128(self._salt + gram.encode("utf-8")).digest(4 * self.num_perm)
+        return self._unpack(digest)
+
+    def signature(self, grams: FrozenSet[str]) -> Tuple[int, ...]:
+        rows = [self._cache.get(g) or self._cache.setdefault(g, self._gram_hashes(g)) for g in grams]
+        if not rows:
+            return (_MAX_HASH,) * self.num_perm
+        return tuple(map(min, zip(*rows)))
+
+    def cluster(
+        self,
+        texts: Sequence[str],
+        compatible: Optional[Callable[[int, int], bool]] = None,
+    ) -> List[List[int]]:
+        """Group indexes of near-duplicate texts; clusters and their members keep input order.
+
+        Each cluster is led by its first text; a later text joins the most similar leader
+        sharing an LSH band with Jaccard >= threshold (leaders avoid A~B~C chaining).
+        ``compatible(leader, i)`` can veto a join (e.g. different owners).
+        """
+        grams = [char_ngrams(t, self.ngram) for t in texts]
+        bands, rows = _bands_for(self.num_perm, self.threshold)
+        min_hits = _min_band_hits(bands, self.threshold ** rows)
+        buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+        clusters: Dict[int, List[int]] = {}
+        for i, g in enumerate(grams):
+            if not g:
+                clusters[i] = [i]
+                continue
+            sig = self.signature(g)
+            keys = [(b, sig[b * rows:(b + 1) * rows]) for b in range(bands)]
+            hits: Dict[int, int] = {}
+            for key in keys:
+                for leader in buckets.get(key, ()):
+                    hits[leader] = hits.get(leader, 0) + 1
+            best, best_sim = -1, self.threshold
+            for leader, n in hits.items():
+                if n < min_hits:
+                    continue
+                sim = jaccard(g, grams[leader])
+                if sim >= best_sim and (compatible is None or compatible(leader, i)):
+                    best, best_sim = leader, sim
+            if best >= 0:
+                clusters[best].append(i)
+                continue
+            clusters[i] = [i]
+            for key in keys:
+                buckets.setdefault(key, []).append(i)
+        return list(clusters.values())
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, TextIO
+
+# Characters that may appear outside strings inside a JSON container
+_JSON_BARE_CHARS = set(" \t\r\n,:{}[]0123456789+-.eEtrufalsn")
+_SCHEMA_TYPE_START = {"array": "[", "object": "{", "string": '"'}
+
+
+class StreamAborted(ValueError):
+    """Raised when a streamed response is clearly not going to be valid JSON."""
+
+
+@dataclass
+class IncrementalJSONValidator:
+    """Character-level JSON structure checker fed with streamed text chunks.
+
+    Tracks brackets/strings so that a clearly malformed response (mismatched brackets,
+    prose outside strings, no object after ``max_preamble`` chars) is detected while it
+    is still arriving. ``done`` becomes True once the top-level object closes.
+    With ``schema`` + ``strict_types``, top-level values must start with the type's bracket.
+    """
+
+    schema: Optional[Dict[str, Any]] = None
+    strict_types: bool = False
+    max_preamble: int = 400
+    max_chars: Optional[int] = None
+    chars: int = 0
+    done: bool = False
+    top_level_keys: List[str] = field(default_factory=list)
+    _stack: List[List[Any]] = field(default_factory=list, repr=False)
+    _in_string: bool = False
+    _escape: bool = False
+    _string_is_key: bool = False
+    _key_buf: List[str] = field(default_factory=list, repr=False)
+    _pending_key: Optional[str] = None
+    _preamble: int = 0
+
+    def feed(self, text: str) -> None:
+        for ch in text:
+            if self.done:
+                return
+            self.chars += 1
+            if self.max_chars is not None and self.chars > self.max_chars:
+                raise StreamAborted(f"response exceeded {self.max_chars} chars")
+            self._feed_char(ch)
+
+    def _feed_char(self, ch: str) -> None:
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif ch == "\\":
+                self._escape = True
+            elif ch == '"':
+                self._in_string = False
+                if self._string_is_key:
+                    if len(self._stack) == 1:
+                        key = "".join(self._key_buf)
+                        self.top_level_keys.append(key)
+                        self._pending_key = key
+                    self._key_buf = []
+                return
+            if self._string_is_key and len(self._stack) == 1:
+                self._key_buf.append(ch)
+            return
+
+        if not self._stack:
+            # Before the root object: tolerate whitespace, code fences and short preambles
+            if ch == "{":
+                self._stack.append(["{", True])
+                return
+            self._preamble += 1
+            if self._preamble > self.max_preamble:
+                raise StreamAborted(f"no JSON object within first {self.max_preamble} chars")
+            return
+
+        top = self._stack[-1]
+        if ch.isspace():
+            return
+        if self.strict_types and len(self._stack) == 1 and self._pending_key is not None and ch not in ":":
+            self._check_value_start(self._pending_key, ch)
+            self._pending_key = None
+        if ch == '"':
+            self._in_string = True
+            self._string_is_key = top[0] == "{" and top[1]
+            return
+        if ch in "{[":
+            self._stack.append([ch, ch == "{"])
+            return
+        if ch in "}]":
+            opener = "{" if ch == "}" else "["
+            if top[0] != opener:
+                raise StreamAborted(f"mismatched '{ch}' at char {self.chars}")
+            self._stack.pop()
+            if not self._stack:
+                self.done = True
+            return
+        if ch == ":":
+            if top[0] != "{" or not top[1]:
+                raise StreamAborted(f"unexpected ':' at char {self.chars}")
+            top[1] = False
+            return
+        if ch == ",":
+            if top[0] == "{":
+                top[1] = True
+            if len(self._stack) == 1:
+                self._pending_key = None
+            return
+        if ch not in _JSON_BARE_CHARS:
+            raise StreamAborted(f"unexpected {ch!r} outside string at char {self.chars}")
+
+    def _check_value_start(self, key: str, ch: str) -> None:
+        props = (self.schema or {}).get("properties") or {}
+        expected = _SCHEMA_TYPE_START.get((props.get(key) or {}).get("type", ""))
+        if expected and ch != expected:
+            raise StreamAborted(f"top-level '{key}' should start with {expected!r}, got {ch!r}")
+
+
+@dataclass
+class StreamProgress:
+    """Throttled one-line progress indicator for streamed LLM output (stderr)."""
+
+    label: str = "LLM"
+    interval: float = 0.5
+    out: TextIO = field(default_factory=lambda: sys.stderr)
+    _start: float = field(default_factory=time.monotonic, repr=False)
+    _last: float = 0.0
+
+    def update(self, chars: int) -> None:
+        now = time.monotonic()
+        if now - self._last < self.interval:
+            return
+        self._last = now
+        self.out.write(f"\r[{self.label}] receiving... {chars} chars ({now - self._start:.1f}s)")
+        self.out.flush()
+
+    def finish(self, chars: int) -> None:
+        self.out.write(f"\r[{self.label}] received {chars} chars ({time.monotonic() - self._start:.1f}s)\n")
+        self.out.flush()
+
+
+def collect_stream(
+    chunks: Iterable[str],
+    validator: Optional[IncrementalJSONValidator] = None,
+    progress: Optional[StreamProgress] = None,
+    cancel: Optional[threading.Event] = None,
+) -> str:
+    """Join streamed chunks, validating as they arrive; stop reading once the object closes.
+
+    Setting ``cancel`` stops reading (and closes the underlying stream) at the next chunk.
+    """
+    parts: List[str] = []
+    total = 0
+    it = iter(chunks)
+    try:
+        for chunk in it:
+            if not chunk:
+                continue
+            parts.append(chunk)
+            total += len(chunk)
+            if validator is not None:
+                validator.feed(chunk)
+            if progress is not None:
+                progress.update(total)
+            if validator is not None and validator.done:
+                break
+            if cancel is not None and cancel.is_set():
+                break
+    finally:
+        close = getattr(it, "close", None)
+        if close is not None:
+            close()
+    text = "".join(parts)
+    if progress is not None:
+        progress.finish(len(text))
+    return text
@@ -0,0 +1,193 @@
+"""Compiled, cached JSON Schema validators.
+
+``get_validator(schema)`` builds one validator per schema content hash and reuses it.
+With ``jsonschema`` installed its validator class is checked and instantiated once;
+otherwise a built-in validator compiled to closures covers the keywords the minutes
+schemas use (type, required, properties, items, enum, oneOf, anyOf). Either way every
+error is collected in one pass.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+JsonPath = Tuple[Any, ...]
+_Check = Callable[[Any, JsonPath, List[str]], None]
+
+_TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+}
+
+
+def schema_hash(schema: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(schema, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _fmt_path(path: JsonPath) -> str:
+    return "/".join(str(p) for p in path) or "<root>"
+
+
+def _short(value: Any) -> str:
+    text = json.dumps(value, ensure_ascii=False) if not isinstance(value, str) else repr(value)
+    return text if len(text) <= 60 else text[:57] + "..."
+
+
+def compile_schema(schema: Dict[str, Any]) -> _Check:
+    """Compile a (subset) JSON Schema into a checker appending "path: message" errors."""
+    checks: List[_Check] = []
+
+    types = schema.get("type")
+    if types is not None:
+        names = types if isinstance(types, list) else [types]
+        preds = [_TYPE_CHECKS[n] for n in names if n in _TYPE_CHECKS]
+        label = " or ".join(repr(n) for n in names)
+
+        def _type(v: Any, path: JsonPath, errors: List[str]) -> None:
+            if preds and not any(p(v) for p in preds):
+                errors.append(f"{_fmt_path(path)}: {_short(v)} is not of type {label}")
+                raise _Stop
+
+        checks.append(_type)
+
+    if "enum" in schema:
+        allowed = list(schema["enum"])
+
+        def _enum(v: Any, path: JsonPath, errors: List[str]) -> None:
+            if v not in allowed:
+                errors.append(f"{_fmt_path(path)}: {_short(v)} is not one of {allowed}")
+
+        checks.append(_enum)
+
+    for keyword in ("oneOf", "anyOf"):
+        if keyword in schema:
+            subs = [compile_schema(s) for s in schema[keyword]]
+            exactly_one = keyword == "oneOf"
+
+            def _combo(v: Any, path: JsonPath, errors: List[str], subs=subs, exactly_one=exactly_one) -> None:
+                matched = sum(1 for c in subs if not _run(c, v, path))
+                if matched == 0:
+                    errors.append(f"{_fmt_path(path)}: {_short(v)} is not valid under any of the given schemas")
+                elif exactly_one and matched > 1:
+                    errors.append(f"{_fmt_path(path)}: {_short(v)} is valid under each of {matched} schemas")
+
+            checks.append(_combo)
+
+    required = list(schema.get("required") or [])
+    props = {k: compile_schema(s) for k, s in (schema.get("properties") or {}).items() if isinstance(s, dict)}
+    if required or props:
+
+        def _object(v: Any, path: JsonPath, errors: List[str]) -> None:
+            if not isinstance(v, dict):
+                return
+            for key in required:
+                if key not in v:
+                    errors.append(f"{_fmt_path(path)}: {key!r} is a required property")
+            for key, check in props.items():
+                if key in v:
+                    _run(check, v[key], path + (key,), errors)
+
+        checks.append(_object)
+
+    items = schema.get("items")
+    if isinstance(items, dict):
+        item_check = compile_schema(items)
+
+        def _array(v: Any, path: JsonPath, errors: List[str]) -> None:
+            if not isinstance(v, list):
+                return
+            for i, item in enumerate(v):
+                _run(item_check, item, path + (i,), errors)
+
+        checks.append(_array)
+
+    def _all(v: Any, path: JsonPath, errors: List[str]) -> None:
+        for c in checks:
+            c(v, path, errors)
+
+    return _all
+
+
+class _Stop(Exception):
+    """Type mismatch: skip the remaining keywords for this node."""
+
+
+def _run(check: _Check, value: Any, path: JsonPath, errors: Optional[List[str]] = None) -> List[str]:
+    out = errors if errors is not None else []
+    try:
+        check(value, path, out)
+    except _Stop:
+        pass
+    return out
+
+
+@dataclass
+class SchemaValidator:
+    schema: Dict[str, Any]
+    digest: str
+    backend: str = "builtin"
+    _impl: Any = field(default=None, repr=False)
+    _check: Optional[_Check] = field(default=None, repr=False)
+    _schema_error: Optional[str] = field(default=None, repr=False)
+
+    @classmethod
+    def build(cls, schema: Dict[str, Any], digest: Optional[str] = None, builtin: bool = False) -> "SchemaValidator":
+        """Validator backed by jsonschema when installed (unless builtin=True)."""
+        v = cls(schema=schema, digest=digest or schema_hash(schema))
+        try:
+            if builtin:
+                raise ImportError
+            import jsonschema  # type: ignore
+        except ImportError:
+            v._check = compile_schema(schema)
+            return v
+        validator_cls = jsonschema.validators.validator_for(schema)
+        try:
+            validator_cls.check_schema(schema)
+        except jsonschema.SchemaError as e:
+            v._schema_error = f"<schema>: {e.message}"
+        v.backend = "jsonschema"
+        v._impl = validator_cls(schema)
+        return v
+
+    def errors(self, obj: Any) -> List[str]:
+        """All validation errors as "path: message" strings (empty when valid)."""
+        if self._schema_error:
+            return [self._schema_error]
+        if self._impl is not None:
+            errs = sorted(self._impl.iter_errors(obj), key=lambda e: [str(p) for p in e.absolute_path])
+            return [f"{_fmt_path(tuple(e.absolute_path))}: {e.message}" for e in errs]
+        return _run(self._check, obj, ()) if self._check is not None else []
+
+    def validate(self, obj: Any) -> Optional[str]:
+        """None when valid, otherwise every error joined by newlines."""
+        errs = self.errors(obj)
+        return "\n".join(errs) if errs else None
+
+
+_VALIDATORS: Dict[str, SchemaValidator] = {}
+_BY_ID: Dict[int, SchemaValidator] = {}
+_LOCK = threading.Lock()
+
+
+def get_validator(schema: Dict[str, Any]) -> SchemaValidator:
+    """Shared validator for this schema (looked up by object identity, then content hash)."""
+    v = _BY_ID.get(id(schema))
+    if v is not None and v.schema is schema:
+        return v
+    digest = schema_hash(schema)
+    with _LOCK:
+        v = _VALIDATORS.get(digest)
+        if v is None:
+            v = SchemaValidator.build(schema, digest)
+            _VALIDATORS[digest] = v
+        _BY_ID[id(schema)] = v
+    return v
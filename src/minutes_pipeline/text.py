@@ -0,0 +1,12 @@
+"""Text normalization shared by scoring (CER/WER) and preprocessing (repetition collapse)."""
+from __future__ import annotations
+
+import unicodedata
+
+
+def normalize_text(text: str, keep_punct: bool = False) -> str:
+    """NFKC, lower-case, whitespace dropped; punctuation/symbols too unless keep_punct."""
+    text = unicodedata.normalize("NFKC", text).lower()
+    if keep_punct:
+        return "".join(ch for ch in text if not ch.isspace())
+    return "".join(ch for ch in text if not ch.isspace() and unicodedata.category(ch)[0] not in "PSZ")
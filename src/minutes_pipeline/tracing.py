@@ -0,0 +1,109 @@
+"""Lightweight span tracing in Chrome trace-event format (mpipe run --trace → logs/trace.json).
+
+    with span("llm.summarize", "llm", chars=len(block)):
+        ...
+
+Spans are recorded as complete ("X") events per thread, so overlapping chunk calls, idle
+workers and model load vs decode show up on a timeline in chrome://tracing or Perfetto.
+When no tracer is active, span() returns a shared no-op context manager (one global lookup).
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, ContextManager, Dict, List, Optional
+
+_NULL_SPAN = nullcontext()
+_ACTIVE: Optional["Tracer"] = None
+
+
+class Tracer:
+    def __init__(self) -> None:
+        self.events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._t0 = time.perf_counter_ns()
+        self._threads: Dict[int, str] = {}
+
+    def now_us(self) -> float:
+        return (time.perf_counter_ns() - self._t0) / 1000.0
+
+    def add(self, event: Dict[str, Any]) -> None:
+        tid = threading.get_ident()
+        event["pid"] = self._pid
+        event["tid"] = tid
+        with self._lock:
+            if tid not in self._threads:
+                self._threads[tid] = threading.current_thread().name
+            self.events.append(event)
+
+    def to_json(self) -> Dict[str, Any]:
+        with self._lock:
+            meta = [
+                {"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid, "args": {"name": name}}
+                for tid, name in self._threads.items()
+            ]
+            return {"traceEvents": meta + list(self.events), "displayTimeUnit": "ms"}
+
+    def write(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_json(), ensure_ascii=False), encoding="utf-8")
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "cat", "args", "start")
+
+    def __init__(self, tracer: Tracer, name: str, cat: str, args: Dict[str, Any]) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.start = 0.0
+
+    def __enter__(self) -> Dict[str, Any]:
+        self.start = self.tracer.now_us()
+        return self.args
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is StopIteration:
+            return  # an exhausted iterator did no work worth a span (see _traced_windows)
+        end = self.tracer.now_us()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        event = {"name": self.name, "cat": self.cat, "ph": "X", "ts": self.start, "dur": end - self.start}
+        if self.args:
+            event["args"] = self.args
+        self.tracer.add(event)
+
+
+def span(name: str, cat: str = "pipeline", **args: Any) -> ContextManager[Any]:
+    """Time the enclosed block; the context value is the args dict (None when tracing is off)."""
+    tracer = _ACTIVE
+    if tracer is None:
+        return _NULL_SPAN
+    return _Span(tracer, name, cat, args)
+
+
+def instant(name: str, cat: str = "pipeline", **args: Any) -> None:
+    tracer = _ACTIVE
+    if tracer is not None:
+        tracer.add({"name": name, "cat": cat, "ph": "i", "s": "t", "ts": tracer.now_us(), "args": args})
+
+
+def start_tracing() -> Tracer:
+    global _ACTIVE
+    _ACTIVE = Tracer()
+    return _ACTIVE
+
+
+def stop_tracing(path: Path | None = None) -> Tracer | None:
+    """Deactivate the tracer and (when path is given) write its trace file."""
+    global _ACTIVE
+    tracer, _ACTIVE = _ACTIVE, None
+    if tracer is not None and path is not None:
+        tracer.write(path)
+    return tracer
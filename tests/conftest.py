@@ -0,0 +1,44 @@
+"""
+Shared fixtures: a project directory with minutes.yml and synthetic transcripts.
+"""
+
+import json
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import pytest
+
+
+def make_segments(n: int, text: str = "議題{i}を確認しました。", step: float = 5.0, length: float = 4.0) -> List[dict]:
+    """n transcript segments `step` seconds apart; `{i}` in text is the segment index."""
+    return [{"start": i * step, "end": i * step + length, "speaker": None, "text": text.format(i=i)} for i in range(n)]
+
+
+@pytest.fixture
+def segments() -> Callable[..., List[dict]]:
+    return make_segments
+
+
+@pytest.fixture
+def write_project(tmp_path: Path) -> Callable[..., Path]:
+    """Factory: write minutes.yml (plus extra text files and {"segments": ...} transcripts,
+    both keyed by path relative to the project) and return the config path."""
+
+    def _write(
+        config: str = "summarize:\n  engine: mock\n",
+        files: Optional[Dict[str, str]] = None,
+        transcripts: Optional[Dict[str, List[dict]]] = None,
+    ) -> Path:
+        for rel, text in (files or {}).items():
+            p = tmp_path / rel
+            p.parent.mkdir(parents=True, exist_ok=True)
+            p.write_text(text, encoding="utf-8")
+        for rel, segs in (transcripts or {}).items():
+            p = tmp_path / rel
+            p.parent.mkdir(parents=True, exist_ok=True)
+            p.write_text(json.dumps({"segments": segs}, ensure_ascii=False), encoding="utf-8")
+        cfg = tmp_path / "minutes.yml"
+        cfg.write_text(config, encoding="utf-8")
+        return cfg
+
+    return _write
@@ -0,0 +1,118 @@
+"""
+Test offline batch mode (submit → status → collect) against the fake-llm batch endpoints.
+"""
+
+import json
+import threading
+from typing import Dict
+
+import pytest
+
+from minutes_pipeline.fakellm import FakeLLMConfig, make_server
+from minutes_pipeline.pipeline import batch_collect, batch_status, batch_submit
+
+
+@pytest.fixture
+def fake_base():
+    srv, stats = make_server(FakeLLMConfig(batch_delay=0.0), port=0)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}", stats
+    srv.shutdown()
+    srv.server_close()
+
+
+def _config(engine: str, base: str, merge_engine: str = "deterministic") -> str:
+    url = base + "/v1" if engine == "openai" else base
+    return (
+        f"summarize:\n  engine: {engine}\n  {engine}_base_url: {url}\n"
+        "chunk:\n  target_chars: 120\n  min_chars: 40\n"
+        f"merge:\n  engine: {merge_engine}\n"
+    )
+
+
+def _meetings(segments, *names: str) -> Dict[str, list]:
+    """Clean transcripts per meeting, keyed by path relative to the project."""
+    return {
+        f"output/{name}/transcript_clean.json": segments(8, name + "の予算案{i}を承認することに決定しました。", step=10.0, length=5.0)
+        for name in names
+    }
+
+
+@pytest.mark.parametrize("engine", ["openai", "anthropic"])
+def test_submit_and_collect_many_meetings(tmp_path, fake_base, engine, write_project, segments):
+    base, stats = fake_base
+    transcripts = _meetings(segments, "会議A", "会議B")
+    cfg = write_project(_config(engine, base), transcripts=transcripts)
+    meetings = [tmp_path / rel for rel in transcripts]
+    job_path = batch_submit(meetings, cfg)
+    job = json.loads(job_path.read_text(encoding="utf-8"))
+    assert job["engine"] == engine and len(job["meetings"]) == 2
+    assert len(job["meetings"][0]["chunks"]) > 1
+
+    assert batch_collect(job_path) is True
+    for m in meetings:
+        out = json.loads((m.parent / "llm_output.json").read_text(encoding="utf-8"))
+        assert any("予算案" in d["text"] for d in out["decisions"])
+        assert (m.parent / "minutes_draft.md").exists()
+        assert (m.parent / "partial_01.json").exists()
+    assert stats.to_dict()["batch_items"] == sum(len(m["chunks"]) for m in job["meetings"])
+    assert json.loads(job_path.read_text(encoding="utf-8"))["phase"] == "done"
+
+
+def test_llm_merge_runs_as_second_batch(tmp_path, fake_base, write_project, segments):
+    base, _ = fake_base
+    [meeting] = transcripts = _meetings(segments, "会議A")
+    cfg = write_project(_config("anthropic", base, merge_engine="llm"), transcripts=transcripts)
+    job_path = batch_submit([tmp_path / meeting], cfg, job_path=tmp_path / "job.json")
+    assert batch_collect(job_path) is False
+    job = json.loads(job_path.read_text(encoding="utf-8"))
+    assert job["phase"] == "merge" and job["merge_job_id"]
+    assert batch_collect(job_path) is True
+    assert (tmp_path / "output" / "会議A" / "minutes_draft.md").exists()
+
+
+def test_collect_before_completion_keeps_job_pending(tmp_path, write_project, segments):
+    srv, _ = make_server(FakeLLMConfig(batch_delay=60.0), port=0)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    try:
+        base = f"http://127.0.0.1:{srv.server_address[1]}"
+        [meeting] = transcripts = _meetings(segments, "会議A")
+        cfg = write_project(_config("openai", base), transcripts=transcripts)
+        job_path = batch_submit([tmp_path / meeting], cfg)
+        assert batch_status(job_path).state == "in_progress"
+        assert batch_collect(job_path) is False
+        assert json.loads(job_path.read_text(encoding="utf-8"))["phase"] == "chunk"
+    finally:
+        srv.shutdown()
+        srv.server_close()
+
+
+def test_failed_chunks_are_resubmitted_then_reported(tmp_path, write_project, segments):
+    fake = FakeLLMConfig(batch_delay=0.0, error_rate=1.0)
+    srv, stats = make_server(fake, port=0)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    try:
+        [rel] = transcripts = _meetings(segments, "会議A")
+        cfg = write_project(_config("openai", f"http://127.0.0.1:{srv.server_address[1]}"), transcripts=transcripts)
+        meeting = tmp_path / rel
+        job_path = batch_submit([meeting], cfg)
+        n_chunks = len(json.loads(job_path.read_text(encoding="utf-8"))["meetings"][0]["chunks"])
+        assert batch_collect(job_path) is False  # every chunk failed: resubmitted once
+        job = json.loads(job_path.read_text(encoding="utf-8"))
+        assert job["resubmits"] == 1 and len(job["meetings"][0]["missing"]) == n_chunks
+        with pytest.raises(RuntimeError, match="still missing"):
+            batch_collect(job_path)
+        job = json.loads(job_path.read_text(encoding="utf-8"))
+        assert job["phase"] == "chunk" and job["meetings"][0]["missing"]
+        assert not (meeting.parent / "minutes_draft.md").exists()
+
+        fake.error_rate = 0.0
+        job["resubmits"] = 0
+        job_path.write_text(json.dumps(job, ensure_ascii=False), encoding="utf-8")
+        assert batch_collect(job_path) is False  # resubmits only the missing chunks
+        assert batch_collect(job_path) is True
+        assert stats.to_dict()["batch_items"] == 3 * n_chunks
+        assert (meeting.parent / "minutes_draft.md").exists()
+    finally:
+        srv.shutdown()
+        srv.server_close()
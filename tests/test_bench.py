@@ -0,0 +1,42 @@
+"""
+Test mpipe bench: synthetic transcripts, result document and baseline comparison.
+"""
+
+import pytest
+
+from minutes_pipeline.bench import BenchSpec, bench_main, compare, parse_duration, run_bench, synth_transcript
+
+
+def test_parse_duration():
+    assert parse_duration("15m") == 15 and parse_duration("2h") == 120 and parse_duration("1h30m") == 90
+    assert parse_duration("45") == 45
+    with pytest.raises(ValueError):
+        parse_duration("2x")
+
+
+def test_synthetic_transcript_is_seeded_and_sized():
+    spec = BenchSpec(segment_chars=(20, 30), vocab_size=50)
+    a = synth_transcript(10, spec)
+    assert a == synth_transcript(10, spec)
+    segs = a["segments"]
+    assert segs[-1]["start"] < 600 <= segs[-1]["end"] + 10
+    assert all(len(s["text"]) >= 20 for s in segs)
+
+
+def test_run_and_compare_with_baseline(tmp_path, capsys):
+    spec = BenchSpec(durations_min=[5], trials=1, cases=["preprocess", "merge", "render"])
+    doc = run_bench(spec, progress=False)
+    assert set(doc["results"]) == {"preprocess@5m", "merge@5m", "render@5m"}
+
+    base = {"results": {"a": {"median_sec": 0.100}, "b": {"median_sec": 0.100}, "c": {"median_sec": 0.001}, "d": {"median_sec": 0.1}}}
+    cur = {"results": {"a": {"median_sec": 0.150}, "b": {"median_sec": 0.050}, "c": {"median_sec": 0.002}, "e": {"median_sec": 0.1}}}
+    rows = {r["case"]: r["status"] for r in compare(cur, base, threshold=0.2)}
+    # c doubled but stays under the noise floor
+    assert rows == {"a": "regression", "b": "improved", "c": "ok", "e": "new"}
+
+    baseline = tmp_path / "base.json"
+    assert bench_main(spec, save_baseline=baseline) == 0
+    assert bench_main(spec, baseline=baseline, threshold=100.0) == 0
+    assert "vs baseline" in capsys.readouterr().out
+    with pytest.raises(ValueError, match="Unknown bench case"):
+        run_bench(BenchSpec(cases=["nope"]))
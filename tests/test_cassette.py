@@ -0,0 +1,43 @@
+"""
+Test record/replay cassettes for LLM calls.
+"""
+
+import json
+
+import pytest
+
+from minutes_pipeline.summarize.cassette import CassetteMiss, RecordingSummarizer, ReplaySummarizer
+from minutes_pipeline.summarize.llm_adapter import MockSummarizer, run_llm_and_parse_json
+
+
+def test_record_then_replay_roundtrip(tmp_path):
+    cassette = tmp_path / "llm_cassette.json"
+    rec = RecordingSummarizer(inner=MockSummarizer(), cassette_path=cassette)
+    live = run_llm_and_parse_json(rec, "sys", "user-1")
+    run_llm_and_parse_json(rec, "sys", "user-2", stream=True, progress=False)
+
+    data = json.loads(cassette.read_text(encoding="utf-8"))
+    assert len(data["interactions"]) == 2
+    assert data["interactions"][0]["engine"] == "mock"
+    assert data["interactions"][0]["latency_sec"] >= 0
+
+    replay = ReplaySummarizer(cassette_path=cassette)
+    assert run_llm_and_parse_json(replay, "sys", "user-1") == live
+    assert run_llm_and_parse_json(replay, "sys", "user-2", stream=True, progress=False) == live
+    with pytest.raises(CassetteMiss):
+        replay.summarize("sys", "unknown")
+
+
+def test_replay_serves_identical_requests_in_order(tmp_path):
+    cassette = tmp_path / "c.json"
+    entries = [
+        {"key": None, "response": '{"n": 1}', "latency_sec": 0.0},
+        {"key": None, "response": '{"n": 2}', "latency_sec": 0.0},
+    ]
+    from minutes_pipeline.summarize.cassette import request_key
+
+    for e in entries:
+        e["key"] = request_key("s", "u", None)
+    cassette.write_text(json.dumps({"version": 1, "interactions": entries}), encoding="utf-8")
+    replay = ReplaySummarizer(cassette_path=cassette)
+    assert [replay.summarize("s", "u") for _ in range(3)] == ['{"n": 1}', '{"n": 2}', '{"n": 2}']
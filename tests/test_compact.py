@@ -0,0 +1,59 @@
+"""
+Test compact transcript format for prompts (coalescing, sparse timestamps, filler removal).
+"""
+
+from minutes_pipeline.pipeline import (
+    DEFAULT_FILLER_PHRASES,
+    _build_chunk_slices,
+    _compact_transcript_lines,
+    _compaction_report,
+    _format_transcript_for_prompt,
+    _is_filler_only,
+)
+
+COMPACT = {"enabled": True, "timestamp_interval_sec": 60, "max_line_chars": 400}
+
+
+def _seg(start, text, speaker=None):
+    return {"start": start, "end": start + 2.0, "speaker": speaker, "text": text}
+
+
+def test_filler_only_detection():
+    assert _is_filler_only("えー、", ["えー", "あの"])
+    assert _is_filler_only("あのー…えーと。", ["えーと", "あのー", "えー"])
+    assert not _is_filler_only("えー、来週までに対応します。", ["えー"])
+    fillers = DEFAULT_FILLER_PHRASES
+    assert _is_filler_only("あのー、その、まあ。", fillers)
+    for kept in ("そのまま。", "あのまま", "まま", "その件は了承です。"):
+        assert not _is_filler_only(kept, fillers), kept
+    lines = _compact_transcript_lines([_seg(0, "えー"), _seg(2, "そのまま。"), _seg(4, "まま")], COMPACT)
+    assert lines == ["[00:02] そのまま。まま"]
+
+
+def test_coalesces_segments_and_spaces_timestamps():
+    segs = [_seg(0, "本日の議題です。"), _seg(2, "えー"), _seg(4, "予算について"), _seg(65, "次に日程です。")]
+    lines = _compact_transcript_lines(segs, COMPACT)
+    assert lines == ["[00:00] 本日の議題です。予算について", "[01:05] 次に日程です。"]
+
+
+def test_speaker_change_starts_new_line_without_timestamp():
+    segs = [_seg(0, "始めます。", "A"), _seg(3, "はい。", "B"), _seg(5, "お願いします。", "B")]
+    lines = _compact_transcript_lines(segs, COMPACT)
+    assert lines == ["[00:00] A: 始めます。", "B: はい。お願いします。"]
+
+
+def test_report_shows_reduction():
+    t = {"segments": [_seg(i * 2.0, f"発言{i}です。") for i in range(100)]}
+    rep = _compaction_report(t, COMPACT)
+    assert rep["chars_after"] < rep["chars_before"] / 2
+    assert rep["tokens_after"] < rep["tokens_before"]
+    assert _compaction_report(t, {"enabled": False}) is None
+
+
+def test_prompt_and_chunk_use_compact_format():
+    t = {"segments": [_seg(i * 2.0, f"発言{i}です。") for i in range(100)]}
+    block = _format_transcript_for_prompt(t, compact=COMPACT)
+    assert "Speaker:" not in block
+    full = _build_chunk_slices(t, target_chars=500, min_chars=100)
+    compact = _build_chunk_slices(t, target_chars=500, min_chars=100, compact=True)
+    assert len(compact) < len(full)
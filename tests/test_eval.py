@@ -0,0 +1,106 @@
+"""
+Test mpipe eval: golden manifest, per-item metrics, reuse of run folders, report comparison.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from minutes_pipeline.evaluate import compare, eval_pipeline, load_manifest
+
+
+@pytest.fixture
+def project(write_project, segments) -> Path:
+    text = "議題{i}について確認し、承認することに決定しました。"
+    return write_project(
+        "pipeline:\n  steps: [asr, preprocess, summarize]\n"
+        "summarize:\n  engine: mock\n"
+        "eval:\n  manifest: golden.yml\n",
+        files={
+            "golden.yml": "items:\n"
+            "  - {id: short, tier: short, transcript: golden/short.json, reference: golden/short.json}\n"
+            "  - {id: long, tier: long, transcript: golden/long.json}\n",
+        },
+        transcripts={"golden/short.json": segments(4, text), "golden/long.json": segments(40, text)},
+    )
+
+
+def _reports(tmp_path: Path) -> list:
+    return sorted((tmp_path / "eval_runs" / "reports").glob("eval_*.json"))
+
+
+def test_eval_runs_manifest_and_compares_with_previous(tmp_path, project):
+    assert eval_pipeline(project, workers=2) == 0
+    [first] = _reports(tmp_path)
+    report = json.loads(first.read_text(encoding="utf-8"))
+    assert set(report["items"]) == {"short", "long"}
+    long = report["items"]["long"]
+    assert long["status"] == "ok" and long["audio_sec"] == 199.0
+    assert long["asr_rtf"] is None  # fixed transcript: no ASR ran
+    assert {"preprocess", "summarize"} <= set(long["stage_sec"])
+    assert set(long["todo_blank_rate"]) == {"owner", "task", "due"}
+    assert (tmp_path / "eval_runs" / "items" / "long" / "llm_output.json").exists()
+    assert report["items"]["short"]["cer"] == 0.0 and "cer" not in long
+    assert "comparison" not in report and first.with_suffix(".md").exists()
+
+    assert eval_pipeline(project, only=["long"]) == 0
+    second = json.loads(_reports(tmp_path)[-1].read_text(encoding="utf-8"))
+    assert list(second["items"]) == ["long"]
+    assert "preprocess" in second["items"]["long"]["reused"]  # stable run folder: unchanged stages skipped
+    assert second["items"]["long"]["stage_sec"]["preprocess"] is None  # no stale timing from the first run
+    assert second["previous"] == str(first)
+    assert [r["status"] for r in second["comparison"]] == ["ok"]
+
+
+def test_parallel_items_run_without_profiling_or_tracing(tmp_path, project):
+    with project.open("a", encoding="utf-8") as f:
+        f.write("profile:\n  enabled: true\n  trace: true\n")
+    assert eval_pipeline(project, workers=2) == 0
+    for item in ("short", "long"):
+        meta = json.loads((tmp_path / "eval_runs" / "items" / item / "run_metadata.json").read_text(encoding="utf-8"))
+        assert "profile" not in meta and "trace" not in meta
+    assert eval_pipeline(project, workers=1, only=["short"]) == 0
+    meta = json.loads((tmp_path / "eval_runs" / "items" / "short" / "run_metadata.json").read_text(encoding="utf-8"))
+    assert "profile" in meta and "trace" in meta
+
+
+def test_compare_flags_regressions():
+    def item(**kw):
+        return {"status": "ok", "decisions": 3, "todos": 2, "schema_ok": True,
+                "todo_blank_rate": {"owner": 0.0, "task": 0.0, "due": 0.5}, "asr_rtf": 0.1, **kw}
+
+    prev = {"items": {"a": item(), "b": item(), "c": item(), "d": item(), "e": {"status": "error"}, "g": item(cer=0.10)}}
+    cur = {"items": {
+        "a": item(decisions=4),
+        "b": item(todos=0, todo_blank_rate={"owner": None, "task": None, "due": None}),
+        "c": item(asr_rtf=0.2, todo_blank_rate={"owner": 0.5, "task": 0.0, "due": 0.0}),
+        "d": {"status": "error"},
+        "e": item(),
+        "f": item(),
+        "g": item(cer=0.13),
+        "h": item(asr_rtf=0.5, reused=["asr"]),
+    }}
+    prev["items"]["h"] = item()
+    rows = {r["id"]: r for r in compare(cur, prev)}
+    assert rows["a"]["status"] == "ok" and rows["a"]["decisions_delta"] == 1
+    assert rows["b"]["status"] == "regression" and rows["b"]["reasons"] == ["todos 0 (was 2)"]
+    assert rows["c"]["status"] == "regression" and len(rows["c"]["reasons"]) == 2  # owner blank + RTF
+    assert rows["d"]["status"] == "regression"
+    assert rows["e"]["status"] == "improved"
+    assert rows["f"]["status"] == "new"
+    assert rows["g"]["status"] == "regression" and rows["g"]["reasons"] == ["CER 10.00% -> 13.00%"]
+    assert rows["h"]["status"] == "ok"  # ASR reused: its RTF is not this run's
+
+
+def test_manifest_validation(tmp_path):
+    path = tmp_path / "golden.yml"
+    path.write_text("items:\n  - {id: a, tier: huge, media: a.mp4}\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="tier"):
+        load_manifest(path)
+    path.write_text("items:\n  - {id: a}\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="media or transcript"):
+        load_manifest(path)
+    path.write_text("items:\n  - {id: a, media: in/a.mp4, config: minutes_large.yml}\n", encoding="utf-8")
+    [item] = load_manifest(path)
+    assert item.media == tmp_path / "in" / "a.mp4" and item.config == tmp_path / "minutes_large.yml"
@@ -0,0 +1,78 @@
+"""
+Test the local stand-in LLM server (OpenAI/Ollama protocols, 429 injection, streaming).
+"""
+
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from minutes_pipeline.fakellm import FakeLLMConfig, LatencyModel, fake_minutes, make_server
+
+PROMPT = "## 文字起こし（整形後）\n[00:00] 予算案を承認することに決定しました。\n[00:10] 田中さん、来週までに見積もりをお願いします。"
+
+
+@pytest.fixture
+def server():
+    def _start(**kw):
+        srv, stats = make_server(FakeLLMConfig(**kw), port=0)
+        threading.Thread(target=srv.serve_forever, daemon=True).start()
+        started.append(srv)
+        return f"http://127.0.0.1:{srv.server_address[1]}", stats
+
+    started = []
+    yield _start
+    for srv in started:
+        srv.shutdown()
+        srv.server_close()
+
+
+def _post(url, payload):
+    req = urllib.request.Request(url, data=json.dumps(payload).encode("utf-8"), headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=5) as r:
+        return r.read().decode("utf-8")
+
+
+def test_fake_minutes_is_schema_shaped_and_derived_from_prompt():
+    obj = fake_minutes("sys", PROMPT)
+    assert obj["decisions"] == ["予算案を承認することに決定しました。"]
+    assert obj["todos"][0]["due"].startswith("来週")
+    for key in ("meeting", "summary", "decisions", "todos", "topics", "open_questions"):
+        assert key in obj
+
+
+def test_latency_model_parse():
+    assert LatencyModel.parse("uniform:0.1,0.2").params == (0.1, 0.2)
+    with pytest.raises(ValueError):
+        LatencyModel.parse("pareto:1")
+
+
+def test_openai_and_ollama_endpoints(server):
+    base, stats = server(latency=LatencyModel.parse("fixed:0"))
+    msgs = [{"role": "system", "content": "sys"}, {"role": "user", "content": PROMPT}]
+    oa = json.loads(_post(base + "/v1/chat/completions", {"model": "m", "messages": msgs}))
+    content = json.loads(oa["choices"][0]["message"]["content"])
+    assert content["decisions"]
+    ol = json.loads(_post(base + "/api/chat", {"model": "m", "messages": msgs, "stream": False}))
+    assert json.loads(ol["message"]["content"]) == content
+    assert stats.to_dict()["ok"] == 2
+
+
+def test_streaming_ollama_ndjson(server):
+    base, _ = server(stream_chunk_chars=8)
+    msgs = [{"role": "user", "content": PROMPT}]
+    lines = [json.loads(l) for l in _post(base + "/api/chat", {"messages": msgs, "stream": True}).splitlines() if l]
+    assert lines[-1]["done"] is True
+    text = "".join(l["message"]["content"] for l in lines)
+    assert json.loads(text)["decisions"]
+
+
+def test_injected_429(server):
+    base, stats = server(rate_429=1.0, retry_after=2)
+    with pytest.raises(urllib.error.HTTPError) as ei:
+        _post(base + "/v1/chat/completions", {"messages": []})
+    assert ei.value.code == 429
+    assert ei.value.headers["Retry-After"] == "2"
+    assert stats.to_dict()["rate_limited"] == 1
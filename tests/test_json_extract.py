@@ -0,0 +1,67 @@
+"""
+Test JSON extraction from noisy model output and local repair of minor slips.
+"""
+
+import json
+import time
+
+import pytest
+
+from minutes_pipeline.summarize.json_extract import parse_json_object, repair_json, scan_objects
+from minutes_pipeline.summarize.prompt import extract_json
+
+
+def test_braces_inside_strings_do_not_split_objects():
+    text = '前置き {"a": "x}y{", "b": "\\"}"} 後書き'
+    spans, open_start = scan_objects(text)
+    assert len(spans) == 1 and open_start is None
+    assert extract_json(text) == {"a": "x}y{", "b": '"}'}
+
+
+def test_largest_object_wins_over_trailing_example():
+    text = '```json\n{"decisions": ["予算承認"], "todos": []}\n```\n例: {"owner": "田中"}'
+    assert extract_json(text) == {"decisions": ["予算承認"], "todos": []}
+
+
+def test_trailing_commas_are_repaired_before_smaller_objects():
+    obj, repairs = parse_json_object('{"a": [1, 2,], "b": {"c": 1,},}\n例: {"x": 1}')
+    assert obj == {"a": [1, 2], "b": {"c": 1}}
+    assert set(repairs) == {"trailing_comma"}
+
+
+@pytest.mark.parametrize(
+    "tail, expected",
+    [
+        ('"task": "資料', {"todos": [{"owner": "田中", "task": "資料"}]}),
+        ('"ta', {"todos": [{"owner": "田中"}]}),
+        ('"task":', {"todos": [{"owner": "田中"}]}),
+        ('"n": tr', {"todos": [{"owner": "田中"}]}),
+    ],
+)
+def test_truncated_tail_is_closed(tail, expected):
+    obj, repairs = parse_json_object('{"todos": [{"owner": "田中", ' + tail)
+    assert obj == expected
+    assert "truncated" in repairs
+
+
+def test_mismatched_closer():
+    fixed, repairs = repair_json('{"a": [1, 2}')
+    assert json.loads(fixed) == {"a": [1, 2]}
+    assert "mismatched_bracket" in repairs
+
+
+def test_no_object_raises():
+    with pytest.raises(ValueError):
+        extract_json("JSONはありません")
+
+
+def test_large_noisy_output_is_linear():
+    answer = {"summary": ["概要" * 20] * 200, "todos": [{"owner": "田中", "task": '資料{を}"送る"', "due": ""}] * 3000}
+    noise = '説明 {例} [注] "引用" ' * 20000
+    body = json.dumps(answer, ensure_ascii=False, indent=1)
+    text = noise + "```json\n" + body[:-1] + ",}\n```\n" + noise
+    t0 = time.perf_counter()
+    obj, repairs = parse_json_object(text)
+    elapsed = time.perf_counter() - t0
+    assert len(obj["todos"]) == 3000 and repairs == ["trailing_comma"]
+    assert elapsed < 2.0
@@ -0,0 +1,276 @@
+"""
+Test LLM adapter plumbing (summarizer reuse, close hook, streaming, hedging, prompt caching).
+"""
+
+import time
+
+import pytest
+
+from minutes_pipeline.summarize.llm_adapter import (
+    AnthropicSummarizer,
+    HedgePolicy,
+    MockSummarizer,
+    OllamaSummarizer,
+    close_summarizers,
+    get_summarizer,
+    prompt_cache_stats,
+    run_llm_and_parse_json,
+)
+from minutes_pipeline.summarize.stream import IncrementalJSONValidator, StreamAborted
+
+
+@pytest.fixture(autouse=True)
+def _reset_summarizers():
+    close_summarizers()
+    yield
+    close_summarizers()
+
+
+def test_get_summarizer_reuses_instance_per_engine_and_url():
+    a = get_summarizer("ollama", ollama_base_url="http://a:11434")
+    b = get_summarizer("ollama", ollama_base_url="http://a:11434")
+    c = get_summarizer("ollama", ollama_base_url="http://b:11434")
+    assert isinstance(a, OllamaSummarizer)
+    assert a is b
+    assert a is not c
+
+
+def test_client_opts_apply_on_creation():
+    s = get_summarizer("openai", base_url="http://localhost:9999/v1", timeout=5.0, max_connections=2)
+    assert s.base_url == "http://localhost:9999/v1"
+    assert s.timeout == 5.0
+    assert s.max_connections == 2
+    assert get_summarizer("openai", base_url="http://localhost:9999/v1", timeout=5.0, max_connections=2) is s
+    other = get_summarizer("openai", base_url="http://localhost:9999/v1", timeout=30.0, max_connections=2)
+    assert other is not s and other.timeout == 30.0
+
+
+def test_pooled_summarizer_requires_a_client_builder():
+    from minutes_pipeline.summarize.llm_adapter import _PooledSummarizer
+
+    with pytest.raises(TypeError):
+        _PooledSummarizer()
+
+
+def test_close_summarizers_drops_cached_instances():
+    a = get_summarizer("anthropic")
+    close_summarizers()
+    assert get_summarizer("anthropic") is not a
+
+
+def test_mock_and_unknown_engine():
+    assert isinstance(get_summarizer("mock"), MockSummarizer)
+    with pytest.raises(ValueError):
+        get_summarizer("nope")
+
+
+class ScriptedStreamSummarizer(MockSummarizer):
+    """Streams a different scripted response on each attempt."""
+
+    def __init__(self, responses):
+        super().__init__()
+        self.responses = list(responses)
+        self.attempts = 0
+
+    def stream(self, system_prompt, user_prompt, model=None):
+        text = self.responses[min(self.attempts, len(self.responses) - 1)]
+        self.attempts += 1
+        for ch in text:
+            yield ch
+
+
+def test_incremental_validator_accepts_fenced_json_and_stops_at_close():
+    v = IncrementalJSONValidator()
+    v.feed('```json\n{"summary": ["a}b"], "todos": [{"task": "x"}]}')
+    assert v.done
+    assert v.top_level_keys == ["summary", "todos"]
+
+
+def test_incremental_validator_rejects_mismatch_and_prose():
+    with pytest.raises(StreamAborted):
+        IncrementalJSONValidator().feed('{"a": [1, 2}')
+    with pytest.raises(StreamAborted):
+        IncrementalJSONValidator().feed('{"a": 決定事項}')
+    with pytest.raises(StreamAborted):
+        IncrementalJSONValidator(max_preamble=10).feed("申し訳ありませんが、議事録は作成できません。")
+
+
+def test_incremental_validator_strict_types():
+    schema = {"properties": {"summary": {"type": "array"}}}
+    with pytest.raises(StreamAborted):
+        IncrementalJSONValidator(schema=schema, strict_types=True).feed('{"summary": "text"}')
+
+
+def test_streaming_retries_after_malformed_response():
+    s = ScriptedStreamSummarizer(['{"summary": ]', '{"summary": ["ok"]} trailing text'])
+    obj = run_llm_and_parse_json(s, "sys", "user", stream=True, stream_retries=1, progress=False)
+    assert obj == {"summary": ["ok"]}
+    assert s.attempts == 2
+
+
+def test_streaming_strict_types_checks_the_schema():
+    schema = {"properties": {"summary": {"type": "array"}}}
+    s = ScriptedStreamSummarizer(['{"summary": "text"}', '{"summary": ["ok"]}'])
+    obj = run_llm_and_parse_json(s, "sys", "user", stream=True, schema=schema, progress=False, stream_strict_types=True)
+    assert obj == {"summary": ["ok"]} and s.attempts == 2
+    s = ScriptedStreamSummarizer(['{"summary": "text"}'])
+    assert run_llm_and_parse_json(s, "sys", "user", stream=True, schema=schema, progress=False) == {"summary": "text"}
+
+
+def test_streaming_gives_up_after_retries():
+    s = ScriptedStreamSummarizer(['{"summary": ]'])
+    with pytest.raises(StreamAborted):
+        run_llm_and_parse_json(s, "sys", "user", stream=True, stream_retries=1, progress=False)
+
+
+class SlowSummarizer(MockSummarizer):
+    def __init__(self, delays):
+        super().__init__()
+        self.delays = list(delays)
+        self.calls = 0
+
+    def summarize(self, system_prompt, user_prompt, model=None):
+        delay = self.delays[min(self.calls, len(self.delays) - 1)]
+        self.calls += 1
+        time.sleep(delay)
+        return super().summarize(system_prompt, user_prompt, model)
+
+
+def test_hedge_fires_after_delay_and_fallback_wins():
+    primary = SlowSummarizer([1.0])
+    fallback = SlowSummarizer([0.0])
+    policy = HedgePolicy(initial_delay=0.05, fallback=fallback)
+    obj = run_llm_and_parse_json(primary, "sys", "user", hedge=policy)
+    assert obj["todos"]
+    assert fallback.calls == 1
+    st = policy.stats()
+    assert st["hedged"] == 1
+    assert st["hedge_wins"] == 1
+    assert st["primary_wins"] == 0
+
+
+def test_fallback_answer_is_cached_under_the_fallback_key(tmp_path):
+    from minutes_pipeline.summarize.cache import ResponseCache
+
+    cache = ResponseCache(cache_dir=tmp_path)
+    primary = SlowSummarizer([1.0, 0.0])
+    fallback = OllamaSummarizer(base_url="http://fallback:11434")
+    fallback.summarize = lambda system_prompt, user_prompt, model=None: '{"summary": ["fallback"]}'
+    policy = HedgePolicy(initial_delay=0.05, fallback=fallback)
+    assert run_llm_and_parse_json(primary, "sys", "user", cache=cache, hedge=policy) == {"summary": ["fallback"]}
+    assert run_llm_and_parse_json(fallback, "sys", "user", cache=cache)["summary"] == ["fallback"]
+    assert cache.stats()["hits"] == 1
+    # the primary's own key was not filled with the fallback's answer
+    assert "fallback" not in str(run_llm_and_parse_json(primary, "sys", "user", cache=cache))
+    assert primary.calls == 2
+
+
+def test_hedge_policy_per_settings():
+    from minutes_pipeline.summarize.llm_adapter import hedge_policy_from_config
+
+    def cfg(delay):
+        return {"summarize": {"engine": "mock", "hedge": {"enabled": True, "initial_delay_sec": delay}}}
+
+    assert hedge_policy_from_config(cfg(30)) is hedge_policy_from_config(cfg(30))
+    assert hedge_policy_from_config(cfg(5)).initial_delay == 5.0
+
+
+def test_fast_primary_is_not_hedged_and_latency_recorded():
+    primary = SlowSummarizer([0.0])
+    policy = HedgePolicy(initial_delay=5.0, min_samples=1)
+    run_llm_and_parse_json(primary, "sys", "user", hedge=policy)
+    assert primary.calls == 1
+    assert policy.stats()["primary_wins"] == 1
+    assert policy.delay() < 5.0
+
+
+def test_hedge_accepts_schema_invalid_but_parseable_answer():
+    class OffSchema(MockSummarizer):
+        def summarize(self, system_prompt, user_prompt, model=None):
+            return '{"summary": "要約のみ"}'
+
+    schema = {"type": "object", "required": ["todos"]}
+    policy = HedgePolicy(initial_delay=5.0)
+    obj = run_llm_and_parse_json(OffSchema(), "sys", "user", schema=schema, hedge=policy)
+    assert obj == {"summary": "要約のみ"}
+    assert policy.stats()["primary_wins"] == 1
+
+
+def test_fast_failure_without_fallback_is_not_hedged():
+    class Broken(SlowSummarizer):
+        def summarize(self, system_prompt, user_prompt, model=None):
+            self.calls += 1
+            raise RuntimeError("connection refused")
+
+    primary = Broken([0.0])
+    policy = HedgePolicy(initial_delay=5.0)
+    with pytest.raises(RuntimeError):
+        run_llm_and_parse_json(primary, "sys", "user", hedge=policy)
+    assert primary.calls == 1 and policy.stats()["hedged"] == 0
+
+
+def test_static_prefix_is_stable_across_transcripts():
+    from minutes_pipeline.pipeline import _build_summarize_prompts
+    from minutes_pipeline.summarize.schema import DEFAULT_SCHEMA
+
+    sys_a, user_a = _build_summarize_prompts("テンプレ", DEFAULT_SCHEMA, "[00:00] 会議A")
+    sys_b, user_b = _build_summarize_prompts("テンプレ", DEFAULT_SCHEMA, "[00:00] 会議B")
+    assert sys_a == sys_b
+    assert "テンプレ" in sys_a and "会議A" not in sys_a
+    assert user_a != user_b
+
+
+def test_anthropic_marks_system_prefix_for_caching():
+    s = AnthropicSummarizer()
+    blocks = s._system_blocks("static prefix")
+    assert blocks[0]["cache_control"] == {"type": "ephemeral"}
+    assert AnthropicSummarizer(prompt_cache=False)._system_blocks("static prefix") == "static prefix"
+
+
+def test_prompt_cache_stats_aggregates_usage():
+    s = AnthropicSummarizer()
+    s._record_usage("m", input_tokens=100, output_tokens=50, cached_tokens=0, cache_write_tokens=900)
+    s._record_usage("m", input_tokens=100, output_tokens=40, cached_tokens=900)
+    st = prompt_cache_stats(s)
+    assert st["calls"] == 2
+    assert st["cache_hit_calls"] == 1
+    assert st["cached_ratio"] == round(900 / 2000, 3)  # cache writes are uncached prompt tokens too
+
+
+def test_openai_usage_counts_cached_tokens_once():
+    from types import SimpleNamespace
+
+    from minutes_pipeline.summarize.llm_adapter import OpenAISummarizer
+
+    s = OpenAISummarizer()
+    usage = SimpleNamespace(prompt_tokens=1000, completion_tokens=50, prompt_tokens_details=SimpleNamespace(cached_tokens=800))
+    s._record_openai_usage("m", usage)
+    st = prompt_cache_stats(s)
+    assert st["input_tokens"] == 200 and st["cached_tokens"] == 800
+    assert st["cached_ratio"] == 0.8
+
+
+def test_usage_log_collects_only_this_runs_calls():
+    import threading
+
+    class Counted(AnthropicSummarizer):
+        def summarize(self, system_prompt, user_prompt, model=None):
+            self._record_usage("m", input_tokens=len(user_prompt), output_tokens=1)
+            return MockSummarizer().summarize(system_prompt, user_prompt, model)
+
+    shared = Counted()
+    shared._record_usage("m", input_tokens=999, output_tokens=1)  # an earlier run in the process
+    logs = {"a": [], "b": []}
+
+    def run(name, n):
+        for _ in range(n):
+            run_llm_and_parse_json(shared, "sys", name * 10, usage_log=logs[name])
+
+    threads = [threading.Thread(target=run, args=("a", 3)), threading.Thread(target=run, args=("b", 2))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert prompt_cache_stats(log=logs["a"])["calls"] == 3 and prompt_cache_stats(log=logs["a"])["input_tokens"] == 30
+    assert prompt_cache_stats(log=logs["b"])["calls"] == 2
+    assert prompt_cache_stats(shared)["calls"] == 6
@@ -0,0 +1,105 @@
+"""
+Test on-disk LLM response cache (hit/miss, bypass, eviction, coalescing).
+"""
+
+import threading
+import time
+
+import pytest
+
+from minutes_pipeline.summarize.cache import ResponseCache, make_cache_key
+from minutes_pipeline.summarize.llm_adapter import MockSummarizer, run_llm_and_parse_json
+
+
+class CountingSummarizer(MockSummarizer):
+    def __init__(self, delay: float = 0.0):
+        super().__init__()
+        self.calls = 0
+        self.delay = delay
+
+    def summarize(self, system_prompt, user_prompt, model=None):
+        self.calls += 1
+        time.sleep(self.delay)
+        return super().summarize(system_prompt, user_prompt, model)
+
+
+def test_key_changes_with_prompt_and_model():
+    k1 = make_cache_key("openai", "gpt-4o-mini", 0.2, "sys", "user")
+    assert k1 == make_cache_key("OpenAI", "gpt-4o-mini", 0.2, "sys", "user")
+    assert k1 != make_cache_key("openai", "gpt-4o", 0.2, "sys", "user")
+    assert k1 != make_cache_key("openai", "gpt-4o-mini", 0.2, "sys", "user2")
+    assert k1 != make_cache_key("openai", "gpt-4o-mini", 0.2, "sys", "user", "http://localhost:8000/v1")
+
+
+def test_hit_after_miss(tmp_path):
+    cache = ResponseCache(cache_dir=tmp_path)
+    s = CountingSummarizer()
+    a = run_llm_and_parse_json(s, "sys", "user", cache=cache)
+    b = run_llm_and_parse_json(s, "sys", "user", cache=cache)
+    assert a == b
+    assert s.calls == 1
+    assert cache.stats() == {"hits": 1, "misses": 1, "coalesced": 0}
+
+
+def test_unparseable_response_is_not_cached(tmp_path):
+    class Truncated(CountingSummarizer):
+        def summarize(self, system_prompt, user_prompt, model=None):
+            self.calls += 1
+            return "申し訳ありませんが、"
+
+    cache = ResponseCache(cache_dir=tmp_path)
+    s = Truncated()
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            run_llm_and_parse_json(s, "sys", "user", cache=cache)
+    assert s.calls == 2
+    assert not list(tmp_path.glob("*/*.json"))
+
+
+def test_bypass_skips_lookup(tmp_path):
+    cache = ResponseCache(cache_dir=tmp_path, bypass=True)
+    s = CountingSummarizer()
+    run_llm_and_parse_json(s, "sys", "user", cache=cache)
+    run_llm_and_parse_json(s, "sys", "user", cache=cache)
+    assert s.calls == 2
+
+
+def test_concurrent_identical_requests_are_coalesced(tmp_path):
+    cache = ResponseCache(cache_dir=tmp_path)
+    s = CountingSummarizer(delay=0.2)
+    threads = [threading.Thread(target=run_llm_and_parse_json, args=(s, "sys", "user"), kwargs={"cache": cache}) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert s.calls == 1
+    assert cache.stats()["coalesced"] == 3
+
+
+def test_disk_reads_happen_outside_the_lock(tmp_path):
+    cache = ResponseCache(cache_dir=tmp_path)
+    cache.put("aakey", "cached")
+    real_get = cache.get
+    locked_reads = []
+
+    def spy_get(key):
+        locked_reads.append(cache._lock.locked())
+        return real_get(key)
+
+    cache.get = spy_get
+    assert cache.get_or_call("aakey", lambda: "fresh") == "cached"
+    assert cache.get_or_call("bbkey", lambda: "fresh") == "fresh"
+    assert locked_reads and not any(locked_reads)
+    assert cache.stats() == {"hits": 1, "misses": 1, "coalesced": 0}
+
+
+def test_evict_by_size_drops_least_recent(tmp_path):
+    cache = ResponseCache(cache_dir=tmp_path, max_bytes=10**9)
+    for i in range(3):
+        cache.put(f"{i:02d}key", "x" * 1000)
+        time.sleep(0.01)
+    cache.get("00key")  # touch oldest so it becomes most recent
+    cache.max_bytes = 2500
+    assert cache.evict() == 1
+    assert cache.get("00key") is not None
+    assert cache.get("01key") is None
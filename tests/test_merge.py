@@ -0,0 +1,144 @@
+"""
+Test partial JSON merge (flat and tree-reduce).
+"""
+
+import json
+from pathlib import Path
+
+import threading
+import time
+
+from minutes_pipeline.pipeline import run_merge, watch_merge
+
+
+def _write_partials(run_dir: Path, n: int) -> list:
+    run_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i in range(1, n + 1):
+        obj = {
+            "decisions": [f"決定{i}", "共通の決定"],
+            "todos": [
+                {"owner": "田中", "task": f"タスク{i}", "due": ""},
+                {"owner": "佐藤", "task": "資料を共有する", "due": f"3/{i}"},
+            ],
+            "topics": [f"論点{i % 3}"],
+        }
+        p = run_dir / f"partial_{i:02d}.json"
+        p.write_text(json.dumps(obj, ensure_ascii=False), encoding="utf-8")
+        paths.append(p)
+    return paths
+
+
+def test_tree_merge_matches_flat_merge(tmp_path, write_project):
+    cfg = write_project()
+    paths = _write_partials(tmp_path / "run", 11)
+    flat = json.loads(run_merge(paths, cfg, out_path=tmp_path / "flat.json").read_text(encoding="utf-8"))
+    tree = json.loads(run_merge(paths, cfg, out_path=tmp_path / "tree.json", tree_k=3).read_text(encoding="utf-8"))
+    assert tree == flat
+    assert len(tree["todos"]) == 12
+    shared = [t for t in tree["todos"] if t["task"] == "資料を共有する"][0]
+    assert shared["due"] == "未確定"
+    assert (tmp_path / "run" / "merge_tree" / "level_01" / "node_004.json").exists()
+    assert (tmp_path / "run" / "merge_tree" / "level_02" / "node_002.json").exists()
+
+
+def test_tree_merge_resumes_from_persisted_nodes(tmp_path, capsys, write_project):
+    cfg = write_project()
+    paths = _write_partials(tmp_path / "run", 6)
+    run_merge(paths, cfg, tree_k=2)
+    capsys.readouterr()
+    run_merge(paths, cfg, tree_k=2)
+    out = capsys.readouterr().out
+    assert "level 1: 6 -> 3 (reused 3)" in out
+
+
+def test_tree_nodes_are_not_reused_across_merge_engines(tmp_path, capsys, monkeypatch, write_project):
+    from minutes_pipeline import pipeline
+
+    cfg = write_project()
+    paths = _write_partials(tmp_path / "run", 4)
+    run_merge(paths, cfg, tree_k=2)
+    llm_cfg = tmp_path / "minutes_llm.yml"
+    llm_cfg.write_text("summarize:\n  engine: openai\n  model: gpt-4o-mini\n", encoding="utf-8")
+    calls = []
+    monkeypatch.setattr(pipeline, "_llm_merge_group", lambda group, *a, **kw: calls.append(group) or group[0])
+    capsys.readouterr()
+    run_merge(paths, llm_cfg, tree_k=2, merge_engine="llm")
+    assert "level 1: 4 -> 2 (reused 0)" in capsys.readouterr().out
+    assert len(calls) == 3
+    run_merge(paths, llm_cfg, tree_k=2, merge_engine="llm")
+    assert "level 1: 4 -> 2 (reused 2)" in capsys.readouterr().out and len(calls) == 3
+    llm_cfg.write_text("summarize:\n  engine: openai\n  model: gpt-4o\n", encoding="utf-8")
+    run_merge(paths, llm_cfg, tree_k=2, merge_engine="llm")
+    assert "(reused 0)" in capsys.readouterr().out
+
+
+def test_near_duplicate_todos_and_decisions_are_merged(tmp_path, write_project):
+    cfg = write_project("summarize:\n  engine: mock\nmerge:\n  similarity:\n    enabled: true\n")
+    run_dir = tmp_path / "run"
+    run_dir.mkdir()
+    partials = [
+        {"decisions": ["予算案を承認する"], "todos": [{"owner": "田中", "task": "見積もりを来週までに提出する", "due": "来週"}]},
+        {"decisions": ["予算案を承認する。"], "todos": [{"owner": "田中さん", "task": "見積もりを来週までに提出", "due": "4/10"}]},
+        {"todos": [{"owner": "佐藤", "task": "見積もりを来週までに提出する。", "due": ""}]},
+    ]
+    paths = []
+    for i, obj in enumerate(partials, 1):
+        p = run_dir / f"partial_{i:02d}.json"
+        p.write_text(json.dumps(obj, ensure_ascii=False), encoding="utf-8")
+        paths.append(p)
+    merged = json.loads(run_merge(paths, cfg).read_text(encoding="utf-8"))
+    assert [d["text"] for d in merged["decisions"]] == ["予算案を承認する"]
+    assert [(t["owner"], t["due"]) for t in merged["todos"]] == [("田中", "未確定"), ("佐藤", "")]
+
+
+def test_similarity_is_opt_in(tmp_path, write_project):
+    cfg = write_project()
+    run_dir = tmp_path / "run"
+    run_dir.mkdir()
+    p = run_dir / "partial_01.json"
+    p.write_text(json.dumps({"decisions": ["予算案を承認する", "予算案を承認する。"]}, ensure_ascii=False), encoding="utf-8")
+    merged = json.loads(run_merge([p], cfg).read_text(encoding="utf-8"))
+    assert len(merged["decisions"]) == 2
+
+
+def test_watch_merge_folds_in_partials_as_they_arrive(tmp_path, write_project):
+    cfg = write_project()
+    run_dir = tmp_path / "run"
+    run_dir.mkdir()
+    stop = threading.Event()
+    result = {}
+    t = threading.Thread(target=lambda: result.setdefault("n", watch_merge(run_dir, cfg, interval=0.05, stop=stop)))
+    t.start()
+    draft = run_dir / "minutes_draft.md"
+
+    def wait_for(text):
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            if draft.exists() and text in draft.read_text(encoding="utf-8"):
+                return True
+            time.sleep(0.02)
+        return False
+
+    try:
+        (run_dir / "partial_01.json").write_text(json.dumps({"decisions": ["予算案を承認する"]}, ensure_ascii=False), encoding="utf-8")
+        assert wait_for("予算案を承認する")
+        (run_dir / "partial_02.json").write_text('{"decisions": ["会場を', encoding="utf-8")
+        (run_dir / "partial_02.json").write_text(json.dumps({"decisions": ["会場を変更する"]}, ensure_ascii=False), encoding="utf-8")
+        assert wait_for("会場を変更する")
+        (run_dir / "partial_01.json").write_text(json.dumps({"decisions": ["日程を延期する"]}, ensure_ascii=False), encoding="utf-8")
+        assert wait_for("日程を延期する")
+    finally:
+        stop.set()
+        t.join(5)
+    merged = json.loads((run_dir / "llm_output.json").read_text(encoding="utf-8"))
+    assert sorted(d["text"] for d in merged["decisions"]) == ["会場を変更する", "日程を延期する"]
+    assert result["n"] >= 3
+
+
+def test_watch_merge_exits_when_idle(tmp_path, write_project):
+    cfg = write_project()
+    run_dir = tmp_path / "run"
+    _write_partials(run_dir, 2)
+    assert watch_merge(run_dir, cfg, interval=0.02, idle_exit=0.1) == 1
+    assert (run_dir / "minutes_draft.md").exists()
@@ -0,0 +1,70 @@
+"""
+Test the canonical fast path and bulk validation of MinutesModel.
+"""
+
+import time
+
+from minutes_pipeline.summarize.models import (
+    is_canonical_minutes,
+    normalize_minutes,
+    validate_minutes_json,
+    validate_minutes_many,
+)
+
+MESSY = {
+    "meeting": {"title": "定例", "date": "2024-04-01", "participants": [" 田中 ", {"name": "佐藤"}]},
+    "summary": "予算を確認\n日程を調整",
+    "decisions": [" 予算承認 ", {"text": " 日程確定 ", "extra": 1}],
+    "todos": [{"owner": " 田中", "task": "見積もり", "due": None}],
+    "topics": [{"label": "予算"}, " 日程"],
+    "notes": {"memo": 1},
+    "sections": [],
+}
+
+
+def _synthetic(n_todos: int) -> dict:
+    return {
+        "meeting": {"title": "定例", "date": "", "participants": ["田中", "佐藤"]},
+        "summary": [f"要点{i}" for i in range(50)],
+        "decisions": [f"決定{i}" for i in range(200)],
+        "todos": [{"owner": f" 担当{i % 7}", "task": f"タスク{i} ", "due": "来週"} for i in range(n_todos)],
+        "topics": [],
+        "open_questions": [],
+    }
+
+
+def test_fast_path_matches_full_validation():
+    full = validate_minutes_json(MESSY)[0].to_dict()
+    assert not is_canonical_minutes(MESSY)
+    assert normalize_minutes(MESSY) == (full, [])
+    assert is_canonical_minutes(full)
+    assert normalize_minutes(full)[0] == full
+    for doc in ({"meeting": {}}, {"meeting": {"title": "定例"}}, {}):
+        assert normalize_minutes(doc)[0] == validate_minutes_json(doc)[0].to_dict(), doc
+    assert not is_canonical_minutes({"meeting": {}})
+
+
+def test_non_canonical_details_are_rejected():
+    canonical = normalize_minutes(MESSY)[0]
+    assert not is_canonical_minutes({**canonical, "summary": ["a\nb"]})
+    assert not is_canonical_minutes({**canonical, "todos": [{"owner": "a", "task": "b", "due": ""}]})
+    assert not is_canonical_minutes({**canonical, "next_steps": [" x"]})
+
+
+def test_bulk_matches_single_and_survives_bad_documents():
+    docs = [MESSY, normalize_minutes(MESSY)[0], _synthetic(5), {"todos": "壊れた"}]
+    bulk = validate_minutes_many(docs)
+    assert [r[0] for r in bulk] == [normalize_minutes(d)[0] for d in docs]
+
+
+def test_canonical_fast_path_is_faster_with_thousands_of_todos():
+    canonical = normalize_minutes(_synthetic(5000))[0]
+    assert len(canonical["todos"]) == 5000
+    t0 = time.perf_counter()
+    slow = validate_minutes_json(canonical)[0].to_dict()
+    t_slow = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    fast = normalize_minutes(canonical)[0]
+    t_fast = time.perf_counter() - t0
+    assert fast == slow
+    assert t_fast < t_slow
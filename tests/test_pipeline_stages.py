@@ -0,0 +1,169 @@
+"""
+Test the stage DAG: hashes recorded in run_metadata.json, skip-if-unchanged and --force.
+"""
+
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from minutes_pipeline.dag import Stage, run_stages
+from minutes_pipeline.pipeline import run_pipeline
+
+
+_CONFIG = (
+    "naming:\n  output_folder: \"{stem}\"\n"
+    "pipeline:\n  steps: [preprocess, summarize]\n"
+    "preprocess:\n  dictionaries:\n    terms_csv: dictionaries/terms.csv\n"
+    "summarize:\n  engine: mock\n"
+)
+
+
+@pytest.fixture
+def project(write_project, segments) -> Path:
+    return write_project(
+        _CONFIG,
+        files={"dictionaries/terms.csv": "よさん,予算\n"},
+        transcripts={"output/meeting/transcript_raw.json": segments(6, "よさん案{i}を承認することに決定しました。")},
+    )
+
+
+def _last_run(tmp_path: Path) -> dict:
+    meta = json.loads((tmp_path / "output" / "meeting" / "run_metadata.json").read_text(encoding="utf-8"))
+    return meta["last_run"]
+
+
+def test_rerun_skips_unchanged_stages(tmp_path, project):
+    media = tmp_path / "meeting.mp4"
+    run_pipeline(media, project)
+    first = _last_run(tmp_path)
+    assert first["asr"] == "disabled"
+    assert all(first[s] == "ran" for s in ("preprocess", "chunk", "summarize", "merge", "render", "check"))
+    run_dir = tmp_path / "output" / "meeting"
+    assert "予算案" in (run_dir / "chunks" / "chunk_01.txt").read_text(encoding="utf-8")
+    assert (run_dir / "minutes_draft.md").exists() and (run_dir / "partial_01.json").exists()
+
+    run_pipeline(media, project)
+    assert all(v in ("skipped", "disabled") for v in _last_run(tmp_path).values())
+
+    # a dictionary edit re-runs preprocess; identical output keeps the rest up to date
+    (tmp_path / "dictionaries" / "terms.csv").write_text("よさん,予算\n# comment\n", encoding="utf-8")
+    run_pipeline(media, project)
+    third = _last_run(tmp_path)
+    assert third["preprocess"] == "ran" and third["chunk"] == "skipped"
+
+    (run_dir / "minutes_draft.md").unlink()
+    run_pipeline(media, project, force=["summarize"])
+    fourth = _last_run(tmp_path)
+    assert fourth["summarize"] == "ran" and fourth["render"] == "ran" and fourth["chunk"] == "skipped"
+    assert (run_dir / "minutes_draft.md").exists()
+
+
+def test_missing_raw_transcript_is_reported(tmp_path, project):
+    (tmp_path / "output" / "meeting" / "transcript_raw.json").unlink()
+    with pytest.raises(FileNotFoundError, match="preprocess"):
+        run_pipeline(tmp_path / "meeting.mp4", project)
+
+
+def test_stopped_stage_blocks_downstream_and_unknown_force_fails(tmp_path):
+    out = tmp_path / "a.txt"
+    stages = [
+        Stage("a", lambda: out.write_text("x") and False, outputs=lambda: [out]),
+        Stage("b", lambda: None, deps=("a",), inputs=lambda: [out]),
+    ]
+    records: dict = {}
+    results = run_stages(stages, records)
+    assert [r.status for r in results] == ["stopped", "blocked"] and records == {}
+    with pytest.raises(ValueError, match="Unknown stage"):
+        run_stages(stages, records, force=["c"])
+    with pytest.raises(ValueError, match="cycle"):
+        run_stages([Stage("x", lambda: None, deps=("y",)), Stage("y", lambda: None, deps=("x",))], {})
+
+
+def test_streaming_overlaps_asr_and_summarize(tmp_path, monkeypatch, write_project, segments):
+    from minutes_pipeline import pipeline
+
+    write_project(
+        "naming:\n  output_folder: \"{stem}\"\n"
+        "chunk:\n  target_chars: 200\n  min_chars: 50\n"
+        "summarize:\n  engine: mock\n"
+    )
+    media = tmp_path / "meeting.wav"
+    media.write_bytes(b"RIFF")
+    produced = []
+    summarized_at = []
+
+    def fake_asr(input_media, cfg):
+        def _segs():
+            for i, seg in enumerate(segments(40, "  議題{i}について　えー確認しました。 ")):
+                time.sleep(0.01)  # decoding takes time
+                produced.append(i)
+                yield seg
+        return {"language": "ja", "duration": 200.0}, _segs()
+
+    real_block_summarizer = pipeline._block_summarizer
+
+    def spy_block_summarizer(cfg, run_dir=None):
+        one, finish = real_block_summarizer(cfg, run_dir)
+
+        def _one(block):
+            summarized_at.append(len(produced))
+            return one(block)
+
+        return _one, finish
+
+    monkeypatch.setattr(pipeline, "_asr_segments", fake_asr)
+    monkeypatch.setattr(pipeline, "_block_summarizer", spy_block_summarizer)
+    pipeline.run_pipeline(media, tmp_path / "minutes.yml", stream=True)
+
+    run_dir = tmp_path / "output" / "meeting"
+    meta = json.loads((run_dir / "run_metadata.json").read_text(encoding="utf-8"))
+    assert meta["streaming"]["chunks"] > 2 and min(summarized_at) < len(produced)
+    # streamed chunks match a batch chunking of the written transcript
+    clean = json.loads((run_dir / "transcript_clean.json").read_text(encoding="utf-8"))
+    cfg = pipeline.load_config(tmp_path / "minutes.yml")
+    expected = [c[0] for c in pipeline._chunk_texts(clean, cfg)]
+    manifest = json.loads((run_dir / "chunks" / "manifest.json").read_text(encoding="utf-8"))
+    assert [(run_dir / "chunks" / c["file"]).read_text(encoding="utf-8") for c in manifest["chunks"]] == expected
+    assert all(meta["last_run"][s] == "skipped" for s in ("asr", "preprocess", "chunk", "summarize"))
+    assert meta["last_run"]["merge"] == "ran" and (run_dir / "minutes_draft.md").exists()
+
+    pipeline.run_pipeline(media, tmp_path / "minutes.yml", stream=True)
+    meta = json.loads((run_dir / "run_metadata.json").read_text(encoding="utf-8"))
+    assert all(v in ("skipped", "disabled") for v in meta["last_run"].values())
+
+
+def test_streaming_with_force_does_not_rerun_streamed_stages(tmp_path, monkeypatch, write_project, segments):
+    from minutes_pipeline import pipeline
+
+    write_project("naming:\n  output_folder: \"{stem}\"\nsummarize:\n  engine: mock\n")
+    media = tmp_path / "meeting.wav"
+    media.write_bytes(b"RIFF")
+    asr_calls = []
+    summarize_calls = []
+
+    def fake_asr(input_media, cfg, model=None):
+        asr_calls.append(model)
+        return {"language": "ja", "duration": 30.0}, iter(segments(6))
+
+    real_block_summarizer = pipeline._block_summarizer
+
+    def spy_block_summarizer(cfg, run_dir=None):
+        one, finish = real_block_summarizer(cfg, run_dir)
+
+        def _one(block):
+            summarize_calls.append(block)
+            return one(block)
+
+        return _one, finish
+
+    monkeypatch.setattr(pipeline, "_asr_segments", fake_asr)
+    monkeypatch.setattr(pipeline, "_block_summarizer", spy_block_summarizer)
+    pipeline.run_pipeline(media, tmp_path / "minutes.yml", stream=True)
+    assert len(asr_calls) == 1 and len(summarize_calls) == 1
+
+    pipeline.run_pipeline(media, tmp_path / "minutes.yml", stream=True, force=["asr"], no_cache=True)
+    assert len(asr_calls) == 2 and len(summarize_calls) == 2
+    meta = json.loads((tmp_path / "output" / "meeting" / "run_metadata.json").read_text(encoding="utf-8"))
+    assert meta["last_run"]["asr"] == "skipped" and meta["last_run"]["summarize"] == "skipped"
@@ -0,0 +1,42 @@
+"""
+Test per-stage profiling (mpipe run --profile / --pstats).
+"""
+
+import json
+import pstats
+
+from minutes_pipeline.pipeline import run_pipeline
+from minutes_pipeline.profiling import RunProfiler, latency_summary
+
+
+_CONFIG = (
+    "naming:\n  output_folder: \"{stem}\"\n"
+    "pipeline:\n  steps: [preprocess, summarize]\n"
+    "chunk:\n  target_chars: 100\n  min_chars: 20\n"
+    "summarize:\n  engine: mock\n"
+)
+
+
+def test_profile_is_recorded_per_stage(tmp_path, write_project, segments):
+    cfg = write_project(_CONFIG, transcripts={"output/meeting/transcript_raw.json": segments(20)})
+    run_pipeline(tmp_path / "meeting.mp4", cfg, pstats=True)
+    run_dir = tmp_path / "output" / "meeting"
+    profile = json.loads((run_dir / "run_metadata.json").read_text(encoding="utf-8"))["profile"]
+    stages = profile["stages"]
+    assert set(stages) == {"preprocess", "chunk", "summarize", "merge", "render", "check"}
+    for entry in stages.values():
+        assert entry["wall_sec"] >= 0 and entry["cpu_sec"] >= 0 and "py_peak_mb" in entry
+    assert stages["summarize"]["llm"]["calls"] > 1
+    dump = run_dir / "logs" / "profile_summarize.pstats"
+    assert pstats.Stats(str(dump)).total_calls > 0
+
+
+def test_profiler_notes_and_latency_summary(tmp_path):
+    prof = RunProfiler(tmp_path, trace_memory=False)
+    with prof.stage("asr"):
+        sum(range(10000))
+    prof.note("asr", rtf=0.25)
+    report = prof.report()
+    assert report["stages"]["asr"]["rtf"] == 0.25 and "py_peak_mb" not in report["stages"]["asr"]
+    assert latency_summary([0.3, 0.1, 0.2])["latency_p50_sec"] == 0.2
+    assert latency_summary([]) == {"calls": 0}
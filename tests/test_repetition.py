@@ -0,0 +1,103 @@
+"""
+Test repetition-loop collapse: in-segment loops, runs of repeated segments, online == batch.
+"""
+
+from minutes_pipeline.repetition import RepetitionCollapser
+
+
+def _seg(i, text):
+    return {"start": i * 5.0, "end": i * 5.0 + 4, "speaker": None, "text": text}
+
+
+def _run(segs, **kw):
+    c = RepetitionCollapser(**kw)
+    out = []
+    for s in segs:
+        out.extend(c.push(s))
+    out.extend(c.flush())
+    return out, c
+
+
+def test_in_segment_loop_is_cut_to_one_copy():
+    out, c = _run([_seg(0, "冒頭です。" + "ありがとうございました。" * 20 + "以上")])
+    assert out[0]["text"] == "冒頭です。ありがとうございました。以上"
+    [rec] = c.records
+    assert rec["kind"] == "text" and rec["repeats"] == 20 and rec["removed_chars"] == 19 * 12
+    # short natural repeats stay
+    out, c = _run([_seg(0, "はいはいはい、そうそうそう。")])
+    assert out[0]["text"] == "はいはいはい、そうそうそう。" and not c.records
+
+
+def test_runs_of_repeated_segments_keep_first_period():
+    texts = ["予算の話です。", "ご視聴ありがとうございました", "ご視聴ありがとうございました。", "ご視聴 ありがとうございました",
+             "ご視聴ありがとうございました", "次の議題。",
+             "A案で進めます", "B案で進めます", "A案で進めます", "B案で進めます", "A案で進めます", "B案で進めます", "A案で進めます", "終わり"]
+    out, c = _run([_seg(i, t) for i, t in enumerate(texts)])
+    assert [s["text"] for s in out] == ["予算の話です。", "ご視聴ありがとうございました", "次の議題。", "A案で進めます", "B案で進めます", "終わり"]
+    first, second = c.records
+    assert first["period"] == 1 and first["removed_segments"] == 3 and first["repeats"] == 4
+    assert (first["start"], first["end"]) == (10.0, 24.0)
+    assert second["period"] == 2 and second["removed_segments"] == 5 and second["repeats"] == 3
+    assert c.summary()["removed_segments"] == 8
+
+
+def test_two_repeats_and_distinct_segments_pass_through_in_order():
+    texts = ["はい。", "はい。", "では始めます。", "資料1", "資料2", "資料3", "資料1"]
+    out, c = _run([_seg(i, t) for i, t in enumerate(texts)])
+    assert [s["text"] for s in out] == texts and not c.records
+
+
+def test_short_answers_other_speakers_and_amounts_are_kept():
+    votes = [{**_seg(i, t), "speaker": spk} for i, (spk, t) in enumerate(
+        [("A", "はい。"), ("B", "はい。"), ("C", "はい。"), ("A", "賛成です。"), ("B", "賛成です。"), ("C", "賛成です。"), ("D", "賛成です。")]
+    )]
+    out, c = _run(votes)
+    assert out == votes and not c.records
+    out, c = _run([_seg(i, "賛成です。") for i in range(4)])
+    assert len(out) == 4 and not c.records  # below min_segment_chars even without speakers
+    line = "では次回も同じ時間に集まりましょう"
+    spoken = [{**_seg(i, line), "speaker": spk} for i, spk in enumerate("ABAB")]
+    out, c = _run(spoken)
+    assert out == spoken and not c.records
+    out, c = _run([{**_seg(i, line), "speaker": "A"} for i in range(4)] + [{**_seg(4, line), "speaker": "B"}])
+    assert [s["speaker"] for s in out] == ["A", "B"] and c.records[0]["removed_segments"] == 3
+    out, c = _run([_seg(0, "合計は1111111111111円です。")])
+    assert out[0]["text"] == "合計は1111111111111円です。" and not c.records
+
+
+def test_holdback_is_bounded():
+    c = RepetitionCollapser(max_period=3, min_repeats=3)
+    emitted = 0
+    for i in range(50):
+        emitted += len(c.push(_seg(i, f"発言{i}")))
+        assert i + 1 - emitted <= 3
+    assert emitted + len(c.flush()) == 50
+
+
+def test_preprocess_records_collapses_in_transcript(tmp_path):
+    from minutes_pipeline.config import load_config
+    from minutes_pipeline.pipeline import _step_preprocess
+
+    (tmp_path / "minutes.yml").write_text("summarize:\n  engine: mock\n", encoding="utf-8")
+    cfg = load_config(tmp_path / "minutes.yml")
+    raw = {"language": "ja", "segments": [_seg(0, "開始します。")] + [_seg(i, "字幕視聴ありがとうございました") for i in range(1, 30)]}
+    clean = _step_preprocess(raw, cfg)
+    assert [s["text"] for s in clean["segments"]] == ["開始します。", "字幕視聴ありがとうございました"]
+    assert clean["repetition"]["removed_segments"] == 28 and clean["repetition"]["collapsed"][0]["end"] == 149.0
+
+    cfg["preprocess"]["repetition"]["enabled"] = False
+    assert len(_step_preprocess(raw, cfg)["segments"]) == 30
+
+
+def test_near_identical_segments_collapse_but_distinct_lines_do_not():
+    texts = ["開始します。", "ご視聴ありがとうございました", "ご視聴ありがとうございましたー", "ご視聴ありがとうござました",
+             "ご視聴ありがとうございました。", "次の議題に移ります"]
+    out, c = _run([_seg(i, t) for i, t in enumerate(texts)])
+    assert [s["text"] for s in out] == ["開始します。", "ご視聴ありがとうございました", "次の議題に移ります"]
+    assert c.records[0]["removed_segments"] == 3
+    numbered = [_seg(i, f"議題{i}について確認しました") for i in range(5)]
+    out, c = _run(numbered)
+    assert out == numbered and not c.records
+    # exact matching only: the drifting copies survive
+    out, c = _run([_seg(i, t) for i, t in enumerate(texts)], similarity=1.0)
+    assert [s["text"] for s in out] == texts and not c.records
@@ -0,0 +1,80 @@
+"""
+Test LLM request scheduler (error classification, backoff retries, AIMD concurrency).
+"""
+
+import pytest
+
+from minutes_pipeline.summarize.scheduler import RequestScheduler, TokenBucket, classify_error
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class FakeHTTPError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.response = FakeResponse(status_code, headers)
+
+
+def test_classify_error():
+    assert classify_error(FakeHTTPError(429)) == (True, True)
+    assert classify_error(FakeHTTPError(503)) == (True, False)
+    assert classify_error(FakeHTTPError(400)) == (False, False)
+    assert classify_error(ConnectionResetError()) == (True, False)
+    assert classify_error(ValueError("bad json")) == (False, False)
+
+
+def test_retries_then_succeeds_and_halves_concurrency():
+    sched = RequestScheduler(engine="test", base_delay=0.001, max_delay=0.01, max_concurrency=8)
+    calls = {"n": 0}
+
+    def fn():
+        calls["n"] += 1
+        if calls["n"] < 3:
+            raise FakeHTTPError(429)
+        return "ok"
+
+    assert sched.call(fn) == "ok"
+    assert calls["n"] == 3
+    st = sched.stats()
+    assert st["retries"] == 2
+    assert st["rate_limited"] == 2
+    assert st["concurrency"] < 8
+
+
+def test_non_retryable_error_raises_immediately():
+    sched = RequestScheduler(engine="test", base_delay=0.001)
+    calls = {"n": 0}
+
+    def fn():
+        calls["n"] += 1
+        raise FakeHTTPError(401)
+
+    with pytest.raises(FakeHTTPError):
+        sched.call(fn)
+    assert calls["n"] == 1
+    assert sched.stats()["failures"] == 1
+
+
+def test_gives_up_after_max_retries():
+    sched = RequestScheduler(engine="test", base_delay=0.001, max_delay=0.001, max_retries=2)
+    with pytest.raises(FakeHTTPError):
+        sched.call(lambda: (_ for _ in ()).throw(FakeHTTPError(500)))
+    assert sched.stats()["retries"] == 2
+
+
+def test_concurrency_recovers_additively():
+    sched = RequestScheduler(engine="test", max_concurrency=4, min_concurrency=1)
+    sched._limit = 1.0
+    for _ in range(10):
+        sched.call(lambda: "ok")
+    assert sched.concurrency == 4
+
+
+def test_token_bucket_waits_when_empty():
+    bucket = TokenBucket(per_minute=6000)  # 100/s
+    assert bucket.acquire(6000) == 0.0
+    assert bucket.acquire(5) > 0.0
@@ -0,0 +1,52 @@
+"""
+Test CER/WER scoring: bit-parallel edit distance, Japanese tokenization, time-aligned windows.
+"""
+
+import json
+import random
+
+from minutes_pipeline.scoring import edit_distance, normalize_text, score_transcripts, tokenize_words
+
+
+def _dp(a, b):
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        prev = cur
+    return prev[-1]
+
+
+def test_edit_distance_matches_dynamic_programming():
+    rng = random.Random(0)
+    for _ in range(500):
+        a = "".join(rng.choice("あいうA") for _ in range(rng.randint(0, 90)))
+        b = "".join(rng.choice("あいうB") for _ in range(rng.randint(0, 90)))
+        assert edit_distance(a, b) == _dp(a, b)
+    assert edit_distance(["予算", "を", "承認"], ["予算", "が", "承認"]) == 1
+
+
+def test_normalize_and_tokenize():
+    assert normalize_text("ＡＰＩ、 設計。") == "api設計"
+    assert normalize_text("設計。", keep_punct=True) == "設計。"
+    assert tokenize_words("今日はカメラのAPI設計です。") == ["今日", "は", "カメラ", "の", "api", "設計", "です"]
+    assert tokenize_words("Hello, big world") == ["hello", "big", "world"]
+
+
+def test_time_aligned_windows_locate_errors(tmp_path):
+    ref = {"segments": [{"start": i * 10.0, "end": i * 10.0 + 8, "text": "予算案を確認します。"} for i in range(30)]}
+    hyp = json.loads(json.dumps(ref))
+    hyp["segments"][25]["text"] = "要参案を確認します。"  # 2 substitutions around 250 s
+    (tmp_path / "ref.json").write_text(json.dumps(ref, ensure_ascii=False), encoding="utf-8")
+    res = score_transcripts(hyp, tmp_path / "ref.json", window_sec=60)
+    assert res["char_errors"] == 2 and res["ref_chars"] == 30 * 9
+    assert res["cer"] == round(2 / 270, 4)
+    assert len(res["windows"]) == 5
+    worst = max(res["windows"], key=lambda w: w["cer"])
+    assert worst["start"] <= 250 < worst["end"]
+    assert score_transcripts(hyp, ref, window_sec=None)["char_errors"] == 2
+
+    (tmp_path / "ref.txt").write_text("予算案を確認します。" * 30, encoding="utf-8")
+    res = score_transcripts(hyp, tmp_path / "ref.txt")
+    assert res["windows"] == [] and res["char_errors"] == 2
@@ -0,0 +1,36 @@
+"""
+Test character n-gram MinHash/LSH near-duplicate clustering.
+"""
+
+import random
+import time
+
+from minutes_pipeline.summarize.similarity import MinHashLSH, char_ngrams, jaccard
+
+
+def test_ngrams_ignore_punctuation_and_width():
+    assert char_ngrams("見積もり。") == char_ngrams("見積もり")
+    assert char_ngrams("ＡＢＣ") == char_ngrams("abc")
+    assert jaccard(char_ngrams("資料を送付"), char_ngrams("資料を送付")) == 1.0
+
+
+def test_cluster_groups_paraphrases_only_above_threshold():
+    texts = ["見積もりを来週までに提出する", "議事録を送付", "見積もりを来週までに提出", "A社に見積もり依頼", "B社に見積もり依頼"]
+    assert MinHashLSH(threshold=0.8).cluster(texts) == [[0, 2], [1], [3], [4]]
+    assert MinHashLSH(threshold=0.7).cluster(texts) == [[0, 2], [1], [3, 4]]
+
+
+def test_compatible_can_veto_a_join():
+    texts = ["見積もりを来週までに提出する", "見積もりを来週までに提出"]
+    assert MinHashLSH().cluster(texts, compatible=lambda a, b: False) == [[0], [1]]
+
+
+def test_thousands_of_items_cluster_quickly():
+    rng = random.Random(0)
+    verbs = ["提出する", "共有する", "確認する", "送付する"]
+    base = [f"{rng.choice(['見積もり', '資料', '契約書'])}{i}番を{rng.choice(verbs)}" for i in range(2000)]
+    texts = [b + rng.choice(["", "。", "予定"]) for b in base for _ in range(2)]
+    t0 = time.perf_counter()
+    clusters = MinHashLSH(threshold=0.8).cluster(texts)
+    assert time.perf_counter() - t0 < 5.0
+    assert len(clusters) < len(texts)
@@ -0,0 +1,83 @@
+"""
+Test Chrome trace-event span tracing (mpipe run --trace).
+"""
+
+import json
+import threading
+import time
+
+from minutes_pipeline.pipeline import run_pipeline
+from minutes_pipeline.tracing import instant, span, start_tracing, stop_tracing
+
+
+_CONFIG = (
+    "naming:\n  output_folder: \"{stem}\"\n"
+    "pipeline:\n  steps: [preprocess, summarize]\n"
+    "chunk:\n  target_chars: 100\n  min_chars: 20\n"
+    "summarize:\n  engine: mock\n"
+)
+
+
+def test_run_writes_trace_with_stage_and_chunk_spans(tmp_path, write_project, segments):
+    cfg = write_project(_CONFIG, transcripts={"output/meeting/transcript_raw.json": segments(20)})
+    run_dir = tmp_path / "output" / "meeting"
+
+    run_pipeline(tmp_path / "meeting.mp4", cfg, trace=True)
+    trace = json.loads((run_dir / "logs" / "trace.json").read_text(encoding="utf-8"))
+    spans = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+    names = {e["name"] for e in spans}
+    assert {"stage.preprocess", "stage.summarize", "stage.merge", "stage.render"} <= names
+    calls = [e for e in spans if e["name"] == "llm.summarize"]
+    assert len(calls) > 1 and all(e["dur"] >= 0 and e["args"]["chars"] > 0 for e in calls)
+    summarize = next(e for e in spans if e["name"] == "stage.summarize")
+    assert all(summarize["ts"] <= e["ts"] <= summarize["ts"] + summarize["dur"] for e in calls)
+    assert any(e["ph"] == "M" and e["name"] == "thread_name" for e in trace["traceEvents"])
+
+
+def test_spans_across_threads_and_disabled_overhead(tmp_path):
+    start_tracing()
+    try:
+        def work(i):
+            with span("work", "test", i=i):
+                time.sleep(0.01)
+
+        threads = [threading.Thread(target=work, args=(i,), name=f"w{i}") for i in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        instant("done", "test")
+        try:
+            with span("fails"):
+                raise ValueError("x")
+        except ValueError:
+            pass
+    finally:
+        tracer = stop_tracing(tmp_path / "trace.json")
+    events = json.loads((tmp_path / "trace.json").read_text(encoding="utf-8"))["traceEvents"]
+    assert len({e["tid"] for e in events if e["name"] == "work"}) == 3
+    assert next(e for e in events if e["name"] == "fails")["args"]["error"] == "ValueError"
+    assert tracer is not None
+
+    with span("off") as args:
+        assert args is None
+    t0 = time.perf_counter()
+    for _ in range(100000):
+        with span("off", "test"):
+            pass
+    assert time.perf_counter() - t0 < 0.5
+
+
+def test_asr_windows_one_span_per_segment():
+    from types import SimpleNamespace
+
+    from minutes_pipeline.pipeline import _traced_windows
+
+    decoded = [SimpleNamespace(start=i * 5.0, end=i * 5.0 + 4) for i in range(3)]
+    start_tracing()
+    try:
+        assert list(_traced_windows(iter(decoded))) == decoded
+    finally:
+        tracer = stop_tracing()
+    windows = [e for e in tracer.events if e["name"] == "asr.window"]
+    assert [w["args"]["audio"] for w in windows] == ["00:00-00:04", "00:05-00:09", "00:10-00:14"]
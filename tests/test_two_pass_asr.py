@@ -0,0 +1,115 @@
+"""
+Test two-pass ASR: low-confidence span selection, splicing of the re-transcribed spans, savings report.
+"""
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from minutes_pipeline import pipeline as pl
+
+
+def _cfg(**two_pass):
+    tp = {
+        "enabled": True,
+        "fast_model": "small",
+        "avg_logprob_below": -1.0,
+        "compression_ratio_above": 2.4,
+        "no_speech_prob_above": 0.6,
+        "merge_gap_sec": 2.0,
+        "pad_sec": 0.5,
+        **two_pass,
+    }
+    return {"asr": {"engine": "whisper", "model": "large-v3", "two_pass": tp}}
+
+
+def _seg(start, text, logprob=-0.2, ratio=1.5, no_speech=0.05):
+    return {"start": start, "end": start + 4.0, "speaker": None, "text": text,
+            "avg_logprob": logprob, "compression_ratio": ratio, "no_speech_prob": no_speech}
+
+
+FIRST_PASS = [
+    _seg(0.0, "予算の確認です。"),
+    _seg(5.0, "よさんあん", logprob=-1.4),                 # low log-prob
+    _seg(10.0, "を承認します。", logprob=-1.2),            # joined with the previous (gap 1 s)
+    _seg(15.0, "次の議題です。"),
+    _seg(20.0, "ありがとうございました" * 5, ratio=3.1),   # repetition loop
+    _seg(25.0, "以上です。"),
+    _seg(30.0, "", logprob=-2.0),                          # empty text is never re-transcribed
+    _seg(35.0, "ご視聴ありがとうございました", logprob=-1.5, no_speech=0.9),  # Whisper's silence case
+    _seg(40.0, "はい。", no_speech=0.8),                   # high no_speech alone is not flagged
+]
+
+
+def test_low_confidence_spans_join_and_clamp():
+    assert pl._low_confidence_spans(FIRST_PASS, _cfg()["asr"]["two_pass"]) == [(1, 3, 4.5, 14.5), (4, 5, 19.5, 24.5), (7, 8, 34.5, 39.5)]
+    # padding stops at the neighbouring kept segments
+    assert pl._low_confidence_spans(FIRST_PASS, _cfg(pad_sec=2.0)["asr"]["two_pass"]) [:2] == [(1, 3, 4.0, 15.0), (4, 5, 19.0, 25.0)]
+
+
+def test_two_pass_splices_refined_spans(monkeypatch, capsys):
+    calls = {}
+
+    def fake_segments(input_media, cfg, model=None):
+        calls["first"] = model
+        return {"language": "ja", "duration": 45.0}, iter(FIRST_PASS)
+
+    def fake_spans(input_media, cfg, spans, model):
+        calls["spans"], calls["model"] = spans, model
+        refined = [
+            [{"start": 5.0, "end": 14.0, "speaker": None, "text": "予算案を承認します。", "avg_logprob": -0.3}],
+            [],  # the large model hears nothing: the first pass is kept
+            [],  # ... unless the first pass was Whisper's silence case
+        ]
+        return refined, {"load_sec": 1.0, "decode_sec": 2.0}
+
+    monkeypatch.setattr(pl, "_asr_segments", fake_segments)
+    monkeypatch.setattr(pl, "_asr_spans", fake_spans)
+    out = pl._step_asr(Path("meeting.mp4"), _cfg())
+
+    assert calls["first"] == "small" and calls["model"] == "large-v3"
+    assert calls["spans"] == [(4.5, 14.5), (19.5, 24.5), (34.5, 39.5)]
+    texts = [s["text"] for s in out["segments"]]
+    assert texts == ["予算の確認です。", "予算案を承認します。", "次の議題です。", "ありがとうございました" * 5, "以上です。", "", "はい。"]
+    assert out["segments"][1]["refined"] is True and "refined" not in out["segments"][0]
+    tp = out["two_pass"]
+    assert tp["spans"] == 3 and tp["replaced_segments"] == 4 and tp["refined_audio_sec"] == 20.0
+    # 2 s of decoding for 20 s of audio -> 4.5 s for 45 s, plus the 1 s load
+    assert abs(tp["full_model_sec_est"] - (1.0 + 2.0 * 45.0 / 20.0)) < 0.01
+    assert tp["saved_sec_est"] < tp["full_model_sec_est"]
+    assert "two-pass: 3 span(s)" in capsys.readouterr().out
+
+
+def test_two_pass_without_low_confidence_skips_large_model(monkeypatch):
+    monkeypatch.setattr(pl, "_asr_segments", lambda m, c, model=None: ({"language": "ja", "duration": 10.0}, iter([_seg(0.0, "はい。")])))
+    monkeypatch.setattr(pl, "_asr_spans", lambda *a, **k: (_ for _ in ()).throw(AssertionError("large model loaded")))
+    out = pl._step_asr(Path("meeting.mp4"), _cfg())
+    assert out["two_pass"]["spans"] == 0 and [s["text"] for s in out["segments"]] == ["はい。"]
+
+
+def test_asr_segment_keeps_confidence():
+    class Seg:
+        avg_logprob, no_speech_prob, compression_ratio = -0.41234, 0.01, 1.7
+
+    assert pl._asr_segment(0.0, 1.0, " はい ", Seg()) == {
+        "start": 0.0, "end": 1.0, "speaker": None, "text": "はい",
+        "avg_logprob": -0.4123, "no_speech_prob": 0.01, "compression_ratio": 1.7,
+    }
+    assert "avg_logprob" not in pl._asr_segment(0.0, 1.0, "x", {"text": "x"})
+
+
+def test_span_decode_seeks_instead_of_loading_the_recording(monkeypatch):
+    np = pytest.importorskip("numpy")
+    calls = []
+
+    def fake_run(cmd, **kw):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout=np.zeros(3 * pl._SAMPLE_RATE, np.int16).tobytes())
+
+    monkeypatch.setattr(pl.subprocess, "run", fake_run)
+    clip = pl._decode_span(Path("long.wav"), 3600.0, 3603.0)
+    assert len(clip) == 3 * pl._SAMPLE_RATE and clip.dtype == np.float32
+    [cmd] = calls
+    assert cmd[cmd.index("-ss") + 1] == "3600.000" and cmd[cmd.index("-t") + 1] == "3.000"
+    assert cmd.index("-ss") < cmd.index("-i")  # input seeking: nothing before the span is decoded
@@ -0,0 +1,61 @@
+"""
+Test the cached schema validator (jsonschema backend and built-in fallback).
+"""
+
+import json
+
+import pytest
+
+from minutes_pipeline.summarize.prompt import load_schema, try_validate_schema
+from minutes_pipeline.summarize.schema import DEFAULT_SCHEMA
+from minutes_pipeline.summarize.validator import SchemaValidator, get_validator
+
+VALID = {
+    "meeting": {"title": "定例", "date": "2024-04-01", "participants": ["田中"]},
+    "summary": ["予算を確認"],
+    "decisions": ["予算承認", {"text": "日程確定", "timestamp": "00:10"}],
+    "todos": [{"owner": "田中", "task": "見積もり", "due": "来週"}],
+    "topics": [],
+    "open_questions": [],
+}
+
+INVALID = {
+    "meeting": {"title": 1, "date": "", "participants": []},
+    "summary": "文字列",
+    "decisions": [{"timestamp": "00:10"}],
+    "todos": [{"owner": "田中", "task": "見積もり"}],
+    "topics": [],
+}
+
+
+@pytest.mark.parametrize("builtin", [True, False])
+def test_collects_all_errors_in_one_pass(builtin):
+    if not builtin:
+        pytest.importorskip("jsonschema")
+    v = SchemaValidator.build(DEFAULT_SCHEMA, builtin=builtin)
+    assert v.validate(VALID) is None
+    errors = v.errors(INVALID)
+    paths = sorted(e.split(":", 1)[0] for e in errors)
+    assert paths == ["<root>", "decisions/0", "meeting/title", "summary", "todos/0"]
+
+
+def test_builtin_matches_jsonschema_on_valid_and_invalid():
+    pytest.importorskip("jsonschema")
+    builtin = SchemaValidator.build(DEFAULT_SCHEMA, builtin=True)
+    js = SchemaValidator.build(DEFAULT_SCHEMA)
+    for doc in (VALID, INVALID, {}, {**VALID, "todos": "x"}):
+        assert (builtin.validate(doc) is None) == (js.validate(doc) is None)
+        assert len(builtin.errors(doc)) == len(js.errors(doc))
+
+
+def test_validator_is_cached_by_content():
+    copy = json.loads(json.dumps(DEFAULT_SCHEMA))
+    assert get_validator(copy) is get_validator(DEFAULT_SCHEMA)
+    assert try_validate_schema(VALID, copy) is None
+
+
+def test_load_schema_reads_file_once(tmp_path):
+    (tmp_path / "schema.json").write_text(json.dumps(DEFAULT_SCHEMA), encoding="utf-8")
+    first = load_schema(tmp_path, "schema.json")
+    assert load_schema(tmp_path, "schema.json") is first
+    assert get_validator(first) is get_validator(DEFAULT_SCHEMA)